@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of Linux Show Player
+#
+# Copyright 2012-2016 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Measure the gap between media cues played in sequence (auto-follow).
+
+The files are played one after the other, as cues with the "auto-follow"
+next-action, and the gap between the end of a cue and the start of the
+next one is reported, positive values are silences, negative are overlaps.
+
+With the gapless follow (default) the gap is computed by GaplessFollow,
+from the clock time the next cue is started at; with `--no-gapless` the
+next cue is executed at the end of the previous one, as a plain follow,
+and the gap is measured up to the next media playing.
+The preroll and crossfade are read from the configuration ([ListLayout]
+FollowPreroll and FollowCrossfade).
+"""
+
+import argparse
+import os
+import sys
+import time
+from statistics import mean
+from threading import Event
+
+# The "lisp" package in PYTHONPATH (if any) takes precedence
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lisp.backend.media_prescan import MediaPrescan
+from lisp.cues.cue import CueNextAction
+from lisp.cues.media_cue import MediaCue
+from lisp.layouts.list_layout.gapless_follow import GaplessFollow
+from lisp.modules.gst_backend.gst_backend import GstBackend
+from lisp.modules.gst_backend.gst_media import GstMedia
+
+parser = argparse.ArgumentParser(description='Auto-follow gap measurement')
+parser.add_argument('files', nargs='+', help='Audio files (or uris) to play')
+parser.add_argument('--no-gapless', action='store_true',
+                    help='Execute the next cue at the end of the previous')
+parser.add_argument('-o', '--output', default='AutoSink',
+                    help='Output element (default: AutoSink)')
+
+args = parser.parse_args()
+if len(args.files) < 2:
+    sys.exit('At least two files are required')
+
+
+class CueList(list):
+    """Minimal model-adapter, as used by GaplessFollow"""
+
+    def item(self, index):
+        return self[index]
+
+
+uris = []
+for file in args.files:
+    uris.append(file if '://' in file else 'file://' + os.path.abspath(file))
+
+# The media durations must be known when the cues are started
+GstBackend()
+report = MediaPrescan().scan(uris)
+if report.has_problems():
+    sys.exit(report.details())
+
+cues = CueList()
+for index, uri in enumerate(uris):
+    media = GstMedia()
+    media.pipe = ['UriInput', 'Volume', args.output]
+    media.element('UriInput').uri = uri
+
+    cue = MediaCue(media)
+    cue.name = os.path.basename(uri)
+    cue.index = index
+    cue.next_action = CueNextAction.AutoFollow.value
+    cues.append(cue)
+
+gapless = None if args.no_gapless else GaplessFollow(cues)
+gaps = []
+ended = {}
+done = Event()
+
+
+def on_followed(cue, next_cue, gap):
+    gaps.append((cue, next_cue, gap))
+
+
+def on_next(cue):
+    if cue.index + 1 == len(cues):
+        done.set()
+        return
+
+    next_cue = cues.item(cue.index + 1)
+    if gapless is None or not gapless.handled(cue):
+        ended[next_cue.media] = (cue, time.monotonic())
+        next_cue.execute()
+
+
+def on_played(media):
+    if media in ended:
+        cue, end = ended.pop(media)
+        next_cue = cues[cue.index + 1]
+        gaps.append((cue, next_cue, (time.monotonic() - end) * 1000))
+
+
+if gapless is not None:
+    gapless.followed.connect(on_followed)
+
+for cue in cues:
+    if gapless is not None:
+        gapless.add_cue(cue)
+    cue.next.connect(on_next)
+    cue.media.played.connect(on_played)
+
+cues[0].execute()
+if not done.wait(sum(cue.duration for cue in cues) / 1000 + 10):
+    sys.exit('Timeout, the cues are still playing')
+
+for cue, next_cue, gap in gaps:
+    print('"{}" -> "{}": {:.1f} ms'.format(cue.name, next_cue.name, gap))
+
+if gaps:
+    values = [gap for _, _, gap in gaps]
+    print('mean: {:.1f} ms, max: {:.1f} ms'.format(
+        mean(values), max(values, key=abs)))
+else:
+    print('No gap measured, the cues were not followed')
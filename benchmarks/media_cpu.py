@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of Linux Show Player
+#
+# Copyright 2012-2016 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Measure the CPU used by concurrently playing GstMedia pipelines.
+
+Run the script against two revisions to compare the pipelines layout, e.g.:
+
+    git worktree add /tmp/lisp-before <revision>
+    PYTHONPATH=/tmp/lisp-before ./benchmarks/media_cpu.py track.wav
+    ./benchmarks/media_cpu.py track.wav
+"""
+
+import argparse
+import os
+import sys
+import time
+from threading import Event, Lock
+
+# The "lisp" package in PYTHONPATH (if any) takes precedence
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lisp.modules.gst_backend import elements
+from lisp.modules.gst_backend.gi_repository import Gst
+from lisp.modules.gst_backend.gst_media import GstMedia
+
+# Not-neutral settings, otherwise the elements could be bypassed
+SETTINGS = {
+    'Volume': {'volume': 0.5},
+    'AudioPan': {'pan': 0.5},
+    'Equalizer10': {'band0': 3, 'band9': -3},
+    'AudioDynamic': {},
+    'Pitch': {'pitch': 1.5},
+    'Speed': {'speed': 1.2}
+}
+
+parser = argparse.ArgumentParser(description='GstMedia CPU usage')
+parser.add_argument('file', help='Audio file (or uri) to play')
+parser.add_argument('-n', '--medias', type=int, default=16,
+                    help='Number of concurrent medias (default: 16)')
+parser.add_argument('-s', '--seconds', type=float, default=10,
+                    help='Measurement duration in seconds (default: 10)')
+parser.add_argument('-p', '--plugins', nargs='*',
+                    default=['Volume', 'AudioPan', 'Equalizer10'],
+                    choices=sorted(SETTINGS.keys()),
+                    help='Plugins of the pipelines')
+parser.add_argument('-o', '--output', default='AutoSink',
+                    help='Output element (default: AutoSink)')
+
+args = parser.parse_args()
+
+uri = args.file
+if '://' not in uri:
+    uri = 'file://' + os.path.abspath(uri)
+
+Gst.init(None)
+elements.load()
+
+played = Event()
+played_count = 0
+played_lock = Lock()
+
+
+def on_played(media):
+    global played_count
+
+    with played_lock:
+        played_count += 1
+        if played_count == args.medias:
+            played.set()
+
+
+medias = []
+for _ in range(args.medias):
+    media = GstMedia()
+    media.pipe = ['UriInput'] + args.plugins + [args.output]
+    media.loop = -1
+
+    properties = {'UriInput': {'uri': uri}}
+    properties.update({name: SETTINGS[name] for name in args.plugins})
+    media.update_elements(properties)
+
+    media.played.connect(on_played)
+    medias.append(media)
+
+for media in medias:
+    media.play()
+
+if not played.wait(10):
+    sys.exit('Only {} of {} medias started'.format(played_count, args.medias))
+
+# Skip the start-up, then measure the CPU time of all the threads
+time.sleep(1)
+wall_start = time.monotonic()
+cpu_start = time.process_time()
+time.sleep(args.seconds)
+cpu = time.process_time() - cpu_start
+wall = time.monotonic() - wall_start
+
+for media in medias:
+    media.interrupt()
+
+print('pipeline: ' + ' ! '.join(['UriInput'] + args.plugins + [args.output]))
+print('medias: {}, seconds: {:.1f}'.format(args.medias, wall))
+print('cpu: {:.1f}% ({:.2f}% per media)'.format(
+    cpu / wall * 100, cpu / wall * 100 / args.medias))
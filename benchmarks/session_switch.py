@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of Linux Show Player
+#
+# Copyright 2012-2016 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Measure the time needed to switch between sessions.
+
+The given session files are opened in turn (as from "File > Open"), the
+time the GUI is blocked by each switch (teardown of the previous session
+included) is reported, along with the longest stall of the event-loop in
+the following seconds, when the old widgets/pipelines are released.
+The media files of the sessions should be available, otherwise the prescan
+report dialog will interrupt the measurement.
+
+Run the script against two revisions to compare them, e.g.:
+
+    git worktree add /tmp/lisp-before <revision>
+    PYTHONPATH=/tmp/lisp-before ./benchmarks/session_switch.py a.lsp b.lsp
+    ./benchmarks/session_switch.py a.lsp b.lsp
+"""
+
+import argparse
+import os
+import sys
+import time
+from itertools import islice, cycle
+from statistics import mean
+
+# The "lisp" package in PYTHONPATH (if any) takes precedence
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QEventLoop, QTimer
+from PyQt5.QtWidgets import QApplication
+
+from lisp import modules
+from lisp import plugins
+from lisp.application import Application
+from lisp.ui.mainwindow import MainWindow
+
+parser = argparse.ArgumentParser(description='Session switch timing')
+parser.add_argument('sessions', nargs='+', help='Session files to open')
+parser.add_argument('-n', '--switches', type=int, default=10,
+                    help='Number of switches (default: 10)')
+parser.add_argument('-s', '--settle', type=float, default=2,
+                    help='Seconds to watch the event-loop after each switch '
+                         '(default: 2)')
+
+args = parser.parse_args()
+if args.switches < 1:
+    parser.error('at least one switch is required')
+
+
+def max_stall(seconds):
+    """Run the event-loop for the given time, return the longest interval
+    between two (10ms) timer ticks, in seconds."""
+    ticks = [time.perf_counter()]
+
+    timer = QTimer()
+    timer.setInterval(10)
+    timer.timeout.connect(lambda: ticks.append(time.perf_counter()))
+
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    timer.start()
+    loop.exec_()
+    timer.stop()
+
+    ticks.append(time.perf_counter())
+    return max(b - a for a, b in zip(ticks, ticks[1:]))
+
+
+qt_app = QApplication(sys.argv)
+
+lisp_app = Application()
+modules.load_modules()
+plugins.load_plugins()
+
+results = []
+sessions = [os.path.abspath(session) for session in args.sessions]
+for session in islice(cycle(sessions), args.switches + 1):
+    start = time.perf_counter()
+    MainWindow().open_session.emit(session)
+    blocked = time.perf_counter() - start
+    stall = max_stall(args.settle)
+
+    print('{}: blocked {:.0f} ms, max stall {:.0f} ms'.format(
+        os.path.basename(session), blocked * 1000, stall * 1000))
+    results.append((blocked, stall))
+
+# The first load doesn't tear down any session
+results = results[1:]
+print('switches: {}, blocked mean {:.0f} ms (max {:.0f} ms), '
+      'max stall {:.0f} ms'.format(
+          len(results), mean(r[0] for r in results) * 1000,
+          max(r[0] for r in results) * 1000,
+          max(r[1] for r in results) * 1000))
+
+lisp_app.finalize()
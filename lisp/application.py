@@ -26,17 +26,23 @@ from lisp import layouts
 from lisp import modules
 from lisp import plugins
 from lisp.core import configuration as cfg
+from lisp.backend.media_prescan import MediaPrescan
 from lisp.core.actions_handler import MainActionsHandler
+from lisp.core.decorators import async_function
 from lisp.core.memento_model import AdapterMementoModel
+from lisp.core.signal import Signal, Connection
 from lisp.core.singleton import Singleton
 from lisp.cues.cue_factory import CueFactory
 from lisp.cues.cue_model import CueModel
+from lisp.cues.media_cue import MediaCue
 from lisp.ui import elogging
 from lisp.ui.layoutselect import LayoutSelect
 from lisp.ui.mainwindow import MainWindow
 from lisp.ui.settings.app_settings import AppSettings
 from lisp.ui.settings.pages.app_general import AppGeneral
 from lisp.ui.settings.pages.cue_app_settings import CueAppSettings
+from lisp.ui.ui_utils import translate
+from lisp.ui.widgets import QDetailedMessageBox
 
 
 class Application(metaclass=Singleton):
@@ -47,6 +53,11 @@ class Application(metaclass=Singleton):
         self._memento_model = None
         self._cue_model = CueModel()
 
+        # Report media problems found when a session is loaded
+        self._prescan_report = Signal()
+        self._prescan_report.connect(self._show_prescan_report,
+                                     Connection.QtQueued)
+
         # Connect mainWindow actions
         self._mainWindow.new_session.connect(self.new_session_dialog)
         self._mainWindow.save_session.connect(self._save_to_file)
@@ -120,17 +131,20 @@ class Application(metaclass=Singleton):
             plugins.reset_plugins()
 
             self._app_conf.clear()
-            self._cue_model.reset()
 
+            # The layout is detached before the model reset, so that its
+            # widgets are released in bulk, instead of cue by cue
+            self._layout.cancel_scheduled()
             self._layout.finalize()
             self._layout = None
             self._memento_model = None
             self._cue_model.reset()
 
     def finalize(self):
+        # Before the modules, that wait for the session media to be released
+        self._delete_session()
         modules.terminate_modules()
 
-        self._delete_session()
         self._mainWindow.deleteLater()
 
     def _save_to_file(self, session_file):
@@ -185,6 +199,23 @@ class Application(metaclass=Singleton):
             # Update the main-window
             self._mainWindow.filename = session_file
             self._mainWindow.update()
+
+            # Check the media files before the show starts
+            self._prescan([cue.media.input_uri() for cue in self._cue_model
+                           if isinstance(cue, MediaCue)])
         except Exception as e:
             elogging.exception('Error during file reading', e)
             self.new_session_dialog()
+
+    @async_function
+    def _prescan(self, uris):
+        report = MediaPrescan().scan(uri for uri in uris if uri)
+        if report.has_problems():
+            self._prescan_report.emit(report)
+
+    def _show_prescan_report(self, report):
+        QDetailedMessageBox.dwarning(
+            translate('Application', 'Media files'),
+            translate('Application', 'Some media files cannot be played'),
+            report.details(),
+            parent=self._mainWindow)
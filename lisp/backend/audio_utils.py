@@ -20,8 +20,15 @@
 import aifc
 import math
 import sunau
+import sys
 import urllib.parse
 import wave
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 # Decibel value to be considered -inf
 MIN_VOLUME_DB = -144
@@ -75,6 +82,59 @@ def slider_to_fader(value):
     return 3.16227766 * (value ** 3.7)
 
 
+def pcm_samples(fragment):
+    """Return the samples of signed 16bit, little-endian, PCM data.
+
+    A NumPy array when available, otherwise an `array.array`.
+    """
+    # Incomplete samples are ignored
+    fragment = fragment[:len(fragment) - len(fragment) % 2]
+
+    if numpy is not None:
+        return numpy.frombuffer(fragment, dtype='<i2')
+
+    samples = array('h', fragment)
+    if sys.byteorder == 'big':
+        samples.byteswap()
+
+    return samples
+
+
+def pcm_minmax(fragment):
+    """Return the (minimum, maximum) sample of 16bit PCM data."""
+    samples = pcm_samples(fragment)
+    if len(samples) == 0:
+        return 0, 0
+    if numpy is not None:
+        return int(samples.min()), int(samples.max())
+
+    return min(samples), max(samples)
+
+
+def pcm_rms(fragment):
+    """Return the root-mean-square of 16bit PCM data, as an integer."""
+    samples = pcm_samples(fragment)
+    if len(samples) == 0:
+        return 0
+    if numpy is not None:
+        squares = numpy.square(samples, dtype=numpy.float64)
+        return int(math.sqrt(squares.mean()))
+
+    return int(math.sqrt(sum(sample * sample for sample in samples) /
+                         len(samples)))
+
+
+def pcm_peak(fragment):
+    """Return the maximum absolute sample of 16bit PCM data."""
+    samples = pcm_samples(fragment)
+    if len(samples) == 0:
+        return 0
+    if numpy is not None:
+        return int(numpy.abs(samples.astype(numpy.int32)).max())
+
+    return max(max(samples), -min(samples))
+
+
 def python_duration(path, sound_module):
     """Returns audio-file duration using the given standard library module."""
     duration = 0
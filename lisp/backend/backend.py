@@ -30,11 +30,12 @@ class Backend(metaclass=ABCSingleton):
 
     @abstractmethod
     def uri_duration(self, uri):
-        """Return the file duration in milliseconds.
+        """Return the file duration in milliseconds, 0 if unknown.
 
         :param uri: The URI of the file
         :type uri: str
 
+        :raise Exception: if the file cannot be read or decoded
         :rtype: int
         """
 
@@ -58,3 +59,30 @@ class Backend(metaclass=ABCSingleton):
 
         :rtype: dict
         """
+
+    def uri_waveform(self, uri, callback=None, priority=0):
+        """Return the file waveform, if available.
+
+        When the waveform is not (yet) available `None` is returned, if the
+        backend is able to compute it, `callback(waveform)` is called (from
+        any thread) when done, with `None` if the computation fails.
+
+        :param uri: The URI of the file
+        :type uri: str
+        :param callback: Called when the waveform is available
+        :param priority: Lower values are computed first
+        :type priority: int
+
+        :rtype: lisp.backend.waveform.Waveform | None
+        """
+        return None
+
+    def uri_silence(self, uri, callback=None, priority=0):
+        """Return the boundaries of the non-silent part of the file.
+
+        Works like `uri_waveform`, the result is a tuple (start, stop) in
+        milliseconds, when the file is all silent both are 0.
+
+        :rtype: tuple | None
+        """
+        return None
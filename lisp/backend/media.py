@@ -21,6 +21,7 @@ from abc import abstractmethod
 from enum import Enum
 
 from lisp.core.has_properties import HasProperties, Property
+from lisp.core.scheduler import Scheduler
 from lisp.core.signal import Signal
 
 
@@ -40,7 +41,9 @@ class Media(HasProperties):
     To control various parameter of the media, MediaElement(s) should be used.
 
     .. note::
-        The play/stop/pause functions must be non-blocking functions.
+        The play/stop/pause functions must be non-blocking functions, the
+        played/stopped/paused signals can be emitted later (and from
+        another thread), when the change is completed.
     """
 
     loop = Property(default=0)
@@ -135,6 +138,23 @@ class Media(HasProperties):
     def play(self):
         """The media go in PLAYING state and starts the playback."""
 
+    def play_at(self, when):
+        """The media go in PLAYING state at the given time.
+
+        The default implementation schedule a call to `play`, backends should
+        provide a more accurate implementation (e.g. based on the media clock).
+
+        :param when: time of the monotonic clock, in seconds
+        :type when: float
+        """
+        Scheduler().schedule(when, self.play)
+
+    def preroll(self):
+        """Prepare the media to start the playback with the lowest latency.
+
+        Should not block, by default does nothing.
+        """
+
     @abstractmethod
     def seek(self, position):
         """Seek to the specified point.
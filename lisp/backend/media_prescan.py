@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Linux Show Player
+#
+# Copyright 2012-2016 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+from concurrent.futures import ThreadPoolExecutor, wait
+from threading import Lock, RLock
+from urllib.parse import unquote
+
+from lisp.backend import get_backend
+from lisp.core.configuration import config
+from lisp.core.singleton import Singleton
+
+
+class PrescanReport:
+    """The result of a MediaPrescan.scan() call.
+
+    Files with an unknown duration (e.g. streams) are not considered
+    problematic, their duration is 0. Files that cannot be decoded are not
+    included in `durations`.
+    """
+
+    def __init__(self):
+        self.durations = {}
+        self.unknown_duration = []
+        self.missing = []
+        self.unreadable = []
+        self.unsupported = []
+        self.undecodable = []
+
+    def has_problems(self):
+        return bool(self.missing or self.unreadable or self.unsupported or
+                    self.undecodable)
+
+    def details(self):
+        """Return a (multi-line) description of the problematic files."""
+        lines = []
+        for title, uris in (('Missing', self.missing),
+                            ('Unreadable', self.unreadable),
+                            ('Unsupported', self.unsupported),
+                            ('Undecodable', self.undecodable),
+                            ('Unknown duration', self.unknown_duration)):
+            if uris:
+                lines.append('{} ({}):'.format(title, len(uris)))
+                lines.extend('    ' + unquote(uri) for uri in sorted(uris))
+
+        return '\n'.join(lines)
+
+
+class MediaPrescan(metaclass=Singleton):
+    """Probe many media-files concurrently.
+
+    Probes are executed by a pool of threads, the number of workers can be
+    set in the configuration, `[Backend] PrescanWorkers`, 0 means one worker
+    for each CPU.
+    Probing a file stores its metadata in the backend cache, so media
+    created afterwards get their duration without any further discovery.
+    """
+
+    def __init__(self):
+        workers = int(config['Backend'].get('PrescanWorkers', 0))
+        if workers <= 0:
+            workers = os.cpu_count() or 1
+
+        self._pool = ThreadPoolExecutor(workers)
+        self._lock = RLock()
+        self._probes = {}
+
+    def probe(self, uri):
+        """Return a Future for the duration (milliseconds) of the given uri.
+
+        Concurrent probes of the same uri share the same Future, if the file
+        cannot be decoded the Future holds the exception.
+
+        :rtype: concurrent.futures.Future
+        """
+        with self._lock:
+            future = self._probes.get(uri)
+            if future is None:
+                future = self._pool.submit(get_backend().uri_duration, uri)
+                self._probes[uri] = future
+                future.add_done_callback(
+                    lambda future: self.__probe_done(uri, future))
+
+            return future
+
+    def scan(self, uris, callback=None):
+        """Probe all the given uris.
+
+        Without a `callback` the call blocks until done, otherwise returns
+        immediately, and `callback(report)` is called (from any thread) when
+        all the uris are probed.
+
+        :type uris: typing.Iterable[str]
+        :rtype: PrescanReport | None
+        """
+        report = PrescanReport()
+        extensions = set()
+        for category in get_backend().supported_extensions().values():
+            extensions.update(ext.lower() for ext in category)
+
+        probes = {}
+        for uri in set(uris):
+            protocol, _, path = uri.partition('://')
+
+            if protocol == 'file':
+                path = unquote(path)
+                extension = os.path.splitext(path)[1][1:].lower()
+
+                if not os.path.exists(path):
+                    report.missing.append(uri)
+                    continue
+                if not os.access(path, os.R_OK):
+                    report.unreadable.append(uri)
+                    continue
+                if extensions and extension not in extensions:
+                    report.unsupported.append(uri)
+                    continue
+
+            probes[uri] = self.probe(uri)
+
+        if callback is None:
+            wait(probes.values())
+            return self.__collect(report, probes)
+
+        pending = [len(probes)]
+        lock = Lock()
+
+        def probe_done(future):
+            with lock:
+                pending[0] -= 1
+                if pending[0] != 0:
+                    return
+
+            callback(self.__collect(report, probes))
+
+        if probes:
+            for future in probes.values():
+                future.add_done_callback(probe_done)
+        else:
+            callback(report)
+
+    @staticmethod
+    def __collect(report, probes):
+        for uri, future in probes.items():
+            if future.exception() is not None:
+                report.undecodable.append(uri)
+            elif future.result() > 0:
+                report.durations[uri] = future.result()
+            else:
+                report.durations[uri] = 0
+                report.unknown_duration.append(uri)
+
+        return report
+
+    def __probe_done(self, uri, future):
+        with self._lock:
+            if self._probes.get(uri) is future:
+                self._probes.pop(uri)
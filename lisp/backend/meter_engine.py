@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Linux Show Player
+#
+# Copyright 2012-2016 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+from threading import Lock
+from time import monotonic
+
+from lisp.backend.audio_utils import MIN_VOLUME_DB
+from lisp.core.clock import Clock
+from lisp.core.signal import Signal, Connection
+from lisp.core.singleton import Singleton
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class MeterEngine(metaclass=Singleton):
+    """Collect audio levels from many sources and deliver them once per frame.
+
+    Sources (e.g. dB-meter elements) `register` a signal, then `update` the
+    levels as fast as they like, from any thread. Levels are stored into
+    preallocated arrays (NumPy ones, when available), the decay (with
+    peak-hold) is computed by the engine, and once per frame the signals of
+    the changed sources are emitted, from the GUI thread, as:
+
+        signal.emit(peaks, rmss, decays)
+
+    .. note::
+        The frame clock runs only while at least one source is active.
+    """
+
+    MAX_CHANNELS = 8
+    _Clock = Clock(33)
+
+    def __init__(self):
+        self._lock = Lock()
+        self._size = 0
+        self._free = []
+        self._signals = {}
+        self._active = set()
+        self._running = False
+        self._last_frame = monotonic()
+
+        self._peak = self._alloc(0)
+        self._rms = self._alloc(0)
+        self._decay = self._alloc(0)
+        self._hold = self._alloc(0)
+        self._channels = []
+        self._ttl = []
+        self._falloff = []
+
+        self._start_request = Signal()
+        self._start_request.connect(self.__start, Connection.QtQueued)
+
+    def register(self, signal, peak_ttl=1, peak_falloff=20):
+        """Register a new source.
+
+        :param signal: The signal used to deliver the levels
+        :type signal: lisp.core.signal.Signal
+        :param peak_ttl: Time (in seconds) a decay-peak is held
+        :param peak_falloff: Decay-peak falloff (in dB per second)
+        :return: The source id
+        :rtype: int
+        """
+        with self._lock:
+            if self._free:
+                source = self._free.pop()
+            else:
+                source = self._size
+                self._grow(self._size + 1)
+
+            self._signals[source] = signal
+            self._channels[source] = 0
+            self._ttl[source] = peak_ttl
+            self._falloff[source] = peak_falloff
+            self._reset(source)
+
+            return source
+
+    def unregister(self, source):
+        with self._lock:
+            if self._signals.pop(source, None) is not None:
+                self._active.discard(source)
+                self._free.append(source)
+
+    def configure(self, source, peak_ttl, peak_falloff):
+        with self._lock:
+            self._ttl[source] = peak_ttl
+            self._falloff[source] = peak_falloff
+
+    def update(self, source, peaks, rmss):
+        """Store new levels (in dB) for the given source."""
+        channels = min(len(peaks), len(rmss), MeterEngine.MAX_CHANNELS)
+        now = monotonic()
+
+        with self._lock:
+            if source not in self._signals:
+                return
+
+            self._channels[source] = channels
+            peak = self._peak[source]
+            decay = self._decay[source]
+            hold = self._hold[source]
+
+            for channel in range(channels):
+                peak[channel] = peaks[channel]
+                self._rms[source][channel] = rmss[channel]
+                # Peak-hold
+                if peaks[channel] >= decay[channel]:
+                    decay[channel] = peaks[channel]
+                    hold[channel] = now
+
+            self._active.add(source)
+            if not self._running:
+                self._running = True
+                self._start_request.emit()
+
+    def reset(self, source):
+        """Reset the source levels, the reset values are delivered."""
+        with self._lock:
+            if source in self._signals:
+                self._reset(source)
+                self._active.add(source)
+
+    def _reset(self, source):
+        for array in (self._peak, self._rms, self._decay):
+            array[source][:] = [MIN_VOLUME_DB] * MeterEngine.MAX_CHANNELS
+        self._hold[source][:] = [0] * MeterEngine.MAX_CHANNELS
+
+    def _alloc(self, size):
+        if numpy is not None:
+            return numpy.full((size, MeterEngine.MAX_CHANNELS), MIN_VOLUME_DB)
+
+        return [[MIN_VOLUME_DB] * MeterEngine.MAX_CHANNELS
+                for _ in range(size)]
+
+    def _grow(self, size):
+        # Double the storage to keep the growth amortized
+        capacity = len(self._peak)
+        if size > capacity:
+            capacity = max(size, capacity * 2, 16)
+            extra = capacity - len(self._peak)
+
+            if numpy is not None:
+                self._peak = numpy.vstack((self._peak, self._alloc(extra)))
+                self._rms = numpy.vstack((self._rms, self._alloc(extra)))
+                self._decay = numpy.vstack((self._decay, self._alloc(extra)))
+                self._hold = numpy.vstack((self._hold, self._alloc(extra)))
+            else:
+                for array in (self._peak, self._rms, self._decay, self._hold):
+                    array.extend(self._alloc(extra))
+
+            self._channels.extend([0] * extra)
+            self._ttl.extend([1] * extra)
+            self._falloff.extend([20] * extra)
+
+        self._size = size
+
+    def _apply_decay(self, now, elapsed):
+        if numpy is not None:
+            size = self._size
+            ttl = numpy.array(self._ttl[:size])[:, None]
+            falloff = numpy.array(self._falloff[:size])[:, None]
+            decay = self._decay[:size]
+
+            expired = (now - self._hold[:size]) > ttl
+            numpy.subtract(decay, falloff * elapsed, out=decay, where=expired)
+            numpy.maximum(decay, self._peak[:size], out=decay)
+            numpy.maximum(decay, MIN_VOLUME_DB, out=decay)
+        else:
+            for source in self._active:
+                ttl = self._ttl[source]
+                falloff = self._falloff[source] * elapsed
+                peak = self._peak[source]
+                decay = self._decay[source]
+                hold = self._hold[source]
+
+                for channel in range(self._channels[source]):
+                    if now - hold[channel] > ttl:
+                        decay[channel] = max(decay[channel] - falloff,
+                                             peak[channel], MIN_VOLUME_DB)
+
+    def __start(self):
+        self._last_frame = monotonic()
+        MeterEngine._Clock.add_callback(self.__frame)
+
+    def __frame(self):
+        now = monotonic()
+        snapshot = []
+
+        with self._lock:
+            self._apply_decay(now, now - self._last_frame)
+            self._last_frame = now
+
+            for source in self._active:
+                channels = self._channels[source]
+                snapshot.append((
+                    self._signals[source],
+                    list(self._peak[source][:channels]),
+                    list(self._rms[source][:channels]),
+                    list(self._decay[source][:channels])))
+
+            self._active.clear()
+            if not snapshot:
+                self._running = False
+                MeterEngine._Clock.remove_callback(self.__frame)
+
+        for signal, peaks, rmss, decays in snapshot:
+            signal.emit(peaks, rmss, decays)
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Linux Show Player
+#
+# Copyright 2012-2016 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+from lisp.backend.audio_utils import pcm_peak
+
+
+class SilenceDetector:
+    """Find the first and the last "non silent" instants of PCM data.
+
+    Works on signed 16bit PCM data, with a resolution of 1 millisecond,
+    fragments under the threshold are skipped without looking at every
+    single block.
+
+    .. Usage::
+
+        detector = SilenceDetector(-60)
+        detector.start(44100, 1)
+        detector.feed(pcm_bytes)
+        ...
+        detector.finish()
+        start, stop, duration = detector.result()
+    """
+
+    def __init__(self, threshold=-60):
+        """
+        :param threshold: Silence threshold in dBFS
+        :type threshold: float
+        """
+        self.threshold = threshold
+
+        self._limit = int(32767 * pow(10, threshold / 20))
+        self._frame_size = 2
+        self._block_size = 2
+        self._pending = b''
+        self._offset = 0
+        self._first = None
+        self._last = None
+        self._rate = 1
+
+    def start(self, rate, channels):
+        self._rate = rate
+        self._frame_size = channels * 2
+        # About 1 millisecond blocks
+        self._block_size = max(rate // 1000, 1) * self._frame_size
+
+    def feed(self, data):
+        data = self._pending + data
+        end = len(data) - len(data) % self._block_size
+
+        self._scan(data[:end])
+        self._pending = data[end:]
+
+    def finish(self):
+        end = len(self._pending) - len(self._pending) % self._frame_size
+        self._scan(self._pending[:end])
+        self._pending = b''
+
+    def result(self):
+        """Return (start, stop, duration) in milliseconds.
+
+        If the data is all silent start and stop are both 0.
+        """
+        duration = self._to_ms(self._offset)
+        if self._first is None:
+            return 0, 0, duration
+
+        return self._to_ms(self._first), self._to_ms(self._last), duration
+
+    def _to_ms(self, offset):
+        return offset * 1000 // (self._frame_size * self._rate)
+
+    def _loud(self, fragment):
+        return pcm_peak(fragment) > self._limit
+
+    def _scan(self, chunk):
+        if chunk and self._loud(chunk):
+            size = self._block_size
+
+            if self._first is None:
+                for start in range(0, len(chunk), size):
+                    if self._loud(chunk[start:start + size]):
+                        self._first = self._offset + start
+                        break
+
+            for start in reversed(range(0, len(chunk), size)):
+                if self._loud(chunk[start:start + size]):
+                    self._last = self._offset + min(start + size, len(chunk))
+                    break
+
+        self._offset += len(chunk)
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Linux Show Player
+#
+# Copyright 2012-2016 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Compact, multi-resolution, waveform (peak) files.
+
+A waveform file contains many "levels" of the same waveform, the first
+level has `BLOCK_RATE` blocks per second, every following level halves
+the number of blocks of the previous one (mipmapping).
+Each block is stored as 3 signed bytes: minimum, maximum and RMS.
+"""
+
+import mmap
+import os
+import struct
+from array import array
+from hashlib import sha1
+from math import sqrt
+
+from lisp.backend.audio_utils import pcm_minmax, pcm_rms
+from lisp.core.util import uri_fingerprint
+
+MAGIC = b'LSPW'
+VERSION = 1
+# Blocks per second of the first level
+BLOCK_RATE = 100
+# Levels with fewer blocks are not generated
+MIN_BLOCKS = 32
+
+_Header = struct.Struct('<4sHHI')
+_Level = struct.Struct('<II')
+
+
+class WaveformBuilder:
+    """Compute a waveform from mono, signed 16bit, PCM data.
+
+    .. Usage::
+
+        builder = WaveformBuilder()
+        builder.start(44100, 1)
+        builder.feed(pcm_bytes)
+        ...
+        builder.finish()
+        builder.write(path)
+    """
+
+    def __init__(self):
+        self._block_size = 0
+        self._pending = b''
+        self._blocks = array('b')
+
+    def start(self, rate, channels):
+        if channels != 1:
+            raise ValueError('only mono data is supported')
+
+        # Bytes per block (2 bytes per sample)
+        self._block_size = max(rate // BLOCK_RATE, 1) * 2
+
+    def feed(self, data):
+        data = self._pending + data
+        size = self._block_size
+        end = len(data) - len(data) % size
+
+        for offset in range(0, end, size):
+            self._add_block(data[offset:offset + size])
+
+        self._pending = data[end:]
+
+    def finish(self):
+        if self._pending:
+            self._add_block(self._pending)
+            self._pending = b''
+
+    def _add_block(self, fragment):
+        minimum, maximum = pcm_minmax(fragment)
+        self._blocks.extend((minimum >> 8, maximum >> 8,
+                             min(pcm_rms(fragment) >> 8, 127)))
+
+    def levels(self):
+        """Return all the waveform levels, starting from the first."""
+        levels = [self._blocks]
+
+        while len(levels[-1]) // 3 >= MIN_BLOCKS * 2:
+            previous = levels[-1]
+            level = array('b')
+
+            for n in range(0, len(previous) - 5, 6):
+                level.extend((
+                    min(previous[n], previous[n + 3]),
+                    max(previous[n + 1], previous[n + 4]),
+                    int(sqrt((previous[n + 2] ** 2 +
+                              previous[n + 5] ** 2) / 2))))
+
+            levels.append(level)
+
+        return levels
+
+    def write(self, path):
+        """Write the waveform file, atomically."""
+        levels = self.levels()
+        offset = _Header.size + _Level.size * len(levels)
+
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as file:
+            file.write(_Header.pack(MAGIC, VERSION, len(levels), BLOCK_RATE))
+            for level in levels:
+                file.write(_Level.pack(offset, len(level) // 3))
+                offset += len(level)
+
+            for level in levels:
+                level.tofile(file)
+
+        os.replace(tmp_path, path)
+
+
+class Waveform:
+    """Read-only, memory-mapped, waveform file."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, levels, self.block_rate = _Header.unpack_from(
+            self._map)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError('invalid waveform file: {}'.format(path))
+
+        self._levels = [_Level.unpack_from(self._map,
+                                           _Header.size + _Level.size * n)
+                        for n in range(levels)]
+
+    def blocks(self, minimum=0):
+        """Return the lowest resolution level with at least `minimum` blocks.
+
+        :return: A memoryview of signed bytes (min, max, rms, min, ...)
+        :rtype: memoryview
+        """
+        offset, count = self._levels[0]
+        for level_offset, level_count in self._levels:
+            if level_count < minimum:
+                break
+            offset, count = level_offset, level_count
+
+        return memoryview(self._map)[offset:offset + count * 3].cast('b')
+
+    def close(self):
+        """Release the mapped file, the blocks can't be used after."""
+        if not self._map.closed:
+            try:
+                self._map.close()
+            except BufferError:
+                # Blocks still in use, released with them (by the GC)
+                pass
+
+
+class WaveformCache:
+    """Waveform files stored in a directory, keyed by the files content."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, uri):
+        """Return the cache path for the uri, or None if not cacheable."""
+        fingerprint = uri_fingerprint(uri)
+        if fingerprint is not None:
+            key = sha1(repr(fingerprint).encode()).hexdigest()
+            return os.path.join(self.directory, key + '.peaks')
+
+    def load(self, uri):
+        """Return the cached Waveform for the uri, or None."""
+        path = self.path(uri)
+        if path is not None and os.path.exists(path):
+            try:
+                return Waveform(path)
+            except (OSError, ValueError, struct.error):
+                os.remove(path)
@@ -28,6 +28,7 @@ b = y0
 """
 
 from enum import Enum
+from math import cos, pi, sin
 
 from lisp.core.util import FunctionProxy
 
@@ -59,6 +60,18 @@ def fade_inout_quad(t, a, b):
         return 0.5 * a * (1 - (t * (t - 2))) + b
 
 
+def fadein_equal_power(t, a, b):
+    """Equal-power (sin) fade in, to be paired with `fadeout_equal_power`
+    for crossfades with a constant perceived loudness.
+    """
+    return a * sin(t * pi / 2) + b
+
+
+def fadeout_equal_power(t, a, b):
+    """Equal-power (cos) fade out."""
+    return a * (1 - cos(t * pi / 2)) + b
+
+
 def ntime(time, begin, duration):
     """Return normalized time."""
     return (time - begin) / (duration - begin)
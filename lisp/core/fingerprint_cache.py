@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Linux Show Player
+#
+# Copyright 2012-2017 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import logging
+import os
+from threading import Lock, Timer
+
+from lisp.core.util import uri_fingerprint
+
+
+class FingerprintCache:
+    """Persistent (json) store of data about local files.
+
+    Entries are keyed by the file real-path, and are valid only until the
+    file size or modification-time change (see `uri_fingerprint`).
+    Changes are written to disk after `save_delay` seconds, grouping many
+    changes in a single write.
+    """
+
+    def __init__(self, path, save_delay=5):
+        self.path = path
+        self.save_delay = save_delay
+
+        self._lock = Lock()
+        self._entries = None
+        self._timer = None
+
+    def get(self, uri):
+        """Return the data stored for the uri, None if missing or outdated."""
+        fingerprint = uri_fingerprint(uri)
+        if fingerprint is not None:
+            path, size, mtime = fingerprint
+
+            with self._lock:
+                entry = self.__entries().get(path)
+
+            if entry is not None and entry[0] == size and entry[1] == mtime:
+                return entry[2]
+
+    def set(self, uri, data):
+        """Store data (must be json serializable) for the uri.
+
+        :return: False if the uri is not a local file, True otherwise
+        """
+        fingerprint = uri_fingerprint(uri)
+        if fingerprint is None:
+            return False
+
+        path, size, mtime = fingerprint
+        with self._lock:
+            self.__entries()[path] = (size, mtime, data)
+            self.__schedule_save()
+
+        return True
+
+    def discard(self, uri):
+        fingerprint = uri_fingerprint(uri)
+        if fingerprint is not None:
+            with self._lock:
+                if self.__entries().pop(fingerprint[0], None) is not None:
+                    self.__schedule_save()
+
+    def save(self):
+        """Write pending changes to disk, if any."""
+        with self._lock:
+            if self._timer is None:
+                return
+
+            self._timer.cancel()
+            self._timer = None
+            entries = json.dumps(self._entries)
+
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path + '.tmp', mode='w') as file:
+                file.write(entries)
+            os.replace(self.path + '.tmp', self.path)
+        except OSError as e:
+            logging.warning('CACHE: cannot write "{}": {}'.format(self.path, e))
+
+    def __schedule_save(self):
+        if self._timer is None:
+            self._timer = Timer(self.save_delay, self.save)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def __entries(self):
+        # Load the entries the first time they are needed
+        if self._entries is None:
+            self._entries = {}
+            try:
+                with open(self.path) as file:
+                    self._entries = json.load(file)
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                logging.warning(
+                    'CACHE: cannot read "{}": {}'.format(self.path, e))
+
+        return self._entries
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Linux Show Player
+#
+# Copyright 2012-2016 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+import heapq
+import logging
+import time
+import traceback
+from itertools import count
+from threading import Condition, Thread
+
+from lisp.core.singleton import Singleton
+
+
+class ScheduledTask:
+    """A function scheduled for execution, returned by Scheduler.schedule
+
+    :ivar when: the scheduled time
+    :ivar owner: the object the task belong to (e.g. a cue), or None
+    :ivar lateness: the execution delay, in seconds, once executed
+    """
+
+    def __init__(self, when, function, args, kwargs, owner=None):
+        self.when = when
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+        self.owner = owner
+        self.cancelled = False
+        self.executed = False
+        self.lateness = None
+
+    def cancel(self):
+        """Prevent the execution, if not already started."""
+        self.cancelled = True
+
+    def run(self):
+        if not self.cancelled:
+            self.executed = True
+            self.lateness = time.monotonic() - self.when
+            self.function(*self.args, **self.kwargs)
+
+
+class Scheduler(metaclass=Singleton):
+    """Execute functions at a given time of the monotonic clock.
+
+    Times are in seconds, as returned by `time.monotonic()`, the functions
+    are executed, in order, by a single thread, so they should not block.
+
+    To compensate the wake-up jitter of the thread, the wait ends in advance
+    (by the average measured oversleep), then the remaining time is "spun".
+    """
+
+    # Time to busy-wait before a task, in seconds
+    SPIN_TIME = 0.002
+    # Maximum wake-up latency to compensate, in seconds
+    MAX_LATENCY = 0.02
+
+    def __init__(self):
+        self._tasks = []
+        self._counter = count()
+        self._condition = Condition()
+        self._latency = 0
+
+        self._thread = Thread(target=self.__run, name='Scheduler', daemon=True)
+        self._thread.start()
+
+    def schedule(self, when, function, *args, owner=None, **kwargs):
+        """Schedule the execution of `function(*args, **kwargs)`.
+
+        :param when: execution time, if in the past the function is executed
+            as soon as possible
+        :type when: float
+        :param owner: the object the task belong to, used to filter and
+            cancel the tasks
+        :rtype: ScheduledTask
+        """
+        task = ScheduledTask(when, function, args, kwargs, owner=owner)
+
+        with self._condition:
+            heapq.heappush(self._tasks, (when, next(self._counter), task))
+            self._condition.notify()
+
+        return task
+
+    def pending(self, owner=None):
+        """Return the tasks waiting for execution, in order.
+
+        :param owner: if given, only the tasks of this owner are returned
+        :rtype: list[ScheduledTask]
+        """
+        with self._condition:
+            tasks = sorted(self._tasks)
+
+        return [task for __, __, task in tasks if not task.cancelled and
+                (owner is None or task.owner is owner)]
+
+    def cancel(self, owner):
+        """Cancel all the pending tasks of the given owner."""
+        for task in self.pending(owner):
+            task.cancel()
+
+    def __run(self):
+        while True:
+            with self._condition:
+                while not self._tasks:
+                    self._condition.wait()
+
+                when, __, task = self._tasks[0]
+                if task.cancelled:
+                    heapq.heappop(self._tasks)
+                    continue
+
+                delay = when - time.monotonic() - self._latency - \
+                    Scheduler.SPIN_TIME
+                if delay > 0:
+                    wake_time = time.monotonic() + delay
+                    if not self._condition.wait(delay):
+                        # Timeout, measure the oversleep
+                        latency = time.monotonic() - wake_time
+                        self._latency = min(
+                            self._latency * 0.9 + max(latency, 0) * 0.1,
+                            Scheduler.MAX_LATENCY)
+                    continue
+
+                heapq.heappop(self._tasks)
+
+            while time.monotonic() < when:
+                time.sleep(0)
+
+            try:
+                task.run()
+            except Exception:
+                logging.error('SCHEDULER: task {} failed'.format(task.function))
+                logging.debug(traceback.format_exc())
@@ -196,6 +196,11 @@ class Signal:
             with self.__lock:
                 self.__slots.clear()
 
+    def is_connected(self):
+        """Return True if at least one (alive) slot is connected."""
+        with self.__lock:
+            return any(slot.is_alive() for slot in self.__slots.values())
+
     def emit(self, *args, **kwargs):
         """Emit the signal within the given arguments"""
         with self.__lock:
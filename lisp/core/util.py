@@ -21,8 +21,9 @@ import re
 import socket
 from collections import Mapping
 from enum import Enum
-from os import listdir
-from os.path import isdir, exists, join
+from os import listdir, stat
+from os.path import isdir, exists, join, realpath
+from urllib.parse import unquote
 
 import functools
 
@@ -109,6 +110,29 @@ def get_lan_ip():
     return ip
 
 
+def uri_fingerprint(uri):
+    """Identify the content of a local file, using its path, size and mtime.
+
+    :param uri: The file uri (e.g. "file:///home/...")
+    :type uri: str
+
+    :return: (real-path, size, mtime-nanoseconds) or None if the uri is not
+             an existing local file
+    :rtype: tuple
+    """
+    protocol, _, path = uri.partition('://')
+    if protocol != 'file':
+        return None
+
+    path = realpath(unquote(path))
+    try:
+        file_stat = stat(path)
+    except OSError:
+        return None
+
+    return path, file_stat.st_size, file_stat.st_mtime_ns
+
+
 def subclasses(cls):
     for subclass in cls.__subclasses__():
         yield from subclasses(subclass)
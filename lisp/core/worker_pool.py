@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Linux Show Player
+#
+# Copyright 2012-2016 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+import traceback
+from itertools import count
+from queue import PriorityQueue
+from threading import Thread, Lock
+
+
+class PriorityWorkerPool:
+    """Execute tasks in a pool of threads, in priority order.
+
+    Lower values mean higher priority, tasks with the same priority are
+    executed in submission order.
+
+    Every task is identified by a key, a key can be pending only once:
+    submitting it again has effect only with an higher priority, in that
+    case the task is moved up in the queue.
+    """
+
+    def __init__(self, workers=1, name='Worker'):
+        self._lock = Lock()
+        self._queue = PriorityQueue()
+        self._pending = {}
+        self._counter = count()
+
+        for n in range(max(workers, 1)):
+            Thread(target=self._work, daemon=True,
+                   name='{}-{}'.format(name, n)).start()
+
+    def submit(self, key, task, *args, priority=0):
+        """Schedule `task(*args)`.
+
+        :return: False if the key is already pending with an equal or
+                 higher priority, True otherwise
+        :rtype: bool
+        """
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is not None and pending <= priority:
+                return False
+
+            self._pending[key] = priority
+            self._queue.put((priority, next(self._counter), key, task, args))
+            return True
+
+    def is_pending(self, key):
+        with self._lock:
+            return key in self._pending
+
+    def cancel(self, key):
+        with self._lock:
+            self._pending.pop(key, None)
+
+    def clear(self):
+        """Cancel all the pending tasks."""
+        with self._lock:
+            self._pending.clear()
+
+    def _work(self):
+        while True:
+            priority, _, key, task, args = self._queue.get()
+
+            with self._lock:
+                # Skip tasks cancelled or moved to an higher priority
+                if self._pending.get(key) != priority:
+                    continue
+                del self._pending[key]
+
+            try:
+                task(*args)
+            except Exception:
+                logging.error(traceback.format_exc())
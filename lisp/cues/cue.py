@@ -17,6 +17,7 @@
 # You should have received a copy of the GNU General Public License
 # along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
 
+import time
 from threading import Lock
 from uuid import uuid4
 
@@ -25,6 +26,7 @@ from lisp.core.decorators import async_function
 from lisp.core.fade_functions import FadeInType, FadeOutType
 from lisp.core.has_properties import HasProperties, Property, WriteOnceProperty
 from lisp.core.rwait import RWait
+from lisp.core.scheduler import Scheduler
 from lisp.core.signal import Signal
 from lisp.core.util import EqEnum
 
@@ -206,6 +208,36 @@ class Cue(HasProperties):
                 fade_type = FadeInType[config['Cue'].get('FadeActionType')]
                 self.fadein(duration, fade_type)
 
+    def execute_at(self, action=CueAction.Default, when=None):
+        """Schedule the execution of the specified action at the given time.
+
+        The time is on the monotonic clock (as `time.monotonic()`), in
+        seconds, GStreamer system-clock times can be used once divided by
+        `Gst.SECOND`; when None the action is executed as soon as possible.
+
+        :param action: the action to be performed
+        :type action: CueAction
+        :param when: the execution time
+        :type when: float
+        :return: the scheduled task, can be cancelled
+        :rtype: lisp.core.scheduler.ScheduledTask
+        """
+        if when is None:
+            when = time.monotonic()
+
+        return Scheduler().schedule(when, self.execute, action, owner=self)
+
+    def scheduled(self):
+        """Return the pending scheduled actions (tasks).
+
+        :rtype: list[lisp.core.scheduler.ScheduledTask]
+        """
+        return Scheduler().pending(owner=self)
+
+    def cancel_scheduled(self):
+        """Cancel all the pending scheduled actions."""
+        Scheduler().cancel(owner=self)
+
     @async_function
     def start(self, fade=False):
         """Start the cue."""
@@ -17,15 +17,18 @@
 # You should have received a copy of the GNU General Public License
 # along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
 
+import time
 from threading import Lock
 
 from PyQt5.QtCore import QT_TRANSLATE_NOOP
 
 from lisp.core.configuration import config
 from lisp.core.decorators import async_function
-from lisp.core.fade_functions import FadeInType, FadeOutType
+from lisp.core.fade_functions import FadeInType, FadeOutType, \
+    fadein_equal_power, fadeout_equal_power
 from lisp.core.fader import Fader
 from lisp.core.has_properties import NestedProperties
+from lisp.core.scheduler import Scheduler
 from lisp.cues.cue import Cue, CueAction, CueState
 
 
@@ -52,6 +55,8 @@ class MediaCue(Cue):
 
         self.__in_fadein = False
         self.__in_fadeout = False
+        self.__start_at = None
+        self.__clock_start = None
 
         self.__volume = self.media.element('Volume')
         self.__fader = Fader(self.__volume, 'current_volume')
@@ -61,7 +66,69 @@ class MediaCue(Cue):
         self.__volume = self.media.element('Volume')
         self.__fader.target = self.__volume
 
+    def execute_at(self, action=CueAction.Default, when=None):
+        if when is None:
+            when = time.monotonic()
+
+        if action == CueAction.Default and \
+                not self._state & CueState.IsRunning:
+            action = CueAction(self.default_start_action)
+
+        if (action in (CueAction.Start, CueAction.FadeInStart) and
+                self._state & CueState.IsStopped and not self.pre_wait):
+            # The cue is started in advance, the media waits (using its
+            # clock) the given time, so the start is sample-accurate
+            lead = config['Cue'].getint('ScheduleLead', fallback=500) / 1000
+            fade = action == CueAction.FadeInStart and self.fadein_duration > 0
+
+            return Scheduler().schedule(when - lead, self.start_at, when,
+                                        fade=fade, owner=self)
+
+        return super().execute_at(action, when)
+
+    def start_at(self, when, crossfade=0, fade=False):
+        """Start the cue at the given time.
+
+        The media is started by its own clock (see `Media.play_at`), with
+        `crossfade` an equal-power fade-in is performed in the media.
+
+        :param when: time of the monotonic clock, in seconds
+        :type when: float
+        :param crossfade: the fade-in duration in milliseconds
+        :type crossfade: int
+        :param fade: True if the cue fade-in should be performed
+        :type fade: bool
+        """
+        # Never consumed if the cue is already running
+        if self._state & CueState.IsRunning:
+            return
+
+        self.__start_at = (when, crossfade)
+        self.start(fade)
+
+    def clock_start(self):
+        """Return the time the playback started, if started on the clock.
+
+        :return: time of the monotonic clock, in seconds, or None if the
+            cue wasn't started by `start_at`
+        :rtype: float | None
+        """
+        return self.__clock_start
+
+    def fadeout_at(self, position, duration):
+        """Perform an equal-power fade-out, in the media, at the given
+        position (in milliseconds).
+        """
+        if self.__volume is not None:
+            self.__volume.fade_at(position, duration,
+                                  self.__volume.current_volume, 0,
+                                  fadeout_equal_power)
+
     def __start__(self, fade=False):
+        start_at = self.__start_at
+        self.__start_at = None
+        self.__clock_start = None if start_at is None else start_at[0]
+
         if fade and self._can_fade(self.fadein_duration):
             self.__volume.current_volume = 0
         else:
@@ -69,13 +136,30 @@ class MediaCue(Cue):
             # just in case we're resuming after a fade-out-and-pause.
             self.__volume.current_volume = self.__volume.volume
 
-        self.media.play()
-        if fade:
-            self._on_start_fade()
+        if start_at is not None:
+            when, crossfade = start_at
+            # The media is started later (by its clock), the fade-in must be
+            # performed in the media, from the start position
+            if crossfade > 0:
+                self.__volume.fade_at(self.media.start_time, crossfade, 0,
+                                      self.__volume.volume,
+                                      fadein_equal_power)
+            elif fade and self._can_fade(self.fadein_duration):
+                self.__volume.fade_at(self.media.start_time,
+                                      self.fadein_duration * 1000, 0,
+                                      self.__volume.volume,
+                                      FadeInType[self.fadein_type].value)
+
+            self.media.play_at(when)
+        else:
+            self.media.play()
+            if fade:
+                self._on_start_fade()
 
         return True
 
     def __stop__(self, fade=False):
+        self.__start_at = None
         if self.__in_fadeout:
             self.__fader.stop()
         else:
@@ -93,6 +177,7 @@ class MediaCue(Cue):
         return True
 
     def __pause__(self, fade=False):
+        self.__start_at = None
         if self.__in_fadeout:
             self.__fader.stop()
         else:
@@ -110,6 +195,7 @@ class MediaCue(Cue):
         return True
 
     def __interrupt__(self, fade=False):
+        self.__start_at = None
         self.__fader.stop()
 
         if self._state & CueState.Running and fade:
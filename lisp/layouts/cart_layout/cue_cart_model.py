@@ -46,12 +46,18 @@ class CueCartModel(ModelAdapter):
 
     def first_empty(self):
         """Return the first empty index."""
-        n = -1
-        for n, index in enumerate(self.__cues.keys()):
-            if n != index:
-                return n
-
-        return n + 1
+        # Indices are unique and sorted, so the n-th key is equal to n only
+        # if all the previous cells are used, this allow a binary search.
+        keys = self.__cues.keys()
+        low, high = 0, len(keys)
+        while low < high:
+            middle = (low + high) // 2
+            if keys[middle] == middle:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
 
     def item(self, index):
         index = self.flat(index)
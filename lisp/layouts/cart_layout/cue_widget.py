@@ -31,7 +31,7 @@ from lisp.cues.media_cue import MediaCue
 from lisp.layouts.cart_layout.page_widget import PageWidget
 from lisp.ui.ui_utils import pixmap_from_icon
 from lisp.ui.widgets import QClickLabel, QClickSlider, QDbMeter,\
-    QDetailedMessageBox
+    QDetailedMessageBox, QWaveformSlider
 
 
 class CueWidget(QWidget):
@@ -78,7 +78,7 @@ class CueWidget(QWidget):
         self.statusIcon.setPixmap(
             pixmap_from_icon('led-off', CueWidget.ICON_SIZE))
 
-        self.seekSlider = QClickSlider(self.nameButton)
+        self.seekSlider = QWaveformSlider(self.nameButton)
         self.seekSlider.setOrientation(Qt.Horizontal)
         self.seekSlider.setFocusPolicy(Qt.NoFocus)
         self.seekSlider.setVisible(False)
@@ -262,10 +262,24 @@ class CueWidget(QWidget):
         self._update_name(cue.name)
         self._update_style(cue.stylesheet)
         self._update_duration(self.cue.duration)
+        self._update_state()
+
+    def _update_state(self):
+        """Reflect the current cue state (the widget could be created after
+        the cue is started, e.g. when a page is loaded)."""
+        if self.cue.state & CueState.Running:
+            self._status_playing()
+        elif self.cue.state & CueState.Pause:
+            self._status_paused()
+            self._update_time(self.cue.current_time(), True)
+        elif self.cue.state & CueState.Error:
+            self.statusIcon.setPixmap(
+                pixmap_from_icon('led-error', CueWidget.ICON_SIZE))
 
     def _media_updated(self):
         self.show_dbmeters(self._show_dbmeter)
         self.show_volume_slider(self._show_volume)
+        self.seekSlider.setUri(self.cue.media.input_uri())
 
     def _update_name(self, name):
         self.nameButton.setText(name)
@@ -340,6 +354,10 @@ class CueWidget(QWidget):
                 self.timeBar.show()
             self.timeBar.setMaximum(duration)
             self.seekSlider.setMaximum(duration)
+
+            # A new duration usually means a new media file
+            if isinstance(self.cue, MediaCue):
+                self.seekSlider.setUri(self.cue.media.input_uri())
         else:
             self.timeBar.hide()
             self.layout().setRowStretch(1, 0)
@@ -17,7 +17,7 @@
 # You should have received a copy of the GNU General Public License
 # along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
 
-from PyQt5.QtCore import Qt, QT_TRANSLATE_NOOP
+from PyQt5.QtCore import Qt, QT_TRANSLATE_NOOP, QTimer
 from PyQt5.QtWidgets import QTabWidget, QAction, QInputDialog, qApp, \
     QMessageBox
 
@@ -37,7 +37,7 @@ from lisp.ui.settings.cue_settings import CueSettingsRegistry
 from lisp.ui.settings.pages.cue_appearance import Appearance
 from lisp.ui.settings.pages.cue_general import CueGeneralSettings
 from lisp.ui.settings.pages.media_cue_settings import MediaCueSettings
-from lisp.ui.ui_utils import translate
+from lisp.ui.ui_utils import translate, delete_later
 
 AppSettings.register_settings_widget(CartLayoutSettings)
 
@@ -63,6 +63,9 @@ class CartLayout(QTabWidget, CueLayout):
         self.__columns = int(config['CartLayout']['GridColumns'])
         self.__rows = int(config['CartLayout']['GridRows'])
         self.__pages = []
+        # Pages with widgets, from the least to the most recently shown
+        self.__loaded_pages = []
+        self.__max_loaded = int(config['CartLayout'].get('LoadedPages', 0))
         self.__context_widget = None
 
         self._show_seek = config['CartLayout'].getboolean('ShowSeek')
@@ -78,6 +81,13 @@ class CartLayout(QTabWidget, CueLayout):
         self._model_adapter.item_moved.connect(self.__cue_moved, Connection.QtQueued)
         self._model_adapter.model_reset.connect(self.__model_reset)
 
+        # Pages are populated only when shown, the timer allow to coalesce
+        # many page switches (e.g. while loading a session) into one
+        self.__load_timer = QTimer(self)
+        self.__load_timer.setSingleShot(True)
+        self.__load_timer.timeout.connect(self.__load_current_page)
+        self.currentChanged.connect(self.__page_changed)
+
         # Add layout-specific menus
         self.new_page_action = QAction(self)
         self.new_page_action.triggered.connect(self.add_page)
@@ -215,6 +225,7 @@ class CartLayout(QTabWidget, CueLayout):
         self.__context_widget.selected = not self.__context_widget.selected
 
     def select_all(self, cue_class=Cue):
+        self.__load_all_pages()
         for widget in self.widgets():
             if isinstance(widget.cue, cue_class):
                 widget.selected = True
@@ -225,6 +236,7 @@ class CartLayout(QTabWidget, CueLayout):
                 widget.selected = False
 
     def invert_selection(self):
+        self.__load_all_pages()
         for widget in self.widgets():
             widget.selected = not widget.selected
 
@@ -291,6 +303,8 @@ class CartLayout(QTabWidget, CueLayout):
             self.removeTab(page)
             self.tabRemoved(page)
             page_widget = self.__pages.pop(page)
+            if page_widget in self.__loaded_pages:
+                self.__loaded_pages.remove(page_widget)
             page_widget.move_drop_event.disconnect()
             page_widget.copy_drop_event.disconnect()
 
@@ -300,7 +314,8 @@ class CartLayout(QTabWidget, CueLayout):
                 self.setTabText(n, text.format(n + 1))
 
     def widgets(self):
-        for page in self.__pages:
+        """Iterate over the widgets of the loaded pages."""
+        for page in self.__loaded_pages:
             for widget in page.widgets():
                 yield widget
 
@@ -370,8 +385,25 @@ class CartLayout(QTabWidget, CueLayout):
         self.cm_registry.remove_item(self.stop_action)
         self.cm_registry.remove_item(self.reset_volume_action)
 
-        # Delete the layout
-        self.deleteLater()
+        # Detach from the model, the widgets are not released one by one
+        # when the model is reset, but all together with the layout
+        self._model_adapter.item_added.disconnect(self.__cue_added)
+        self._model_adapter.item_removed.disconnect(self.__cue_removed)
+        self._model_adapter.item_moved.disconnect(self.__cue_moved)
+        self._model_adapter.model_reset.disconnect(self.__model_reset)
+        self.__load_timer.stop()
+
+        self.hide()
+        self.__context_widget = None
+        self.__loaded_pages.clear()
+
+        widgets = []
+        for page in self.__pages:
+            widgets.extend(page.widgets())
+            page.reset()
+
+        # Delete the widgets in batches, then the layout
+        delete_later(widgets + [self])
 
     def _move_widget(self, widget, to_row, to_column):
         new_index = self.to_1d_index((self.currentIndex(), to_row, to_column))
@@ -409,22 +441,22 @@ class CartLayout(QTabWidget, CueLayout):
     def __cue_added(self, cue):
         page, row, column = self.to_3d_index(cue.index)
 
-        widget = CueWidget(cue)
-        widget.cue_executed.connect(self.cue_executed.emit)
-        widget.context_menu_request.connect(self._on_context_menu)
-        widget.edit_request.connect(self.edit_cue)
-        widget.set_accurate_timing(self._accurate_timing)
-        widget.set_countdown_mode(self._countdown_mode)
-        widget.show_dbmeters(self._show_dbmeter)
-        widget.show_seek_slider(self._show_seek)
-        widget.show_volume_slider(self._show_volume)
-
         if page >= len(self.__pages):
             self.add_page()
 
-        self.__pages[page].add_widget(widget, row, column)
+        # The widget could be already created by a (deferred) page loading
+        if self.__pages[page] in self.__loaded_pages and \
+                self.__pages[page].widget(row, column) is None:
+            self.__pages[page].add_widget(self.__create_widget(cue), row,
+                                          column)
+
         self.setCurrentIndex(page)
 
+        # Changing to the same index doesn't emit "currentChanged", but the
+        # page could be not loaded (e.g. after a reset), load it anyway
+        if self.__pages[page] not in self.__loaded_pages:
+            self.__load_timer.start(0)
+
     def __cue_removed(self, cue):
         if isinstance(cue, MediaCue):
             cue.media.interrupt()
@@ -432,25 +464,100 @@ class CartLayout(QTabWidget, CueLayout):
             cue.stop()
 
         page, row, column = self.to_3d_index(cue.index)
-        widget = self.__pages[page].take_widget(row, column)
-
-        widget.cue_executed.disconnect()
-        widget.context_menu_request.disconnect()
-        widget.edit_request.disconnect()
-
-        widget.deleteLater()
+        widget = self.__pages[page].widget(row, column)
+        if widget is not None and widget.cue is cue:
+            self.__release_widget(self.__pages[page].take_widget(row, column))
 
     def __cue_moved(self, old_index, new_index):
         o_page, o_row, o_column = self.to_3d_index(old_index)
         n_page, n_row, n_column = self.to_3d_index(new_index)
 
-        if o_page == n_page:
-            self.__pages[n_page].move_widget(o_row, o_column, n_row, n_column)
-        else:
+        widget = None
+        if self.__pages[o_page].widget(o_row, o_column) is not None:
             widget = self.__pages[o_page].take_widget(o_row, o_column)
+
+        if self.__pages[n_page] in self.__loaded_pages and \
+                self.__pages[n_page].widget(n_row, n_column) is None:
+            if widget is None:
+                widget = self.__create_widget(
+                    self._model_adapter.item(new_index))
             self.__pages[n_page].add_widget(widget, n_row, n_column)
+        elif widget is not None:
+            self.__release_widget(widget)
 
     def __model_reset(self):
         self.__context_widget = None
+        self.__loaded_pages.clear()
         for page in self.__pages:
-            page.reset()
+            for widget in page.take_widgets():
+                self.__release_widget(widget)
+
+    def __create_widget(self, cue):
+        widget = CueWidget(cue)
+        widget.cue_executed.connect(self.cue_executed.emit)
+        widget.context_menu_request.connect(self._on_context_menu)
+        widget.edit_request.connect(self.edit_cue)
+        widget.set_accurate_timing(self._accurate_timing)
+        widget.set_countdown_mode(self._countdown_mode)
+        widget.show_dbmeters(self._show_dbmeter)
+        widget.show_seek_slider(self._show_seek)
+        widget.show_volume_slider(self._show_volume)
+
+        return widget
+
+    def __release_widget(self, widget):
+        if widget is self.__context_widget:
+            self.__context_widget = None
+
+        widget.cue_executed.disconnect()
+        widget.context_menu_request.disconnect()
+        widget.edit_request.disconnect()
+
+        widget.deleteLater()
+
+    def __page_changed(self):
+        self.__load_timer.start(0)
+
+    def __load_page(self, index):
+        page = self.__pages[index]
+
+        if page in self.__loaded_pages:
+            # Mark the page as the most recently used
+            self.__loaded_pages.remove(page)
+        else:
+            for cue in self._model_adapter.iter_page(index):
+                # "iter_page" edges are inclusive, skip the following page
+                c_page, row, column = self.to_3d_index(cue.index)
+                if c_page == index and page.widget(row, column) is None:
+                    page.add_widget(self.__create_widget(cue), row, column)
+
+        self.__loaded_pages.append(page)
+
+    def __load_current_page(self):
+        if 0 <= self.currentIndex() < len(self.__pages):
+            self.__load_page(self.currentIndex())
+            self.__unload_pages()
+
+    def __load_all_pages(self):
+        for index in range(len(self.__pages)):
+            if self.__pages[index] not in self.__loaded_pages:
+                self.__load_page(index)
+
+    def __unload_pages(self):
+        """Release the widgets of the least recently shown pages.
+
+        Pages with selected widgets and the current page are always kept.
+        """
+        if self.__max_loaded <= 0:
+            return
+
+        current = self.currentWidget()
+        for page in self.__loaded_pages.copy():
+            if len(self.__loaded_pages) <= self.__max_loaded:
+                break
+
+            if page is not current and \
+                    not any(widget.selected for widget in page.widgets()):
+                self.__loaded_pages.remove(page)
+                for widget in page.take_widgets():
+                    self.__release_widget(widget)
@@ -73,6 +73,14 @@ class PageWidget(QWidget):
         else:
             raise IndexError('cell {} is empty'.format((row, column)))
 
+    def take_widgets(self):
+        """Remove all the widgets from the page and return them."""
+        widgets = []
+        for row, column in list(self.__widgets.keys()):
+            widgets.append(self.take_widget(row, column))
+
+        return widgets
+
     def move_widget(self, o_row, o_column, n_row, n_column):
         widget = self.take_widget(o_row, o_column)
         self.add_widget(widget, n_row, n_column)
@@ -17,11 +17,13 @@
 # You should have received a copy of the GNU General Public License
 # along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
 
+import time
 from abc import abstractmethod
 
 from PyQt5.QtWidgets import QAction, QMenu, qApp
 
 from lisp.core.actions_handler import MainActionsHandler
+from lisp.core.scheduler import Scheduler
 from lisp.core.signal import Signal
 from lisp.core.util import greatest_common_superclass
 from lisp.cues.cue import Cue, CueAction
@@ -92,6 +94,34 @@ class CueLayout:
         :rtype: lisp.cues.cue.Cue
         """
 
+    def execute_at(self, cues, action=CueAction.Default, when=None):
+        """Schedule the same action, at the same time, for the given cues.
+
+        :param cues: the cues to be executed
+        :param action: the action the cues should execute
+        :param when: the execution time (see `Cue.execute_at`)
+        :return: the scheduled tasks
+        :rtype: list[lisp.core.scheduler.ScheduledTask]
+        """
+        if when is None:
+            when = time.monotonic()
+
+        return [cue.execute_at(action, when) for cue in cues]
+
+    def scheduled(self):
+        """Return the pending scheduled actions of the layout cues.
+
+        :rtype: list[lisp.core.scheduler.ScheduledTask]
+        """
+        return [task for task in Scheduler().pending()
+                if isinstance(task.owner, Cue) and
+                task.owner in self._cue_model]
+
+    def cancel_scheduled(self):
+        """Cancel all the pending scheduled actions of the layout cues."""
+        for task in self.scheduled():
+            task.cancel()
+
     @abstractmethod
     def finalize(self):
         """Destroy all the layout elements"""
@@ -169,6 +169,23 @@ class CueListView(QTreeWidget):
         self.reset()
         self.clear()
 
+    def detach(self):
+        """Stop following the model, return the cues widgets."""
+        self._model.item_added.disconnect(self.__cue_added)
+        self._model.item_moved.disconnect(self.__cue_moved)
+        self._model.item_removed.disconnect(self.__cue_removed)
+        self._model.model_reset.disconnect(self.__model_reset)
+
+        widgets = []
+        for index in range(self.topLevelItemCount()):
+            item = self.topLevelItem(index)
+            for column in range(self.columnCount()):
+                widget = self.itemWidget(item, column)
+                if widget is not None:
+                    widgets.append(widget)
+
+        return widgets
+
     def __init_item(self, item, cue):
         item.name_column = CueListView.HEADER_NAMES.index('Cue')
         for index, widget in enumerate(CueListView.HEADER_WIDGETS):
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Linux Show Player
+#
+# Copyright 2012-2016 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+import time
+from threading import Lock
+from weakref import WeakKeyDictionary
+
+from lisp.core.configuration import config
+from lisp.core.scheduler import Scheduler
+from lisp.core.signal import Signal
+from lisp.cues.cue import CueNextAction, CueState
+from lisp.cues.media_cue import MediaCue
+
+
+class _Follow:
+    def __init__(self, cue, next_cue, when, crossfade):
+        self.cue = cue
+        self.next_cue = next_cue
+        self.when = when
+        self.crossfade = crossfade
+        self.started = False
+        self.tasks = []
+
+    def cancel(self):
+        for task in self.tasks:
+            task.cancel()
+
+
+class GaplessFollow:
+    """Schedule the auto-follow between media cues on the clock.
+
+    Instead of starting the next cue after the end of the current one, the
+    next media is prerolled ahead of time, and started (by its clock) when
+    the current one ends, or before, with an equal-power crossfade.
+    """
+
+    # Start the cue a bit earlier, the media will wait the given time
+    START_MARGIN = 0.2
+
+    def __init__(self, model_adapter):
+        self._model_adapter = model_adapter
+        self._follows = {}
+        self._cues = WeakKeyDictionary()
+        self._lock = Lock()
+
+        self._preroll = config['ListLayout'].getint('FollowPreroll',
+                                                    fallback=2000) / 1000
+        self._crossfade = config['ListLayout'].getint('FollowCrossfade',
+                                                      fallback=0)
+
+        self.followed = Signal()
+        """Emitted when a cue ends after its follow is started on the clock
+        (cue, next_cue, gap), the gap (milliseconds) between the end of the
+        cue and the start of the next one (crossfade excluded), negative
+        values are overlaps"""
+
+    def add_cue(self, cue):
+        if isinstance(cue, MediaCue):
+            self._cues[cue.media] = cue
+            # The end-time is known only once the media is playing
+            cue.media.played.connect(self.__played)
+            cue.paused.connect(self.cancel)
+            cue.stopped.connect(self.cancel)
+            cue.interrupted.connect(self.cancel)
+            cue.error.connect(self.cancel)
+            cue.media.sought.connect(self.__sought)
+            cue.end.connect(self.__ended)
+
+    def cancel(self, cue, *args):
+        with self._lock:
+            follow = self._follows.pop(cue.id, None)
+
+        if follow is not None:
+            follow.cancel()
+            # Release the prerolled media
+            if not follow.started and follow.next_cue.state & CueState.Stop:
+                follow.next_cue.media.interrupt()
+
+    def handled(self, cue):
+        """Return True if the next cue has been already started on the clock.
+
+        Called when `cue` ends.
+        """
+        with self._lock:
+            follow = self._follows.pop(cue.id, None)
+
+        if follow is not None and not follow.started:
+            # Too late, the next cue is started as usual
+            follow.cancel()
+        elif follow is not None:
+            return True
+
+        return False
+
+    def __ended(self, cue):
+        # Measured here, the "next" of the cue could be handled later
+        now = time.monotonic()
+        with self._lock:
+            follow = self._follows.get(cue.id)
+
+        if follow is not None and follow.started:
+            gap = (follow.when + follow.crossfade / 1000 - now) * 1000
+            logging.debug('GAPLESS-FOLLOW: "{}" -> "{}", gap {:.1f} ms'.format(
+                cue.name, follow.next_cue.name, gap))
+            self.followed.emit(cue, follow.next_cue, gap)
+
+    def __sought(self, media, position):
+        # The end-time is changed, schedule again
+        with self._lock:
+            follows = [f for f in self._follows.values()
+                       if f.cue.media is media]
+
+        now = time.monotonic()
+        for follow in follows:
+            if follow.started:
+                if follow.when <= now:
+                    # Already playing, nothing to change
+                    continue
+
+                # Waiting for the old start time, must be prerolled again
+                follow.next_cue.interrupt()
+
+            self.cancel(follow.cue)
+            self.__schedule(follow.cue, position)
+
+    def __played(self, media):
+        cue = self._cues.get(media)
+        if cue is not None:
+            self.__schedule(cue)
+
+    def __schedule(self, cue, position=None):
+        """Schedule the follow of `cue`.
+
+        :param position: the media position, if just changed (e.g. seek),
+            otherwise the follow is computed from the playback start
+        """
+        if cue.next_action != CueNextAction.AutoFollow or cue.media.loop != 0:
+            return
+
+        try:
+            next_cue = self._model_adapter.item(cue.index + 1)
+        except IndexError:
+            return
+
+        if (not isinstance(next_cue, MediaCue) or next_cue.pre_wait > 0 or
+                not next_cue.state & CueState.Stop):
+            return
+
+        media = cue.media
+        end = media.duration
+        if 0 < media.stop_time < end:
+            end = media.stop_time
+
+        start = None if position is not None else cue.clock_start()
+        if start is not None:
+            # Started on the clock, from the start position (prerolled)
+            position = media.start_time
+        else:
+            start = time.monotonic()
+            if position is None:
+                position = media.current_time()
+
+        remaining = end - position
+        if remaining <= 0:
+            return
+
+        crossfade = min(self._crossfade, remaining, next_cue.duration)
+        when = start + (remaining - crossfade) / 1000
+        follow = _Follow(cue, next_cue, when, crossfade)
+
+        with self._lock:
+            previous = self._follows.get(cue.id)
+            if previous is not None:
+                previous.cancel()
+            self._follows[cue.id] = follow
+
+        scheduler = Scheduler()
+        follow.tasks.append(scheduler.schedule(
+            when - self._preroll, next_cue.media.preroll, owner=next_cue))
+        follow.tasks.append(scheduler.schedule(
+            when - self.START_MARGIN, self.__start, follow, owner=next_cue))
+
+        if crossfade > 0:
+            cue.fadeout_at(end - crossfade, crossfade)
+
+    @staticmethod
+    def __start(follow):
+        follow.started = True
+        follow.next_cue.start_at(follow.when, follow.crossfade)
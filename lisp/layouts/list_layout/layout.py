@@ -33,6 +33,7 @@ from lisp.layouts.list_layout.control_buttons import ShowControlButtons
 from lisp.layouts.list_layout.cue_list_model import CueListModel, \
     RunningCueModel
 from lisp.layouts.list_layout.cue_list_view import CueListView
+from lisp.layouts.list_layout.gapless_follow import GaplessFollow
 from lisp.layouts.list_layout.info_panel import InfoPanel
 from lisp.layouts.list_layout.list_layout_settings import ListLayoutSettings
 from lisp.layouts.list_layout.playing_list_widget import RunningCuesListWidget
@@ -42,7 +43,7 @@ from lisp.ui.settings.cue_settings import CueSettingsRegistry
 from lisp.ui.settings.pages.cue_appearance import Appearance
 from lisp.ui.settings.pages.cue_general import CueGeneralSettings
 from lisp.ui.settings.pages.media_cue_settings import MediaCueSettings
-from lisp.ui.ui_utils import translate
+from lisp.ui.ui_utils import translate, delete_later
 
 AppSettings.register_settings_widget(ListLayoutSettings)
 
@@ -73,6 +74,7 @@ class ListLayout(QWidget, CueLayout):
 
         self._model_adapter = CueListModel(self._cue_model)
         self._model_adapter.item_added.connect(self.__cue_added)
+        self._gapless_follow = GaplessFollow(self._model_adapter)
         self._model_adapter.item_removed.connect(self.__cue_removed)
 
         self._playing_model = RunningCueModel(self._cue_model)
@@ -366,8 +368,17 @@ class ListLayout(QWidget, CueLayout):
         self.cm_registry.remove_item(self.remove_action)
         self.cm_registry.remove_item(self.select_action)
 
-        # Delete the layout
-        self.deleteLater()
+        # Detach from the model, the widgets are not released one by one
+        # when the model is reset, but all together with the layout
+        self._model_adapter.item_added.disconnect(self.__cue_added)
+        self._model_adapter.item_removed.disconnect(self.__cue_removed)
+        widgets = self.listView.detach()
+
+        self.hide()
+        self._context_item = None
+
+        # Delete the widgets in batches, then the layout
+        delete_later(widgets + [self])
 
     def get_context_cue(self):
         return self._context_item.cue
@@ -400,8 +411,10 @@ class ListLayout(QWidget, CueLayout):
 
     def __cue_added(self, cue):
         cue.next.connect(self.__cue_next, Connection.QtQueued)
+        self._gapless_follow.add_cue(cue)
 
     def __cue_removed(self, cue):
+        self._gapless_follow.cancel(cue)
         if isinstance(cue, MediaCue):
             cue.media.interrupt()
         else:
@@ -412,7 +425,9 @@ class ListLayout(QWidget, CueLayout):
             next_index = cue.index + 1
             if next_index < len(self._model_adapter):
                 next_cue = self._model_adapter.item(next_index)
-                next_cue.execute()
+                # Not executed if already started on the clock
+                if not self._gapless_follow.handled(cue):
+                    next_cue.execute()
 
                 if self._auto_continue and next_cue == self.current_cue():
                     self.set_current_index(next_index + 1)
@@ -29,7 +29,7 @@ from lisp.core.util import strtime
 from lisp.cues.cue_time import CueTime
 from lisp.cues.media_cue import MediaCue
 from lisp.layouts.list_layout.control_buttons import CueControlButtons
-from lisp.ui.widgets import QClickSlider, QDbMeter
+from lisp.ui.widgets import QDbMeter, QWaveformSlider
 
 
 def get_running_widget(cue, **kwargs):
@@ -173,9 +173,10 @@ class RunningMediaCueWidget(RunningCueWidget):
 
         self._dbmeter_element = None
 
-        self.seekSlider = QClickSlider(self.gridLayoutWidget)
+        self.seekSlider = QWaveformSlider(self.gridLayoutWidget)
         self.seekSlider.setOrientation(Qt.Horizontal)
         self.seekSlider.setRange(0, cue.duration)
+        self.seekSlider.setUri(cue.media.input_uri())
         self.seekSlider.setFocusPolicy(Qt.NoFocus)
         self.seekSlider.sliderMoved.connect(self._seek)
         self.seekSlider.sliderJumped.connect(self._seek)
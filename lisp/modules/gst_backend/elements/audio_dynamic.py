@@ -63,4 +63,7 @@ class AudioDynamic(GstMediaElement):
         return self.audio_dynamic
 
     def src(self):
+        return self.audio_converter
+
+    def converter(self):
         return self.audio_converter
\ No newline at end of file
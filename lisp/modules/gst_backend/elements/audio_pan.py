@@ -42,8 +42,14 @@ class AudioPan(GstMediaElement):
 
         self.panorama.link(self.audio_convert)
 
+    def neutral(self):
+        return self.pan == 0
+
     def sink(self):
         return self.panorama
 
     def src(self):
         return self.audio_convert
+
+    def converter(self):
+        return self.audio_convert
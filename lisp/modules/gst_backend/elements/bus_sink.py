@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Linux Show Player
+#
+# Copyright 2012-2016 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+from itertools import count
+
+from PyQt5.QtCore import QT_TRANSLATE_NOOP
+
+from lisp.backend.media_element import ElementType, MediaType
+from lisp.core.has_properties import Property
+from lisp.modules.gst_backend.gi_repository import Gst
+from lisp.modules.gst_backend.gst_element import GstMediaElement
+from lisp.modules.gst_backend.gst_output_bus import OutputBuses
+
+
+class BusSink(GstMediaElement):
+    """Send the audio to a shared output bus (see OutputBuses).
+
+    The media is mixed by the bus only while playing (or paused), so all
+    the media share a single device client/stream.
+    """
+
+    ElementType = ElementType.Output
+    MediaType = MediaType.Audio
+    Name = QT_TRANSLATE_NOOP('MediaElementName', 'Output Bus')
+
+    _Channels = count()
+
+    bus = Property(default='main')
+
+    def __init__(self, pipe):
+        super().__init__()
+
+        self.channel = 'lisp-bus-{}'.format(next(BusSink._Channels))
+        self._attached = None
+
+        self.audio_convert = Gst.ElementFactory.make('audioconvert', None)
+        self.audio_resample = Gst.ElementFactory.make('audioresample', None)
+        self.inter_sink = Gst.ElementFactory.make('interaudiosink', 'sink')
+        self.inter_sink.set_property('channel', self.channel)
+
+        pipe.add(self.audio_convert)
+        pipe.add(self.audio_resample)
+        pipe.add(self.inter_sink)
+
+        self.audio_convert.link(self.audio_resample)
+        self.audio_resample.link(self.inter_sink)
+
+        self.changed('bus').connect(self.__bus_changed)
+
+    def sink(self):
+        return self.audio_convert
+
+    def play(self):
+        if self._attached is None:
+            self._attached = OutputBuses().get(self.bus)
+            self._attached.attach(self.channel)
+
+    def stop(self):
+        self.__detach()
+
+    def interrupt(self):
+        self.__detach()
+
+    def dispose(self):
+        self.__detach()
+
+    def __detach(self):
+        if self._attached is not None:
+            self._attached.detach(self.channel)
+            self._attached = None
+
+    def __bus_changed(self, bus):
+        if self._attached is not None and self._attached.name != bus.lower():
+            self.__detach()
+            self.play()
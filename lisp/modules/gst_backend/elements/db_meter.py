@@ -17,12 +17,35 @@
 # You should have received a copy of the GNU General Public License
 # along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
 
+from threading import Lock
+
 from PyQt5.QtCore import QT_TRANSLATE_NOOP
 
 from lisp.backend.media_element import ElementType, MediaType
+from lisp.backend.meter_engine import MeterEngine
 from lisp.core.signal import Signal
 from lisp.modules.gst_backend.gi_repository import Gst
+from lisp.modules.gst_backend.gst_bus import GstBusDispatcher
 from lisp.modules.gst_backend.gst_element import GstMediaElement, GstProperty
+from lisp.modules.gst_backend.gst_state import GstStateWorker
+from lisp.modules.gst_backend.gst_utils import gst_block_pad, \
+    gst_template_caps
+
+
+class MeterSignal(Signal):
+    """Signal that notify when slots are connected or disconnected."""
+
+    def __init__(self, on_change):
+        super().__init__()
+        self._on_change = on_change
+
+    def connect(self, slot_callable, *args, **kwargs):
+        super().connect(slot_callable, *args, **kwargs)
+        self._on_change()
+
+    def disconnect(self, slot=None):
+        super().disconnect(slot)
+        self._on_change()
 
 
 class DbMeter(GstMediaElement):
@@ -37,40 +60,111 @@ class DbMeter(GstMediaElement):
     def __init__(self, pipeline):
         super().__init__()
 
-        self.level_ready = Signal()
+        # The "level" element is in the pipeline only while someone is
+        # connected to this signal, otherwise a do-nothing element is used
+        self.level_ready = MeterSignal(self.__request_update)
 
         self.pipeline = pipeline
         self.level = Gst.ElementFactory.make('level', None)
-        self.level.set_property('post-messages', True)
+        self.level.set_property('post-messages', False)
         self.level.set_property('interval', 50 * Gst.MSECOND)
         self.level.set_property('peak-ttl', Gst.SECOND)
         self.level.set_property('peak-falloff', 20)
+        self.bypass = Gst.ElementFactory.make('identity', None)
+        self.bypass.set_property('signal-handoffs', False)
         self.audio_convert = Gst.ElementFactory.make('audioconvert', None)
 
-        self.pipeline.add(self.level)
+        self.pipeline.add(self.bypass)
         self.pipeline.add(self.audio_convert)
 
-        self.level.link(self.audio_convert)
+        self.bypass.link(self.audio_convert)
+
+        self._metering = False
+        self._metering_lock = Lock()
+
+        # Levels are delivered by the engine, once per frame
+        self._meter = MeterEngine().register(
+            self.level_ready, self.peak_ttl / Gst.SECOND, self.peak_falloff)
+        self.changed('peak_ttl').connect(self.__configure_meter)
+        self.changed('peak_falloff').connect(self.__configure_meter)
 
-        bus = self.pipeline.get_bus()
-        bus.add_signal_watch()
-        self._handler = bus.connect('message::element', self.__on_message)
+        self._handler = GstBusDispatcher().connect(
+            self.pipeline, Gst.MessageType.ELEMENT, self.__on_message,
+            src=self.level)
 
     def dispose(self):
-        bus = self.pipeline.get_bus()
-        bus.remove_signal_watch()
-        bus.disconnect(self._handler)
+        GstBusDispatcher().disconnect(self.pipeline, self._handler)
+        MeterEngine().unregister(self._meter)
+
+    def play(self):
+        # Slots can expire without being disconnected
+        self.__request_update()
+
+    def stop(self):
+        MeterEngine().reset(self._meter)
+
+    def pause(self):
+        MeterEngine().reset(self._meter)
+
+    def interrupt(self):
+        MeterEngine().reset(self._meter)
 
     def sink(self):
-        return self.level
+        return self.level if self._metering else self.bypass
 
     def src(self):
         return self.audio_convert
 
+    def sink_accepts(self, caps):
+        # The level element is swapped in at runtime, both must accept
+        level_caps = gst_template_caps(self.level, Gst.PadDirection.SINK)
+        return (super().sink_accepts(caps) and level_caps is not None and
+                caps.is_subset(level_caps))
+
     def __on_message(self, bus, message):
-        if message.src == self.level:
-            structure = message.get_structure()
-            if structure is not None and structure.has_name('level'):
-                self.level_ready.emit(structure.get_value('peak'),
-                                      structure.get_value('rms'),
-                                      structure.get_value('decay'))
+        structure = message.get_structure()
+        if structure is not None and structure.has_name('level'):
+            MeterEngine().update(self._meter,
+                                 structure.get_value('peak'),
+                                 structure.get_value('rms'))
+
+    def __request_update(self):
+        # Swapped in order with the pipeline state changes, and outside the
+        # calling thread (e.g. the GUI one), since the stream is waited
+        GstStateWorker().submit(self.pipeline, self.__update_metering)
+
+    def __update_metering(self):
+        with self._metering_lock:
+            metering = self.level_ready.is_connected()
+            if metering != self._metering:
+                if metering:
+                    self.__swap(self.bypass, self.level)
+                else:
+                    self.__swap(self.level, self.bypass)
+
+                self.level.set_property('post-messages', metering)
+                self._metering = metering
+
+    def __swap(self, old, new):
+        # Block the stream (if linked) before swapping the elements
+        peer = old.sinkpads[0].get_peer()
+        if peer is not None:
+            playing = self.pipeline.get_state(0)[1] == Gst.State.PLAYING
+            probe = gst_block_pad(peer, wait=playing)
+            peer.unlink(old.sinkpads[0])
+
+        old.unlink(self.audio_convert)
+        old.set_state(Gst.State.NULL)
+        self.pipeline.remove(old)
+
+        self.pipeline.add(new)
+        new.link(self.audio_convert)
+        new.sync_state_with_parent()
+
+        if peer is not None:
+            peer.link(new.sinkpads[0])
+            peer.remove_probe(probe)
+
+    def __configure_meter(self, *args):
+        MeterEngine().configure(
+            self._meter, self.peak_ttl / Gst.SECOND, self.peak_falloff)
@@ -51,8 +51,14 @@ class Equalizer10(GstMediaElement):
 
         self.equalizer.link(self.audio_converter)
 
+    def neutral(self):
+        return all(getattr(self, 'band{}'.format(n)) == 0 for n in range(10))
+
     def sink(self):
         return self.equalizer
 
     def src(self):
         return self.audio_converter
+
+    def converter(self):
+        return self.audio_converter
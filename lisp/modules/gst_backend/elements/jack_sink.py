@@ -18,13 +18,14 @@
 # along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
 
 import jack
-import logging
 from PyQt5.QtCore import QT_TRANSLATE_NOOP
 
 from lisp.backend.media_element import ElementType, MediaType
 from lisp.core.has_properties import Property
 from lisp.modules.gst_backend.gi_repository import Gst
+from lisp.modules.gst_backend.gst_bus import GstBusDispatcher
 from lisp.modules.gst_backend.gst_element import GstMediaElement, GstProperty
+from lisp.modules.gst_backend.gst_jack_graph import JackGraph
 
 
 class JackSink(GstMediaElement):
@@ -36,6 +37,7 @@ class JackSink(GstMediaElement):
     CONNECT_MODE = 'none'
 
     _ControlClient = None
+    _Graph = None
     _clients = []
 
     connections = Property(default=[[] for _ in range(8)])
@@ -45,6 +47,7 @@ class JackSink(GstMediaElement):
 
         if JackSink._ControlClient is None:
             JackSink._ControlClient = jack.Client('LinuxShowPlayer_Control')
+            JackSink._Graph = JackGraph(JackSink._ControlClient)
 
         self.pipeline = pipeline
         self.audio_resample = Gst.ElementFactory.make('audioresample')
@@ -63,37 +66,44 @@ class JackSink(GstMediaElement):
         self.connections = self.default_connections(JackSink._ControlClient)
         self.changed('connections').connect(self.__prepare_connections)
 
-        bus = self.pipeline.get_bus()
-        bus.add_signal_watch()
-        self._handler = bus.connect('message', self.__on_message)
+        self._handler = GstBusDispatcher().connect(
+            self.pipeline, Gst.MessageType.STATE_CHANGED, self.__on_message,
+            src=self.jack_sink)
 
     def sink(self):
         return self.audio_resample
 
     def dispose(self):
         try:
-            self.pipeline.get_bus().disconnect(self._handler)
+            GstBusDispatcher().disconnect(self.pipeline, self._handler)
             JackSink._clients.remove(self._client_id)
         finally:
             if not JackSink._clients:
                 JackSink._ControlClient.deactivate()
                 JackSink._ControlClient.close()
                 JackSink._ControlClient = None
+                JackSink._Graph = None
 
     @classmethod
     def default_connections(cls, client):
         # Up to 8 channels
         connections = [[] for _ in range(8)]
 
-        if isinstance(client, jack.Client):
+        if client is not None and client is cls._ControlClient:
+            # Search for default input ports, in the cached graph
+            input_ports = cls._Graph.ports('system:', is_input=True)
+        elif isinstance(client, jack.Client):
             # Search for default input ports
-            input_ports = client.get_ports(name_pattern='^system:',
-                                           is_audio=True, is_input=True)
-            for n, port in enumerate(input_ports):
-                if n < len(connections):
-                    connections[n].append(port.name)
-                else:
-                    break
+            input_ports = [port.name for port in client.get_ports(
+                name_pattern='^system:', is_audio=True, is_input=True)]
+        else:
+            input_ports = []
+
+        for n, port_name in enumerate(input_ports):
+            if n < len(connections):
+                connections[n].append(port_name)
+            else:
+                break
 
         return connections
 
@@ -116,34 +126,21 @@ class JackSink(GstMediaElement):
         return n
 
     def __jack_connect(self):
-        out_ports = JackSink._ControlClient.get_ports(
-            name_pattern='^' + self._client_name + ':.+', is_audio=True)
-
-        for port in out_ports:
-            for conn_port in JackSink._ControlClient.get_all_connections(port):
-                try:
-                    JackSink._ControlClient.disconnect(port, conn_port)
-                except jack.JackError as e:
-                    logging.error('GST: JACK-SINK: {}'.format(e))
-
-        for output, in_ports in enumerate(self.connections):
-            for input_name in in_ports:
-                if output < len(out_ports):
-                    try:
-                        JackSink._ControlClient.connect(out_ports[output],
-                                                        input_name)
-                    except jack.JackError as e:
-                        logging.error('GST: JACK-SINK: {}'.format(e))
-                else:
-                    break
+        out_ports = JackSink._Graph.client_ports(self._client_name)
+
+        # Only the connections that differ from the current ones are changed
+        for output, port_name in enumerate(out_ports):
+            if output < len(self.connections):
+                wanted = set(self.connections[output])
+            else:
+                wanted = set()
+
+            JackSink._Graph.connect(port_name, wanted)
 
     def __on_message(self, bus, message):
-        if message.src == self.jack_sink:
-            if message.type == Gst.MessageType.STATE_CHANGED:
-                change = message.parse_state_changed()
-
-                # The jack ports are available when the the jackaudiosink
-                # change from READY to PAUSED state
-                if (change[0] == Gst.State.READY and
-                        change[1] == Gst.State.PAUSED):
-                    self.__jack_connect()
+        change = message.parse_state_changed()
+
+        # The jack ports are available when the the jackaudiosink
+        # change from READY to PAUSED state
+        if change[0] == Gst.State.READY and change[1] == Gst.State.PAUSED:
+            self.__jack_connect()
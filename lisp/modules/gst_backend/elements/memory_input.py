@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Linux Show Player
+#
+# Copyright 2012-2016 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+from PyQt5.QtCore import QT_TRANSLATE_NOOP
+
+from lisp.modules.gst_backend.elements.uri_input import UriInput
+from lisp.modules.gst_backend.gi_repository import Gst, GstApp
+from lisp.modules.gst_backend.gst_pcm_cache import PcmCache
+from lisp.modules.gst_backend.gst_state import GstStateWorker
+
+
+class MemoryInput(UriInput):
+    """Play short files from memory, pre-decoded by the shared PcmCache.
+
+    When the file is not (yet) cached, e.g. is too long, the element works
+    exactly as an UriInput.
+    """
+
+    Name = QT_TRANSLATE_NOOP('MediaElementName', 'Memory Input')
+
+    # Frames pushed for each buffer
+    CHUNK_FRAMES = 4096
+
+    def __init__(self, pipe):
+        super().__init__(pipe)
+        self.pipe = pipe
+
+        self.app_src = Gst.ElementFactory.make('appsrc', None)
+        self.app_src.set_property('format', Gst.Format.TIME)
+        self.app_src.set_property('stream-type',
+                                  GstApp.AppStreamType.SEEKABLE)
+        self._need_handler = self.app_src.connect('need-data',
+                                                  self.__need_data)
+        self._seek_handler = self.app_src.connect('seek-data',
+                                                  self.__seek_data)
+
+        # The PcmData currently in use, None when using the uridecodebin
+        self._pcm = None
+        self._offset = 0
+
+        self.changed('uri').connect(self.__preload)
+
+    def play(self):
+        super().play()
+        # Executed in order with the pipeline state changes, so the state
+        # checked is not going to change meanwhile
+        GstStateWorker().submit(self.pipe, self.__prepare,
+                                PcmCache().get(self.uri))
+
+    def dispose(self):
+        super().dispose()
+        self.app_src.disconnect(self._need_handler)
+        self.app_src.disconnect(self._seek_handler)
+        self._pcm = None
+
+    def __prepare(self, pcm):
+        # Sources can be swapped only when the media is stopped
+        if self.pipe.get_state(0)[1] <= Gst.State.READY:
+            self.__use(pcm)
+
+    def __preload(self, uri):
+        if uri:
+            PcmCache().preload(uri)
+
+    def __use(self, pcm):
+        if pcm is self._pcm:
+            return
+
+        if pcm is not None and self._pcm is None:
+            self.__swap(self.decoder, self.app_src)
+        elif pcm is None:
+            self.__swap(self.app_src, self.decoder)
+            # Maybe it was evicted, try to load it again for the next time
+            self.__preload(self.uri)
+
+        if pcm is not None:
+            self.app_src.set_property('caps', pcm.caps())
+            self.app_src.set_property('size', len(pcm.data))
+
+        self._pcm = pcm
+        self._offset = 0
+
+    def __swap(self, old, new):
+        old.unlink(self.audio_convert)
+        self.pipe.remove(old)
+        old.set_state(Gst.State.NULL)
+
+        self.pipe.add(new)
+        # The uridecodebin is linked when its pad is added
+        if new is self.app_src:
+            new.link(self.audio_convert)
+        new.sync_state_with_parent()
+
+    def __need_data(self, src, length):
+        pcm = self._pcm
+        if pcm is None:
+            return
+
+        if self._offset >= len(pcm.data):
+            src.emit('end-of-stream')
+        else:
+            chunk_size = self.CHUNK_FRAMES * pcm.frame_size
+            chunk = pcm.data[self._offset:self._offset + chunk_size]
+
+            buffer = Gst.Buffer.new_wrapped(chunk)
+            buffer.pts = pcm.time(self._offset)
+            buffer.duration = pcm.time(len(chunk))
+
+            self._offset += len(chunk)
+            src.emit('push-buffer', buffer)
+
+    def __seek_data(self, src, time):
+        if self._pcm is not None:
+            self._offset = self._pcm.offset(time)
+
+        return True
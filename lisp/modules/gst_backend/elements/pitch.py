@@ -42,8 +42,14 @@ class Pitch(GstMediaElement):
 
         self.gst_pitch.link(self.audio_converter)
 
+    def neutral(self):
+        return self.pitch == 1
+
     def sink(self):
         return self.gst_pitch
 
     def src(self):
         return self.audio_converter
+
+    def converter(self):
+        return self.audio_converter
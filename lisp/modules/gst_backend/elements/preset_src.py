@@ -18,6 +18,7 @@
 # along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
 
 import math
+from functools import lru_cache
 
 from PyQt5.QtCore import QT_TRANSLATE_NOOP
 
@@ -26,6 +27,11 @@ from lisp.core.has_properties import Property
 from lisp.modules.gst_backend.gi_repository import Gst, GstApp
 from lisp.modules.gst_backend.gst_element import GstSrcElement
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class PresetSrc(GstSrcElement):
     MediaType = MediaType.Audio
@@ -82,16 +88,39 @@ class PresetSrc(GstSrcElement):
             if need_bytes > remaining:
                 need_bytes = remaining
 
-            function = PresetSrc.PRESETS.get(self.preset, PresetSrc.SILENCE)
-            sample = []
-            while len(sample) < need_bytes:
-                value = function(self.n_sample)
-                sample.append(int(value % 256))
-                self.n_sample += 1
-
-            buffer = Gst.Buffer.new_wrapped(bytes(sample))
+            buffer = PresetSrc.render(self.preset, self.n_sample, need_bytes)
+            self.n_sample += need_bytes
             src.emit('push-buffer', buffer)
 
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def render(preset, start, count):
+        """Return a buffer with `count` samples of `preset` from `start`.
+
+        Buffers are cached, so restarting (or looping) a preset pushes the
+        same buffers again, without computing (or copying) the samples.
+        """
+        function = PresetSrc.PRESETS.get(preset, PresetSrc.SILENCE)
+
+        data = None
+        if numpy is not None:
+            # Most of the presets can be evaluated over an array of indexes,
+            # the others (e.g. using conditional expressions) will fail
+            try:
+                values = function(numpy.arange(start, start + count,
+                                               dtype=numpy.int64))
+                data = numpy.broadcast_to(numpy.asarray(values) % 256,
+                                          (count, )).astype(numpy.uint8)
+                data = data.tobytes()
+            except (TypeError, ValueError, IndexError):
+                data = None
+
+        if data is None:
+            data = bytes(int(function(t) % 256)
+                         for t in range(start, start + count))
+
+        return Gst.Buffer.new_wrapped(data)
+
     def seek(self, src, time):
         self.n_sample = int(abs(time / Gst.SECOND) * PresetSrc.FREQ)
         return True
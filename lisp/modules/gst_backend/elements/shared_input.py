@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Linux Show Player
+#
+# Copyright 2012-2016 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+from threading import Lock
+
+from PyQt5.QtCore import QT_TRANSLATE_NOOP
+
+from lisp.modules.gst_backend.elements.uri_input import UriInput
+from lisp.modules.gst_backend.gi_repository import Gst, GstApp
+from lisp.modules.gst_backend.gst_shared_source import SharedSources
+
+
+class _Subscription:
+    """Connect a SharedInput to a SharedSource, until cancelled."""
+
+    __slots__ = ('element', 'active')
+
+    def __init__(self, element):
+        self.element = element
+        self.active = True
+
+    @property
+    def full(self):
+        return self.element.full
+
+    def push(self, caps, buffer):
+        self.element.push(self, caps, buffer)
+
+    def end(self):
+        self.element.end(self)
+
+
+class SharedInput(UriInput):
+    """Like UriInput, but media playing the same file, started together,
+    share the same decoder (see SharedSources).
+
+    Every media keeps its own elements after the input.
+    """
+
+    Name = QT_TRANSLATE_NOOP('MediaElementName', 'Shared Input')
+
+    # Bytes queued in the appsrc (about 2 seconds of 48KHz stereo audio)
+    MAX_BYTES = 2 * 48000 * 4
+
+    def __init__(self, pipe):
+        super().__init__(pipe)
+
+        self.app_src = Gst.ElementFactory.make('appsrc', None)
+        self.app_src.set_property('format', Gst.Format.TIME)
+        self.app_src.set_property('stream-type',
+                                  GstApp.AppStreamType.SEEKABLE)
+        self.app_src.set_property('max-bytes', self.MAX_BYTES)
+        self._handlers = [
+            self.app_src.connect('need-data', self.__need_data),
+            self.app_src.connect('enough-data', self.__enough_data),
+            self.app_src.connect('seek-data', self.__seek_data)
+        ]
+
+        # Use the appsrc in place of the uridecodebin
+        pipe.remove(self.decoder)
+        pipe.add(self.app_src)
+        self.app_src.link(self.audio_convert)
+
+        self.full = False
+        self._lock = Lock()
+        self._source = None
+        self._subscription = None
+        self._caps = None
+        # Where the stream must start (or resume) when new data is needed
+        self._position = 0
+
+    def pause(self):
+        # A paused media would stop the other subscribers, so leave the
+        # source, a new one is joined on resume
+        self.__leave()
+
+    def stop(self):
+        self.__leave(0)
+
+    def interrupt(self):
+        self.__leave(0)
+
+    def dispose(self):
+        super().dispose()
+        self.__leave(0)
+        for handler in self._handlers:
+            self.app_src.disconnect(handler)
+
+    def push(self, subscription, caps, buffer):
+        with self._lock:
+            # Ignore buffers of a source already left
+            if not subscription.active:
+                return
+
+            if self._caps is None or not self._caps.is_equal(caps):
+                self._caps = caps
+                self.app_src.set_property('caps', caps)
+
+            self._position = buffer.pts + buffer.duration
+            self.app_src.emit('push-buffer', buffer)
+
+    def end(self, subscription):
+        with self._lock:
+            if subscription.active:
+                self.app_src.emit('end-of-stream')
+
+    def __leave(self, position=None):
+        with self._lock:
+            source = self._source
+            subscription = self._subscription
+            self._source = None
+            self._subscription = None
+            self.full = False
+
+            if subscription is not None:
+                subscription.active = False
+            if position is not None:
+                self._position = position
+
+        if source is not None:
+            source.unsubscribe(subscription)
+
+    def __need_data(self, src, length):
+        self.full = False
+
+        with self._lock:
+            source = self._source
+            if source is None:
+                self._subscription = _Subscription(self)
+            subscription = self._subscription
+
+        if source is None:
+            source = SharedSources().join(self.uri, self._position,
+                                          subscription)
+            with self._lock:
+                if subscription.active:
+                    self._source = source
+                    return
+
+            # Left while joining
+            source.unsubscribe(subscription)
+        else:
+            source.notify()
+
+    def __enough_data(self, src):
+        self.full = True
+
+    def __seek_data(self, src, position):
+        # Start again from the new position on the next "need-data"
+        self.__leave(position)
+        return True
@@ -22,6 +22,7 @@ from PyQt5.QtCore import QT_TRANSLATE_NOOP
 from lisp.backend.media_element import ElementType, MediaType
 from lisp.core.has_properties import Property
 from lisp.modules.gst_backend.gi_repository import Gst
+from lisp.modules.gst_backend.gst_bus import GstBusDispatcher
 from lisp.modules.gst_backend.gst_element import GstMediaElement
 
 
@@ -44,9 +45,9 @@ class Speed(GstMediaElement):
 
         self.scale_tempo.link(self.audio_convert)
 
-        bus = self.pipeline.get_bus()
-        bus.add_signal_watch()
-        self._handler = bus.connect("message", self.__on_message)
+        self._handler = GstBusDispatcher().connect(
+            self.pipeline, Gst.MessageType.STATE_CHANGED, self.__on_message,
+            src=self.scale_tempo)
 
         self._old_speed = self.speed
         self.changed('speed').connect(self.__prepare_speed)
@@ -58,21 +59,23 @@ class Speed(GstMediaElement):
             if self.pipeline.current_state == Gst.State.PLAYING:
                 self.__change_speed()
 
+    def neutral(self):
+        return self.speed == 1
+
     def sink(self):
         return self.scale_tempo
 
     def src(self):
         return self.audio_convert
 
+    def converter(self):
+        return self.audio_convert
+
     def dispose(self):
-        bus = self.pipeline.get_bus()
-        bus.remove_signal_watch()
-        bus.disconnect(self._handler)
+        GstBusDispatcher().disconnect(self.pipeline, self._handler)
 
     def __on_message(self, bus, message):
-        if (message.type == Gst.MessageType.STATE_CHANGED and
-                    message.src == self.scale_tempo and
-                    message.parse_state_changed()[1] == Gst.State.PLAYING):
+        if message.parse_state_changed()[1] == Gst.State.PLAYING:
             self.__change_speed()
 
     def __change_speed(self):
@@ -17,18 +17,18 @@
 # You should have received a copy of the GNU General Public License
 # along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
 
-from concurrent.futures import ThreadPoolExecutor
 from os import path
 
 from PyQt5.QtCore import QT_TRANSLATE_NOOP
 
 from lisp.backend.media_element import MediaType
-from lisp.core.decorators import async_in_pool
+from lisp.backend.media_prescan import MediaPrescan
 from lisp.core.has_properties import Property
 from lisp.modules.gst_backend.gi_repository import Gst
 from lisp.modules.gst_backend.gst_element import GstProperty, \
     GstSrcElement
-from lisp.modules.gst_backend.gst_utils import gst_uri_duration
+from lisp.modules.gst_backend.gst_transcode import TranscodeCache
+from lisp.modules.gst_backend.gst_utils import METADATA_CACHE
 
 
 class UriInput(GstSrcElement):
@@ -57,6 +57,14 @@ class UriInput(GstSrcElement):
     def input_uri(self):
         return self.uri
 
+    def play(self):
+        # Use the transcoded copy of the file, when available, the uri can
+        # be changed only when the media is stopped
+        if self.decoder.get_state(0)[1] <= Gst.State.READY:
+            uri = TranscodeCache().lookup(self.uri) or self.uri
+            if self.decoder.get_property('uri') != uri:
+                self.decoder.set_property('uri', uri)
+
     def dispose(self):
         self.decoder.disconnect(self._handler)
 
@@ -80,6 +88,19 @@ class UriInput(GstSrcElement):
         if mtime != self._mtime or self.duration < 0:
             self.__duration()
 
-    @async_in_pool(pool=ThreadPoolExecutor(1))
     def __duration(self):
-        self.duration = gst_uri_duration(self.uri)
+        # Stored metadata are used directly, otherwise the file is probed
+        # in background, concurrently with other media
+        info = METADATA_CACHE.get(self.uri)
+        if info is not None:
+            self.duration = info['duration']
+        else:
+            MediaPrescan().probe(self.uri).add_done_callback(
+                self.__duration_ready)
+
+    def __duration_ready(self, future):
+        # Files that cannot be decoded have an unknown duration
+        if future.exception() is None:
+            self.duration = future.result()
+        else:
+            self.duration = 0
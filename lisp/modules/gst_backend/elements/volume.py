@@ -20,7 +20,8 @@
 from PyQt5.QtCore import QT_TRANSLATE_NOOP
 
 from lisp.backend.media_element import ElementType, MediaType
-from lisp.modules.gst_backend.gi_repository import Gst
+from lisp.core.has_properties import Property
+from lisp.modules.gst_backend.gi_repository import Gst, GstController
 from lisp.modules.gst_backend.gst_element import GstMediaElement, GstProperty, \
     GstRuntimeProperty
 
@@ -30,27 +31,83 @@ class Volume(GstMediaElement):
     MediaType = MediaType.Audio
     Name = QT_TRANSLATE_NOOP('MediaElementName', 'Volume')
 
+    # Maximum value of the "volume" element property
+    STAGE_GAIN = 10
+    # Maximum total gain (volume * normal_volume), as the two stages allowed
+    MAX_GAIN = 100
+    # Control points of the fades performed in the pipeline
+    FADE_POINTS = 32
+
     mute = GstProperty('gst_volume', default=False)
-    volume = GstProperty('gst_volume', default=1.0)
-    normal_volume = GstProperty('gst_normal_volume', default=1.0,
-                                gst_name='volume')
+    volume = Property(default=1.0)
+    normal_volume = Property(default=1.0)
 
     current_mute = GstRuntimeProperty('gst_volume', 'mute')
-    current_volume = GstRuntimeProperty('gst_volume', 'volume')
 
     def __init__(self, pipe):
         super().__init__()
 
+        # A single gain stage for both the volume and the normalization,
+        # the "boost" stage carries only the gain above STAGE_GAIN, otherwise
+        # is left to 1.0 (passthrough, it doesn't process the buffers)
         self.gst_volume = Gst.ElementFactory.make("volume", None)
-        self.gst_normal_volume = Gst.ElementFactory.make("volume", None)
+        self.gst_boost = Gst.ElementFactory.make("volume", None)
         self.audio_convert = Gst.ElementFactory.make("audioconvert", None)
 
-        pipe.add(self.gst_normal_volume)
         pipe.add(self.gst_volume)
+        pipe.add(self.gst_boost)
         pipe.add(self.audio_convert)
 
-        self.gst_volume.link(self.gst_normal_volume)
-        self.gst_normal_volume.link(self.audio_convert)
+        self.gst_volume.link(self.gst_boost)
+        self.gst_boost.link(self.audio_convert)
+
+        self._current_volume = self.volume
+        self._boost = 1.0
+        self._fade_binding = None
+        self.changed('volume').connect(self.__volume_changed)
+        self.changed('normal_volume').connect(self.__apply_gain)
+
+    @property
+    def current_volume(self):
+        return self._current_volume
+
+    @current_volume.setter
+    def current_volume(self, volume):
+        self.__clear_fade()
+        self._current_volume = volume
+        self.__apply_gain()
+
+    def fade_at(self, position, duration, from_value, to_value, functor):
+        """Fade the volume, in the pipeline, at the given stream position.
+
+        The gain is applied (and interpolated) for each processed buffer, so
+        the fade is in sync with the playback, any change of `current_volume`
+        will cancel the fade.
+
+        :param position: the fade start position, in milliseconds
+        :param duration: the fade duration, in milliseconds
+        :param functor: the fade function (see lisp.core.fade_functions)
+        """
+        self.__clear_fade()
+
+        # The boost is fixed for the whole fade (the highest gain reached)
+        peak = max(self._current_volume, from_value, to_value)
+        self.__set_boost(peak * self.normal_volume)
+        self.gst_volume.set_property('volume', self.__stage_gain(
+            self._current_volume * self.normal_volume))
+
+        source = GstController.InterpolationControlSource()
+        source.set_property('mode', GstController.InterpolationMode.LINEAR)
+        for n in range(Volume.FADE_POINTS + 1):
+            t = n / Volume.FADE_POINTS
+            value = functor(t, to_value - from_value, from_value)
+            source.set(int((position + duration * t) * Gst.MSECOND),
+                       self.__stage_gain(value * self.normal_volume))
+
+        self._fade_binding = GstController.DirectControlBinding.new_absolute(
+            self.gst_volume, 'volume', source)
+        self.gst_volume.add_control_binding(self._fade_binding)
+        self._current_volume = to_value
 
     def sink(self):
         return self.gst_volume
@@ -58,9 +115,38 @@ class Volume(GstMediaElement):
     def src(self):
         return self.audio_convert
 
+    def converter(self):
+        return self.audio_convert
+
     def stop(self):
         self.current_mute = self.mute
         self.current_volume = self.volume
 
     def interrupt(self):
         self.stop()
+
+    def dispose(self):
+        self.__clear_fade()
+
+    def __clear_fade(self):
+        if self._fade_binding is not None:
+            self.gst_volume.remove_control_binding(self._fade_binding)
+            self._fade_binding = None
+
+    def __volume_changed(self, volume):
+        self.current_volume = volume
+
+    def __apply_gain(self, *args):
+        gain = self._current_volume * self.normal_volume
+        self.__set_boost(gain)
+        self.gst_volume.set_property('volume', self.__stage_gain(gain))
+
+    def __set_boost(self, gain):
+        boost = max(min(gain, Volume.MAX_GAIN) / Volume.STAGE_GAIN, 1.0)
+        if boost != self._boost:
+            self._boost = boost
+            self.gst_boost.set_property('volume', boost)
+
+    def __stage_gain(self, gain):
+        """Return the gain of the first stage, given the total one."""
+        return min(min(gain, Volume.MAX_GAIN) / self._boost, Volume.STAGE_GAIN)
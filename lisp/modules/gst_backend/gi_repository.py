@@ -10,6 +10,7 @@ import gi
 gi.require_version('Gst', '1.0')
 gi.require_version('GstPbutils', '1.0')
 gi.require_version('GstApp', '1.0')
+gi.require_version('GstController', '1.0')
 
 # noinspection PyUnresolvedReferences
-from gi.repository import Gst, GstPbutils, GObject, GstApp
+from gi.repository import Gst, GstPbutils, GObject, GstApp, GstController
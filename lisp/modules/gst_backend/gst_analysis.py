@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Linux Show Player
+#
+# Copyright 2012-2016 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+import os
+from threading import Lock
+
+from lisp.backend.silence import SilenceDetector
+from lisp.backend.waveform import WaveformBuilder, WaveformCache
+from lisp.core.configuration import config, CFG_DIR
+from lisp.core.fingerprint_cache import FingerprintCache
+from lisp.core.singleton import Singleton
+from lisp.core.util import uri_fingerprint
+from lisp.core.worker_pool import PriorityWorkerPool
+from lisp.modules.gst_backend.gst_decoder import GstDecoder, GstDecodeError
+
+WAVEFORMS_DIR = os.path.join(CFG_DIR, 'waveforms')
+# Silence detection results: {'threshold': dB, 'start': ms, 'stop': ms}
+SILENCE_CACHE = FingerprintCache(os.path.join(CFG_DIR, 'cache', 'silence.json'))
+
+
+class GstMediaAnalyzer(metaclass=Singleton):
+    """Analyze media-files in background, storing the results on disk.
+
+    Every analysis of the same file is computed from a single decoding
+    pass, e.g. if both the waveform and the silence of a file are missing
+    the file is decoded only once.
+
+    Analysis requests are executed by a bounded pool of threads, requests
+    with an higher priority (lower value) are served first, e.g. for the
+    cues currently visible.
+    """
+
+    Waveform = 'waveform'
+    Silence = 'silence'
+
+    def __init__(self):
+        self._waveforms = WaveformCache(WAVEFORMS_DIR)
+        self._pool = PriorityWorkerPool(
+            workers=int(config['Gst'].get('AnalysisWorkers', 2)),
+            name='AnalysisWorker')
+
+        self._lock = Lock()
+        self._callbacks = {}
+
+    @property
+    def silence_threshold(self):
+        return float(config['Gst'].get('SilenceThreshold', -60))
+
+    def waveform(self, uri, callback=None, priority=0):
+        """Return the waveform of the given uri if already computed.
+
+        If the waveform is not available `None` is returned, and the
+        analysis is scheduled, when done `callback(waveform)` is called
+        from the worker thread (with `None` if the analysis fails).
+
+        :rtype: lisp.backend.waveform.Waveform | None
+        """
+        waveform = self._waveforms.load(uri)
+        if waveform is None and self._waveforms.path(uri) is not None:
+            self.__schedule(self.Waveform, uri, callback, priority)
+
+        return waveform
+
+    def silence(self, uri, callback=None, priority=0):
+        """Return (start, stop) of the non-silent part of the given uri.
+
+        Times are in milliseconds, if the result is not available `None`
+        is returned, and the analysis is scheduled, when done
+        `callback((start, stop))` is called from the worker thread (with
+        `None` if the analysis fails).
+
+        :rtype: tuple | None
+        """
+        silence = self.__cached_silence(uri)
+        if silence is None and uri_fingerprint(uri) is not None:
+            self.__schedule(self.Silence, uri, callback, priority)
+
+        return silence
+
+    def cancel(self, uri):
+        """Cancel a pending analysis, if not already started."""
+        with self._lock:
+            self._pool.cancel(uri)
+            for kind in (self.Waveform, self.Silence):
+                self._callbacks.pop((kind, uri), None)
+
+    def __schedule(self, kind, uri, callback, priority):
+        with self._lock:
+            callbacks = self._callbacks.setdefault((kind, uri), [])
+            if callback is not None and callback not in callbacks:
+                callbacks.append(callback)
+
+        self._pool.submit(uri, self.__analyze, uri, priority=priority)
+
+    def __cached_silence(self, uri):
+        silence = SILENCE_CACHE.get(uri)
+        if silence is not None and \
+                silence['threshold'] == self.silence_threshold:
+            return silence['start'], silence['stop']
+
+    def __analyze(self, uri):
+        results = {self.Waveform: self._waveforms.load(uri),
+                   self.Silence: self.__cached_silence(uri)}
+
+        consumers = []
+        if results[self.Waveform] is None:
+            builder = WaveformBuilder()
+            consumers.append(builder)
+        if results[self.Silence] is None:
+            detector = SilenceDetector(self.silence_threshold)
+            consumers.append(detector)
+
+        if consumers:
+            try:
+                GstDecoder(uri).decode(*consumers)
+            except GstDecodeError as e:
+                logging.warning(
+                    'ANALYSIS: cannot decode "{}": {}'.format(uri, e))
+            else:
+                if results[self.Waveform] is None:
+                    try:
+                        builder.write(self._waveforms.path(uri))
+                        results[self.Waveform] = self._waveforms.load(uri)
+                    except OSError as e:
+                        logging.warning(
+                            'ANALYSIS: cannot write waveform "{}": {}'.format(
+                                uri, e))
+
+                if results[self.Silence] is None:
+                    start, stop, _ = detector.result()
+                    SILENCE_CACHE.set(uri, {'threshold': detector.threshold,
+                                            'start': start, 'stop': stop})
+                    results[self.Silence] = (start, stop)
+
+        for kind, result in results.items():
+            with self._lock:
+                callbacks = self._callbacks.pop((kind, uri), ())
+
+            if kind == self.Waveform and result is not None:
+                # Every receiver gets (and closes) its own mapping
+                result.close()
+                for callback in callbacks:
+                    callback(self._waveforms.load(uri))
+            else:
+                for callback in callbacks:
+                    callback(result)
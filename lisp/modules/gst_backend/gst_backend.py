@@ -22,16 +22,19 @@ from lisp.backend.backend import Backend as BaseBackend
 from lisp.core.decorators import memoize
 from lisp.core.module import Module
 from lisp.cues.media_cue import MediaCue
-from lisp.modules.gst_backend.gst_utils import gst_parse_tags_list
-from lisp.modules.gst_backend.gst_utils import gst_uri_metadata, gst_mime_types, \
-    gst_uri_duration
+from lisp.modules.gst_backend.gst_utils import gst_media_info, \
+    gst_mime_types, gst_uri_duration, METADATA_CACHE
 from lisp.ui.settings.app_settings import AppSettings
 from lisp.ui.settings.cue_settings import CueSettingsRegistry
 from lisp.modules.gst_backend import elements, settings
 from lisp.modules.gst_backend.gi_repository import Gst
 from lisp.modules.gst_backend.gst_cue_factories import register_factories
 from lisp.modules.gst_backend.gst_media_settings import GstMediaSettings
+from lisp.modules.gst_backend.gst_output_bus import OutputBuses
 from lisp.modules.gst_backend.gst_settings import GstSettings
+from lisp.modules.gst_backend.gst_state import GstStateWorker
+from lisp.modules.gst_backend.gst_analysis import GstMediaAnalyzer, \
+    SILENCE_CACHE
 
 
 class GstBackend(Module, BaseBackend):
@@ -51,15 +54,27 @@ class GstBackend(Module, BaseBackend):
 
         backend.set_backend(self)
 
+    def terminate(self):
+        METADATA_CACHE.save()
+        SILENCE_CACHE.save()
+        # Wait the pipelines still stopping (e.g. from the closed session)
+        GstStateWorker().terminate()
+        OutputBuses().dispose()
+
     def uri_duration(self, uri):
         return gst_uri_duration(uri)
 
     def uri_tags(self, uri):
-        tags = gst_uri_metadata(uri).get_tags()
-        if tags is not None:
-            return gst_parse_tags_list(tags)
+        try:
+            return gst_media_info(uri)['tags']
+        except Exception:
+            return {}
+
+    def uri_waveform(self, uri, callback=None, priority=0):
+        return GstMediaAnalyzer().waveform(uri, callback, priority)
 
-        return {}
+    def uri_silence(self, uri, callback=None, priority=0):
+        return GstMediaAnalyzer().silence(uri, callback, priority)
 
     @memoize
     def supported_extensions(self):
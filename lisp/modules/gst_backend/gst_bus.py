@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Linux Show Player
+#
+# Copyright 2012-2016 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+import traceback
+import weakref
+from queue import Queue
+from threading import Thread, Lock
+from time import perf_counter
+from types import MethodType
+
+from lisp.core.singleton import Singleton
+from lisp.modules.gst_backend.gi_repository import Gst
+
+
+class _BusHandler:
+    def __init__(self, message_type, callback, src):
+        self.message_type = message_type
+        self.src = src
+
+        # Bounded methods are referenced weakly, so the owners can be
+        # garbage-collected without disconnecting
+        if isinstance(callback, MethodType):
+            self._callback = weakref.WeakMethod(callback)
+        else:
+            self._callback = lambda: callback
+
+    def accept(self, message):
+        return (message.type & self.message_type and
+                (self.src is None or message.src == self.src))
+
+    def callback(self):
+        return self._callback()
+
+
+class GstBusDispatcher(metaclass=Singleton):
+    """Dispatch the messages of all the pipelines from a single thread.
+
+    Messages are removed from the pipelines buses (by a sync-handler, in the
+    posting thread) and queued, a dedicated thread takes them from the queue
+    and calls the handlers registered for the message type (and source).
+
+    Handlers are called as `callback(bus, message)` from the dispatcher
+    thread, not from the Qt/GLib main-loop.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._queue = Queue()
+        # Handlers by bus, the bus objects (not their id) are used as keys,
+        # so queued messages can't be dispatched to a different pipeline
+        self._handlers = {}
+        self._handler_id = 0
+        self._statistics = {}
+
+        self._thread = Thread(target=self._dispatch, daemon=True,
+                              name='GstBusDispatcher')
+        self._thread.start()
+
+    def connect(self, pipeline, message_type, callback, src=None):
+        """Register a callback for the messages posted on the pipeline bus.
+
+        :param pipeline: The pipeline to watch
+        :type pipeline: Gst.Pipeline
+        :param message_type: The message type(s) to handle
+        :type message_type: Gst.MessageType
+        :param callback: A callable object, `callback(bus, message)`
+        :param src: If given, only the messages with this source are handled
+        :type src: Gst.Object
+
+        :return: The handler id, to be used with `disconnect`
+        :rtype: int
+        """
+        bus = pipeline.get_bus()
+
+        with self._lock:
+            if bus not in self._handlers:
+                self._handlers[bus] = {}
+                bus.set_sync_handler(self.__sync_handler)
+
+            self._handler_id += 1
+            self._handlers[bus][self._handler_id] = _BusHandler(
+                message_type, callback, src)
+
+            return self._handler_id
+
+    def disconnect(self, pipeline, handler_id):
+        """Remove the handler with the given id."""
+        with self._lock:
+            self._handlers.get(pipeline.get_bus(), {}).pop(handler_id, None)
+
+    def remove(self, pipeline):
+        """Stop watching the given pipeline, removing all its handlers."""
+        bus = pipeline.get_bus()
+
+        with self._lock:
+            if self._handlers.pop(bus, None) is not None:
+                bus.set_sync_handler(None, None)
+
+    def statistics(self):
+        """Return the dispatching cost for each message-type.
+
+        :return: {type_name: (messages_count, total_seconds, max_seconds)}
+        :rtype: dict
+        """
+        with self._lock:
+            return {Gst.MessageType.get_name(message_type): tuple(values)
+                    for message_type, values in self._statistics.items()}
+
+    def __sync_handler(self, bus, message):
+        self._queue.put((bus, message))
+        return Gst.BusSyncReply.DROP
+
+    def _dispatch(self):
+        while True:
+            bus, message = self._queue.get()
+
+            with self._lock:
+                handlers = [handler for handler in
+                            self._handlers.get(bus, {}).values()
+                            if handler.accept(message)]
+
+            start = perf_counter()
+            for handler in handlers:
+                callback = handler.callback()
+                if callback is not None:
+                    try:
+                        callback(bus, message)
+                    except Exception:
+                        logging.error('GST: bus handler error:\n' +
+                                      traceback.format_exc())
+            elapsed = perf_counter() - start
+
+            with self._lock:
+                values = self._statistics.setdefault(message.type, [0, 0, 0])
+                values[0] += 1
+                values[1] += elapsed
+                values[2] = max(values[2], elapsed)
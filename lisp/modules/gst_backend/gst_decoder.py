@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Linux Show Player
+#
+# Copyright 2012-2016 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+from urllib.parse import quote, unquote
+
+from lisp.modules.gst_backend.gi_repository import Gst
+
+
+class GstDecodeError(Exception):
+    """Raised when a file cannot be decoded."""
+
+
+class GstDecoder:
+    """Decode a media-file to raw PCM data, as fast as possible.
+
+    The decoded data (signed 16bit, little-endian, interleaved) is
+    passed to one or more consumers, objects with the following methods:
+
+        * start(rate, channels): called once before any data
+        * feed(data): called with chunks of bytes
+        * finish(): called at the end of the stream
+
+    This allows different analysis to share the same decoding pass.
+    """
+
+    # Timeout (nanoseconds) used to check for errors while pulling data
+    PULL_TIMEOUT = Gst.SECOND
+
+    def __init__(self, uri, channels=1, rate=None):
+        protocol, _, path = uri.partition('://')
+        self.uri = protocol + '://' + quote(unquote(path))
+        self.channels = channels
+        self.rate = rate
+
+        self._stopped = False
+
+    def stop(self):
+        """Stop the decoding, can be called from any thread."""
+        self._stopped = True
+
+    def decode(self, *consumers):
+        """Decode the file feeding the given consumers (blocking).
+
+        :return: True if the whole file has been decoded, False if stopped
+        :raise GstDecodeError: if the file cannot be decoded
+        """
+        caps = 'audio/x-raw,format=S16LE,layout=interleaved,channels={}'.format(
+            self.channels)
+        if self.rate is not None:
+            caps += ',rate={}'.format(self.rate)
+
+        pipeline = Gst.parse_launch(
+            'uridecodebin uri="{}" ! audioconvert ! audioresample ! {} ! '
+            'appsink name=sink sync=false'.format(self.uri, caps))
+        sink = pipeline.get_by_name('sink')
+        bus = pipeline.get_bus()
+
+        try:
+            pipeline.set_state(Gst.State.PLAYING)
+            started = False
+
+            while not self._stopped:
+                sample = sink.emit('try-pull-sample', self.PULL_TIMEOUT)
+
+                if sample is None:
+                    self.__check_errors(bus)
+                    if sink.get_property('eos'):
+                        break
+                    continue
+
+                if not started:
+                    structure = sample.get_caps().get_structure(0)
+                    rate = structure.get_value('rate')
+                    for consumer in consumers:
+                        consumer.start(rate, self.channels)
+                    started = True
+
+                buffer = sample.get_buffer()
+                data = buffer.extract_dup(0, buffer.get_size())
+                for consumer in consumers:
+                    consumer.feed(data)
+
+            if not self._stopped:
+                if not started:
+                    raise GstDecodeError('no audio data in: ' + self.uri)
+
+                for consumer in consumers:
+                    consumer.finish()
+                return True
+
+            return False
+        finally:
+            pipeline.set_state(Gst.State.NULL)
+
+    @staticmethod
+    def __check_errors(bus):
+        message = bus.pop_filtered(Gst.MessageType.ERROR)
+        if message is not None:
+            error, debug = message.parse_error()
+            raise GstDecodeError(error.message)
@@ -65,6 +65,9 @@ class GstRuntimeProperty:
 class GstMediaElement(MediaElement):
     """All the subclass must take the pipeline as first __init__ argument"""
 
+    _converter_skipped = False
+    _converter_upstream = None
+
     def interrupt(self):
         """Called before Media interrupt"""
 
@@ -80,6 +83,13 @@ class GstMediaElement(MediaElement):
     def dispose(self):
         """Clean up the element"""
 
+    def neutral(self):
+        """Return True if, with the current properties, the stream is unchanged
+
+        Neutral elements can be bypassed (unlinked) by the media.
+        """
+        return False
+
     def sink(self):
         """Return the GstElement used as sink"""
         return None
@@ -88,20 +98,79 @@ class GstMediaElement(MediaElement):
         """Return the GstElement used as src"""
         return None
 
+    def converter(self):
+        """Return the GstElement used only to convert the output format
+
+        Must be the src() element, linked to a single upstream GstElement,
+        can be skipped when the downstream element accepts the format.
+        """
+        return None
+
+    def sink_accepts(self, caps):
+        """Return True if the element sink currently accepts the given caps"""
+        sink = self.sink()
+        pad = sink.get_static_pad('sink') if sink is not None else None
+        return pad is not None and pad.query_accept_caps(caps)
+
+    def src_caps(self):
+        """Return the caps negotiated at the element output (without the
+        converter), None if not negotiated"""
+        converter = self.converter()
+        if converter is None:
+            pad = self.src().get_static_pad('src')
+        elif self._converter_skipped:
+            pad = self._converter_upstream.get_static_pad('src')
+        else:
+            pad = converter.sinkpads[0].get_peer()
+
+        return pad.get_current_caps() if pad is not None else None
+
+    @property
+    def converter_skipped(self):
+        return self._converter_skipped
+
+    def skip_converter(self, skip):
+        """Unlink (or link back) the converter, if any.
+
+        Must be called while not linked to the downstream element.
+        """
+        converter = self.converter()
+        if converter is not None and skip != self._converter_skipped:
+            if skip:
+                peer = converter.sinkpads[0].get_peer()
+                upstream = peer.get_parent_element()
+                upstream.unlink(converter)
+            else:
+                upstream = self._converter_upstream
+                upstream.link(converter)
+
+            self._converter_upstream = upstream
+            self._converter_skipped = skip
+
     def link(self, element):
-        if self.src() is not None:
+        src = self.linked_src()
+        if src is not None:
             sink = element.sink()
             if sink is not None:
-                return self.src().link(sink)
+                return src.link(sink)
         return False
 
     def unlink(self, element):
-        if self.src() is not None:
+        src = self.linked_src()
+        if src is not None:
             sink = element.sink()
             if sink is not None:
-                return self.src().unlink(sink)
+                return src.unlink(sink)
         return False
 
+    def linked_src(self):
+        """Return the GstElement linked downstream, src() or, when the
+        converter is skipped, the element before it"""
+        if self._converter_skipped:
+            return self._converter_upstream
+
+        return self.src()
+
 
 class GstSrcElement(GstMediaElement):
     ElementType = ElementType.Input
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Linux Show Player
+#
+# Copyright 2012-2016 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+from collections import OrderedDict
+from threading import Lock
+
+import jack
+
+
+class JackGraph:
+    """A cached view of the JACK ports and connections.
+
+    The graph is read once when the client is activated, then kept up to
+    date by the JACK notification callbacks, so that queries don't need a
+    round-trip to the JACK server.
+
+    The callbacks are invoked from the JACK notification thread, where the
+    JACK API cannot be used, when the cache can't be updated from the
+    notification alone it's marked as stale and re-read at the next query.
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+        self._lock = Lock()
+        self._stale = True
+        # port-name -> (is_audio, is_input)
+        self._ports = OrderedDict()
+        # output-port-name -> {input-port-name, ...}
+        self._connections = {}
+
+        client.set_port_registration_callback(self.__port_registration,
+                                              only_available=False)
+        client.set_port_connect_callback(self.__port_connect,
+                                         only_available=False)
+        try:
+            client.set_port_rename_callback(self.__port_rename,
+                                            only_available=False)
+        except jack.JackError:
+            # Not supported by the server (e.g. jack1)
+            pass
+        client.activate()
+
+    def ports(self, prefix='', is_audio=True, is_input=None):
+        """Return the names of the ports starting with the given prefix."""
+        with self._lock:
+            self.__refresh()
+
+            return [name for name, (audio, input_) in self._ports.items()
+                    if name.startswith(prefix) and audio == is_audio and
+                    (is_input is None or input_ == is_input)]
+
+    def client_ports(self, client_name):
+        """Return the output audio ports of the given client, in order.
+
+        The ports of a just started client can be missing (the notification
+        is yet to be delivered), in that case the server is queried.
+        """
+        ports = self.ports(client_name + ':', is_input=False)
+
+        if not ports:
+            with self._lock:
+                self._stale = True
+            ports = self.ports(client_name + ':', is_input=False)
+
+        return ports
+
+    def connections(self, port_name):
+        """Return the set of input-ports names connected to the given one."""
+        with self._lock:
+            self.__refresh()
+            return set(self._connections.get(port_name, ()))
+
+    def connect(self, port_name, wanted):
+        """Make the output port connected only to the wanted input ports.
+
+        Only the difference with the current connections is applied.
+        """
+        current = self.connections(port_name)
+
+        for input_name in current - wanted:
+            self.__apply(self.client.disconnect, port_name, input_name)
+        for input_name in wanted - current:
+            self.__apply(self.client.connect, port_name, input_name)
+
+    def __apply(self, function, output_name, input_name):
+        try:
+            function(output_name, input_name)
+        except jack.JackError as e:
+            logging.error('JACK: {}'.format(e))
+            return
+
+        # Don't wait for the notification, the next connect() calls could
+        # be made before its delivery
+        with self._lock:
+            if function == self.client.connect:
+                self._connections.setdefault(output_name, set()).add(
+                    input_name)
+            else:
+                self._connections.get(output_name, set()).discard(input_name)
+
+    def __refresh(self):
+        if not self._stale:
+            return
+
+        self._stale = False
+        self._ports.clear()
+        self._connections.clear()
+
+        for port in self.client.get_ports():
+            self._ports[port.name] = (port.is_audio, port.is_input)
+            if port.is_output:
+                self._connections[port.name] = {
+                    conn.name for conn in self.client.get_all_connections(port)}
+
+    def __port_registration(self, port, register):
+        with self._lock:
+            if port is None:
+                self._stale = True
+            elif register:
+                self._ports[port.name] = (port.is_audio, port.is_input)
+                if port.is_output:
+                    self._connections.setdefault(port.name, set())
+            else:
+                self._ports.pop(port.name, None)
+                self._connections.pop(port.name, None)
+                for connections in self._connections.values():
+                    connections.discard(port.name)
+
+    def __port_connect(self, a, b, connect):
+        with self._lock:
+            if a is None or b is None:
+                self._stale = True
+                return
+
+            if a.is_input:
+                a, b = b, a
+
+            if connect:
+                self._connections.setdefault(a.name, set()).add(b.name)
+            else:
+                self._connections.get(a.name, set()).discard(b.name)
+
+    def __port_rename(self, port, old, new):
+        with self._lock:
+            self._stale = True
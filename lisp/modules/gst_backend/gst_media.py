@@ -17,12 +17,20 @@
 # You should have received a copy of the GNU General Public License
 # along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
 
+import time
 import weakref
+from difflib import SequenceMatcher
+from functools import partial
+from threading import RLock
 
 from lisp.backend.media import Media, MediaState
 from lisp.core.has_properties import Property
 from lisp.modules.gst_backend import elements
 from lisp.modules.gst_backend.gi_repository import Gst
+from lisp.modules.gst_backend.gst_bus import GstBusDispatcher
+from lisp.modules.gst_backend.gst_position import GstPosition
+from lisp.modules.gst_backend.gst_state import GstStateWorker
+from lisp.modules.gst_backend.gst_utils import gst_block_pad
 
 
 def validate_pipeline(pipe, rebuild=False):
@@ -53,26 +61,40 @@ class GstMedia(Media):
 
     pipe = Property(default=())
 
+    # Maximum wait for a pad to be blocked (no data flowing), in seconds
+    BLOCK_TIMEOUT = 0.5
+
     def __init__(self):
         super().__init__()
 
         self._state = MediaState.Null
         self._elements = []
+        self._bypassed = set()
+        # Held while the elements links are changed
+        self._links_lock = RLock()
+        self._prerolled = False
+        self._prerolling = False
+        self._preroll_seek = False
+        self._start_at = None
+        # (Gst.State, Signal) the signal to emit when the state is reached
+        self._pending = None
         self._old_pipe = ''
         self._loop_count = 0
 
         self._gst_pipe = Gst.Pipeline()
         self._gst_state = Gst.State.NULL
         self._time_query = Gst.Query.new_position(Gst.Format.TIME)
-
-        bus = self._gst_pipe.get_bus()
-        bus.add_signal_watch()
-
-        # Use a weakref instead of the method or the object will not be
-        # garbage-collected
-        on_message = weakref.WeakMethod(self.__on_message)
-        handler = bus.connect('message', lambda *args: on_message()(*args))
-        weakref.finalize(self, self.__finalizer, self._gst_pipe, handler,
+        self._position = GstPosition(self._gst_pipe)
+
+        # The dispatcher keep only a weakref to the method, so the object
+        # can be garbage-collected
+        GstBusDispatcher().connect(
+            self._gst_pipe,
+            Gst.MessageType.STATE_CHANGED | Gst.MessageType.ASYNC_DONE |
+            Gst.MessageType.EOS | Gst.MessageType.SEGMENT_DONE |
+            Gst.MessageType.CLOCK_LOST | Gst.MessageType.ERROR,
+            self.__on_message)
+        weakref.finalize(self, self.__finalizer, self._gst_pipe,
                          self._elements)
 
         self.changed('loop').connect(self.__prepare_loops)
@@ -94,18 +116,35 @@ class GstMedia(Media):
             if not pipe:
                 raise ValueError('Invalid pipeline "{0}"'.format(pipe))
 
-            # Build the pipeline
-            elements_properties = self.elements_properties()
-            self.__build_pipeline()
-            self.update_elements(elements_properties)
-
-            self._elements[0].changed('duration').connect(
-                self.__duration_changed)
-            self.__duration_changed(self._elements[0].duration)
+            old_pipe = [type(e).__name__ for e in self._elements]
+            if (old_pipe and old_pipe[0] == self.pipe[0] and
+                    old_pipe[-1] == self.pipe[-1]):
+                # Same input and output, only the plugins are changed
+                self.__edit_pipeline(old_pipe)
+            else:
+                # Build the pipeline
+                elements_properties = self.elements_properties()
+                self.__build_pipeline()
+                self.update_elements(elements_properties)
+
+                self._elements[0].changed('duration').connect(
+                    self.__duration_changed)
+                self.__duration_changed(self._elements[0].duration)
 
     def current_time(self):
-        ok, position = self._gst_pipe.query_position(Gst.Format.TIME)
-        return position // Gst.MSECOND if ok else 0
+        return self._position.position() // Gst.MSECOND
+
+    def preroll(self):
+        if (self.state == MediaState.Stopped and not self._prerolled and
+                not self._prerolling):
+            self.__preroll()
+
+    def __preroll(self):
+        # The pipeline is paused, then (see __on_prerolled) moved to the
+        # start position, the playback can start only when done
+        self._prerolling = True
+        self._preroll_seek = self.__needs_seek()
+        GstStateWorker().set_state(self._gst_pipe, Gst.State.PAUSED)
 
     def play(self):
         if self.state == MediaState.Stopped or self.state == MediaState.Paused:
@@ -114,14 +153,55 @@ class GstMedia(Media):
             for element in self._elements:
                 element.play()
 
+            stopped = self.state == MediaState.Stopped
             self._state = MediaState.Playing
-            self._gst_pipe.set_state(Gst.State.PLAYING)
-            self._gst_pipe.get_state(Gst.SECOND)
+            self._pending = (Gst.State.PLAYING, self.played)
+
+            if self._prerolling:
+                # The playback is started when the preroll is completed
+                return
+            elif stopped and not self._prerolled and self.__needs_seek():
+                # The pipeline can be sought only after the preroll
+                self.__preroll()
+            else:
+                self.__start_playback()
+
+    def play_at(self, when):
+        if self.state == MediaState.Stopped:
+            # All the scheduled pipelines share the system (monotonic) clock,
+            # the playback starts when the clock reaches the base-time
+            clock = Gst.SystemClock.obtain()
+            delay = int((when - time.monotonic()) * Gst.SECOND)
+            self._start_at = clock.get_time() + max(delay, 0)
+
+            self.preroll()
+            self.play()
+        else:
+            super().play_at(when)
 
-            if self.start_time > 0 or self.stop_time > 0:
-                self.seek(self.start_time)
+    def __start_playback(self):
+        self._prerolled = False
 
-            self.played.emit(self)
+        start_at = self._start_at
+        self._start_at = None
+
+        GstStateWorker().submit(self._gst_pipe, self.__playing, start_at)
+
+    def __playing(self, start_at):
+        if start_at is not None:
+            clock = Gst.SystemClock.obtain()
+            self._gst_pipe.use_clock(clock)
+            self._gst_pipe.set_start_time(Gst.CLOCK_TIME_NONE)
+            # If the preroll took too long start immediately, otherwise the
+            # beginning of the media would be skipped
+            self._gst_pipe.set_base_time(max(start_at, clock.get_time()))
+
+        self._gst_pipe.set_state(Gst.State.PLAYING)
+
+    def __needs_seek(self):
+        # With loops, the first seek enables the segment-seek mode
+        return (self.start_time > 0 or self.stop_time > 0 or
+                self._loop_count != 0)
 
     def pause(self):
         if self.state == MediaState.Playing:
@@ -131,12 +211,20 @@ class GstMedia(Media):
                 element.pause()
 
             self._state = MediaState.Paused
-            self._gst_pipe.set_state(Gst.State.PAUSED)
-            self._gst_pipe.get_state(Gst.SECOND)
+            self._pending = (Gst.State.PAUSED, self.paused)
+            self._start_at = None
+
+            # While prerolling the pipeline is already going in PAUSED
+            if not self._prerolling:
+                GstStateWorker().submit(self._gst_pipe, self.__pausing)
 
-            # FIXME: the pipeline is not flushed (fucking GStreamer)
+    def __pausing(self):
+        # Restore the base-time handling, disabled by play_at, so that
+        # the playback can be resumed
+        self._gst_pipe.set_start_time(0)
+        self._gst_pipe.set_state(Gst.State.PAUSED)
 
-            self.paused.emit(self)
+        # FIXME: the pipeline is not flushed (fucking GStreamer)
 
     def stop(self):
         if self.state == MediaState.Playing or self.state == MediaState.Paused:
@@ -145,12 +233,13 @@ class GstMedia(Media):
             for element in self._elements:
                 element.stop()
 
-            self.interrupt(emit=False)
-            self.stopped.emit(self)
+            self.__interrupt(signal=self.stopped)
 
-    def __seek(self, position):
+    def __seek(self, position, flush=True):
         # FIXME: not working when in pause (fix or disallow)
-        if self.state == MediaState.Playing or self.state == MediaState.Paused:
+        if (self.state == MediaState.Playing or
+                self.state == MediaState.Paused or self._prerolled or
+                self._prerolling):
             max_position = self.duration
             if 0 < self.stop_time < self.duration:
                 max_position = self.stop_time
@@ -166,16 +255,26 @@ class GstMedia(Media):
                 if self.stop_time > 0:
                     stop_type = Gst.SeekType.SET
 
+                # With loops remaining, a SEGMENT_DONE message is posted
+                # (instead of EOS) at the end, so the next loop can be
+                # queued without flushing the pipeline
+                flags = Gst.SeekFlags.NONE
+                if flush:
+                    flags |= Gst.SeekFlags.FLUSH
+                if self._loop_count != 0:
+                    flags |= Gst.SeekFlags.SEGMENT
+
                 # Seek the pipeline
                 result = self._gst_pipe.seek(
                     rate if rate > 0 else 1,
                     Gst.Format.TIME,
-                    Gst.SeekFlags.FLUSH,
+                    flags,
                     Gst.SeekType.SET,
                     position * Gst.MSECOND,
                     stop_type,
                     self.stop_time * Gst.MSECOND)
 
+                self._position.reset(self._gst_state == Gst.State.PLAYING)
                 return result
 
         return False
@@ -209,23 +308,49 @@ class GstMedia(Media):
             pass
 
     def interrupt(self, dispose=False, emit=True):
+        signal = None
+        if emit and (self._state == MediaState.Playing or
+                     self._state == MediaState.Paused):
+            signal = self.interrupted
+
+        self.__interrupt(dispose=dispose, signal=signal)
+
+    def __interrupt(self, dispose=False, signal=None):
+        """Stop the media, `signal` is emitted when the pipeline is stopped.
+
+        The pipeline state is changed in background, a slow element (e.g.
+        a network source) doesn't block the caller.
+        """
         for element in self._elements:
             element.interrupt()
 
-        state = self._state
+        self._state = MediaState.Null if dispose else MediaState.Stopped
+        self._pending = None
+        self._prerolled = False
+        self._prerolling = False
+        self._preroll_seek = False
+        self._start_at = None
+
+        self._loop_count = self.loop
+        self._position.reset()
 
+        GstStateWorker().submit(self._gst_pipe,
+                                partial(self.__interrupted, dispose, signal))
+
+    def __interrupted(self, dispose, signal):
         self._gst_pipe.set_state(Gst.State.NULL)
-        if dispose:
-            self._state = MediaState.Null
-        else:
+        if not dispose:
             self._gst_pipe.set_state(Gst.State.READY)
-            self._state = MediaState.Stopped
 
-        self._loop_count = self.loop
+        # Back to the default clock, as selected by the pipeline
+        self._gst_pipe.auto_clock()
+        self._gst_pipe.set_start_time(0)
+
+        if not dispose:
+            self.__update_bypass()
 
-        if emit and (state == MediaState.Playing or
-                     state == MediaState.Paused):
-            self.interrupted.emit(self)
+        if signal is not None:
+            signal.emit(self)
 
     def properties(self, only_changed=False):
         properties = super().properties(only_changed).copy()
@@ -259,6 +384,7 @@ class GstMedia(Media):
             self._elements[-1].link(element)
 
         self._elements.append(element)
+        element.property_changed.connect(self.__element_changed)
 
     def __remove_element(self, index):
         if index > 0:
@@ -270,12 +396,22 @@ class GstMedia(Media):
         self._elements.pop(index).dispose()
 
     def __build_pipeline(self):
-        # Set to NULL the pipeline
+        # Set to NULL the pipeline, the children can be removed only after
         self.interrupt(dispose=True)
+        GstStateWorker().wait(self._gst_pipe)
+
+        with self._links_lock:
+            self.__rebuild_elements()
+
+        self.__submit_bypass()
+        self.elements_changed.emit(self)
+
+    def __rebuild_elements(self):
         # Remove all pipeline children
         for __ in range(self._gst_pipe.get_children_count()):
             self._gst_pipe.remove(self._gst_pipe.get_child_by_index(0))
         # Remove all the elements
+        self._bypassed.clear()
         for __ in range(len(self._elements)):
             self.__remove_element(len(self._elements) - 1)
 
@@ -288,17 +424,250 @@ class GstMedia(Media):
         self._state = MediaState.Stopped
         self._gst_pipe.set_state(Gst.State.READY)
 
+    def __edit_pipeline(self, old_pipe):
+        # Element objects are changed immediately (their properties can be
+        # updated right after), the bypass is checked in background
+        with self._links_lock:
+            self.__edit_elements(old_pipe)
+
+        self.__submit_bypass()
         self.elements_changed.emit(self)
 
+    def __edit_elements(self, old_pipe):
+        # Work on the complete chain, bypassed elements are linked again
+        for element in list(self._bypassed):
+            self.__restore(element)
+        self.__assemble(skip_converters=False)
+
+        # Keep the elements in common between the two pipes (same order)
+        matcher = SequenceMatcher(a=old_pipe, b=self.pipe, autojunk=False)
+        kept = {}
+        for block in matcher.get_matching_blocks():
+            for n in range(block.size):
+                kept[block.b + n] = self._elements[block.a + n]
+
+        old_elements = self._elements.copy()
+        removed = [e for e in old_elements if e not in kept.values()]
+        # The links that are still valid in the new pipe
+        kept_links = {(kept[n], kept[n + 1]) for n in kept if n + 1 in kept}
+
+        # Block the stream, downstream elements can be safely changed
+        pad, probe = self.__block_stream(self._elements[0])
+
+        # Detach the removed elements, and their GstElement(s)
+        removed_children = []
+        for element in removed:
+            index = old_elements.index(element)
+            removed_children.extend(
+                self.__element_children(element, old_elements[index + 1]))
+
+        for element, next_element in zip(old_elements, old_elements[1:]):
+            if (element, next_element) not in kept_links:
+                element.unlink(next_element)
+
+        for child in removed_children:
+            child.set_state(Gst.State.NULL)
+            self._gst_pipe.remove(child)
+        for element in removed:
+            element.dispose()
+
+        # Create the new elements
+        pipe_elements = self._pipe_elements()
+        new_elements = []
+        added = []
+        for n, name in enumerate(self.pipe):
+            if n in kept:
+                new_elements.append(kept[n])
+            else:
+                children = self.__pipeline_children()
+                element = pipe_elements[name](self._gst_pipe)
+                element.property_changed.connect(self.__element_changed)
+                added.append((element, [child for child in
+                                        self.__pipeline_children()
+                                        if child not in children]))
+                new_elements.append(element)
+
+        # Link only the couples not already linked
+        for element, next_element in zip(new_elements, new_elements[1:]):
+            if (element, next_element) not in kept_links:
+                element.link(next_element)
+
+        # The same list is referenced by the finalizer
+        self._elements[:] = new_elements
+
+        for element, children in added:
+            for child in reversed(children):
+                child.sync_state_with_parent()
+            if self._state == MediaState.Playing:
+                element.play()
+
+        # Unblock the stream
+        pad.remove_probe(probe)
+
+    def __element_changed(self, element, name, value):
+        # Links are changed in order with the state changes, and outside the
+        # calling thread (e.g. the GUI one), since the stream is waited
+        GstStateWorker().submit(self._gst_pipe, self.__check_bypass, element)
+
+    def __check_bypass(self, element):
+        with self._links_lock:
+            if element not in self._elements:
+                # Removed meanwhile
+                return
+
+            if element in self._bypassed:
+                if not element.neutral():
+                    self.__restore(element)
+                    self.__assemble()
+            elif element.neutral():
+                self.__update_bypass()
+
+    def __submit_bypass(self):
+        GstStateWorker().submit(self._gst_pipe, self.__update_bypass)
+
+    def __update_bypass(self):
+        # Neutral elements are unlinked only when the media is not streaming,
+        # while restored immediately, so the playback is never altered
+        with self._links_lock:
+            if self._state != MediaState.Playing and \
+                    self._state != MediaState.Paused:
+                for element in self._elements[1:-1]:
+                    if element not in self._bypassed and element.neutral():
+                        self.__bypass(element)
+
+            self.__assemble()
+
+    def __assemble(self, skip_converters=True):
+        """Skip the elements converters not required by the stream.
+
+        A converter is skipped only when the format negotiated at the output
+        of its element is accepted by the next one, so the stream is not
+        changed. While the format is unknown (not negotiated, e.g. before the
+        preroll) the converters are kept.
+        """
+        linked = [e for e in self._elements if e not in self._bypassed]
+        changes = []
+
+        for element, next_element in zip(linked, linked[1:]):
+            if element.converter() is None:
+                continue
+
+            skip = False
+            if skip_converters:
+                caps = element.src_caps()
+                skip = caps is not None and next_element.sink_accepts(caps)
+
+            if skip != element.converter_skipped:
+                changes.append((element, next_element, skip))
+
+        if changes:
+            pad, probe = self.__block_stream(linked[0])
+            for element, next_element, skip in changes:
+                element.unlink(next_element)
+                element.skip_converter(skip)
+                element.link(next_element)
+            pad.remove_probe(probe)
+
+    def __reassemble(self):
+        with self._links_lock:
+            self.__assemble()
+
+    def __neighbours(self, element):
+        """Return the nearest linked elements before and after the given."""
+        index = self._elements.index(element)
+        prev_element = next(e for e in reversed(self._elements[:index])
+                            if e not in self._bypassed)
+        next_element = next(e for e in self._elements[index + 1:]
+                            if e not in self._bypassed)
+
+        return prev_element, next_element
+
+    def __bypass(self, element):
+        prev_element, next_element = self.__neighbours(element)
+
+        pad, probe = self.__block_stream(prev_element)
+        prev_element.unlink(element)
+        element.unlink(next_element)
+        prev_element.link(next_element)
+        pad.remove_probe(probe)
+
+        self._bypassed.add(element)
+
+    def __restore(self, element):
+        self._bypassed.discard(element)
+        prev_element, next_element = self.__neighbours(element)
+
+        pad, probe = self.__block_stream(prev_element)
+        prev_element.unlink(next_element)
+        prev_element.link(element)
+        element.link(next_element)
+        pad.remove_probe(probe)
+
+    def __block_stream(self, element):
+        """Block the stream after the given element, return (pad, probe).
+
+        When playing, wait for the pad to be actually blocked, the links can
+        be changed only after. If no data arrives in `BLOCK_TIMEOUT` (e.g.
+        after the end of the stream) the pad is considered idle.
+        """
+        pad = element.linked_src().get_static_pad('src')
+        # The current state, the bus messages could be not yet dispatched
+        playing = self._gst_pipe.get_state(0)[1] == Gst.State.PLAYING
+        probe = gst_block_pad(pad, wait=playing,
+                              timeout=GstMedia.BLOCK_TIMEOUT)
+
+        return pad, probe
+
+    def __pipeline_children(self):
+        return [self._gst_pipe.get_child_by_index(n)
+                for n in range(self._gst_pipe.get_children_count())]
+
+    @staticmethod
+    def __element_children(element, next_element):
+        """Return the GstElement(s) between element sink and src."""
+        first = element.sink()
+        last = element.src()
+        stop = next_element.sink()
+
+        children = [first]
+        pending = [first]
+        while pending:
+            current = pending.pop()
+            if current == last:
+                continue
+
+            for pad in current.srcpads:
+                peer = pad.get_peer()
+                if peer is not None:
+                    child = peer.get_parent_element()
+                    if (child is not None and child != stop and
+                            child not in children):
+                        children.append(child)
+                        pending.append(child)
+
+        return children
+
     def __on_message(self, bus, message):
         if message.src == self._gst_pipe:
             if message.type == Gst.MessageType.STATE_CHANGED:
-                self._gst_state = message.parse_state_changed()[1]
+                __, self._gst_state, pending = message.parse_state_changed()
+                self._position.reset(self._gst_state == Gst.State.PLAYING)
+
+                if pending == Gst.State.VOID_PENDING:
+                    self.__state_reached(self._gst_state)
+            elif message.type == Gst.MessageType.ASYNC_DONE:
+                # After a flushing seek (e.g. speed changes)
+                self._position.reset(self._gst_state == Gst.State.PLAYING)
+
+                if self._prerolling:
+                    self.__on_prerolled()
             elif message.type == Gst.MessageType.EOS:
                 self.__on_eos()
+            elif message.type == Gst.MessageType.SEGMENT_DONE:
+                self.__on_segment_done()
             elif message.type == Gst.MessageType.CLOCK_LOST:
-                self._gst_pipe.set_state(Gst.State.PAUSED)
-                self._gst_pipe.set_state(Gst.State.PLAYING)
+                GstStateWorker().set_state(
+                    self._gst_pipe, Gst.State.PAUSED, Gst.State.PLAYING)
 
         if message.type == Gst.MessageType.ERROR:
             err, debug = message.parse_error()
@@ -306,9 +675,52 @@ class GstMedia(Media):
             self.interrupt(dispose=True, emit=False)
             self.error.emit(self, str(err), str(debug))
 
+    def __on_prerolled(self):
+        if self._preroll_seek:
+            self._preroll_seek = False
+            # Another ASYNC_DONE is posted when the seek is completed
+            if self.__seek(self.start_time):
+                return
+
+        self._prerolling = False
+        self._prerolled = True
+        # The format is now negotiated, unneeded converters can be skipped
+        GstStateWorker().submit(self._gst_pipe, self.__reassemble)
+
+        if self._state == MediaState.Playing:
+            self.__start_playback()
+        else:
+            self.__state_reached(self._gst_state)
+
+    def __state_reached(self, state):
+        # While prerolling PAUSED is only an intermediate state
+        if (self._pending is not None and self._pending[0] == state and
+                not self._prerolling):
+            signal = self._pending[1]
+            self._pending = None
+            signal.emit(self)
+
+    def __on_segment_done(self):
+        if self._loop_count != 0:
+            # Negative values mean infinite loops
+            if self._loop_count > 0:
+                self._loop_count -= 1
+
+            # Queue the next loop, the last one will end with an EOS
+            if self.__seek(self.start_time, flush=False):
+                self.sought.emit(self, self.start_time)
+                return
+
+        # No more loops (e.g. changed while playing)
+        self._loop_count = 0
+        self.__on_eos()
+
     def __on_eos(self):
+        # While looping, EOS is posted only if the segment-seek mode is lost
+        # (e.g. after a Speed change), fallback to a flushing seek
         if self._loop_count != 0:
-            self._loop_count -= 1
+            if self._loop_count > 0:
+                self._loop_count -= 1
             self.seek(self.start_time)
         else:
             self._state = MediaState.Stopped
@@ -319,13 +731,18 @@ class GstMedia(Media):
         self.duration = duration
 
     @staticmethod
-    def __finalizer(pipeline, connection_handler, media_elements):
+    def __finalizer(pipeline, media_elements):
+        # Released in background, many pipelines (e.g. when a session is
+        # closed) are stopped concurrently
+        GstStateWorker().submit(pipeline, GstMedia.__release, pipeline,
+                                media_elements)
+
+    @staticmethod
+    def __release(pipeline, media_elements):
         # Allow pipeline resources to be released
         pipeline.set_state(Gst.State.NULL)
 
-        bus = pipeline.get_bus()
-        bus.remove_signal_watch()
-        bus.disconnect(connection_handler)
+        GstBusDispatcher().remove(pipeline)
 
         for element in media_elements:
             element.dispose()
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Linux Show Player
+#
+# Copyright 2012-2016 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+from threading import Lock
+
+from lisp.backend.meter_engine import MeterEngine
+from lisp.core.configuration import config
+from lisp.core.signal import Signal
+from lisp.core.singleton import Singleton
+from lisp.modules.gst_backend.gi_repository import Gst
+from lisp.modules.gst_backend.gst_bus import GstBusDispatcher
+
+
+# Used when a bus is not configured (e.g. a session from another machine)
+DEFAULT_BUS = 'main'
+DEFAULT_SINK = 'autoaudiosink'
+
+
+def bus_names():
+    """Return the names of the configured output buses."""
+    if config.has_section('OutputBus'):
+        return list(config['OutputBus'].keys())
+
+    return []
+
+
+class OutputBus:
+    """A long-lived pipeline mixing many inputs into a single sink.
+
+    Inputs are "channels" of interaudiosink elements (in other pipelines),
+    each attached channel is mixed by an interaudiosrc -> audiomixer pad.
+    """
+
+    def __init__(self, name, sink_description):
+        self.name = name
+        self.level_ready = Signal()
+
+        self._lock = Lock()
+        self._channels = {}
+
+        self._pipeline = Gst.Pipeline()
+        self._mixer = Gst.ElementFactory.make('audiomixer', None)
+        self._volume = Gst.ElementFactory.make('volume', None)
+        self._level = Gst.ElementFactory.make('level', None)
+        self._level.set_property('interval', 50 * Gst.MSECOND)
+        self._convert = Gst.ElementFactory.make('audioconvert', None)
+        self._resample = Gst.ElementFactory.make('audioresample', None)
+        self._sink = Gst.parse_bin_from_description(sink_description, True)
+
+        elements = (self._mixer, self._volume, self._level, self._convert,
+                    self._resample, self._sink)
+        for element in elements:
+            self._pipeline.add(element)
+        for element, next_element in zip(elements, elements[1:]):
+            element.link(next_element)
+
+        self._meter = MeterEngine().register(self.level_ready)
+        self._handler = GstBusDispatcher().connect(
+            self._pipeline, Gst.MessageType.ELEMENT, self.__on_message,
+            src=self._level)
+
+        self._pipeline.set_state(Gst.State.PLAYING)
+
+    @property
+    def volume(self):
+        return self._volume.get_property('volume')
+
+    @volume.setter
+    def volume(self, volume):
+        self._volume.set_property('volume', volume)
+
+    def attach(self, channel):
+        """Start mixing the given interaudiosink channel."""
+        with self._lock:
+            if channel in self._channels:
+                return
+
+            src = Gst.ElementFactory.make('interaudiosrc', None)
+            src.set_property('channel', channel)
+            self._pipeline.add(src)
+
+            pad = self._mixer.get_request_pad('sink_%u')
+            src.get_static_pad('src').link(pad)
+            src.sync_state_with_parent()
+
+            self._channels[channel] = (src, pad)
+
+    def detach(self, channel):
+        """Stop mixing the given interaudiosink channel."""
+        with self._lock:
+            src, pad = self._channels.pop(channel, (None, None))
+            if src is not None:
+                src.set_state(Gst.State.NULL)
+                src.get_static_pad('src').unlink(pad)
+                self._mixer.release_request_pad(pad)
+                self._pipeline.remove(src)
+
+    def dispose(self):
+        self._pipeline.set_state(Gst.State.NULL)
+        GstBusDispatcher().remove(self._pipeline)
+        MeterEngine().unregister(self._meter)
+
+    def __on_message(self, bus, message):
+        structure = message.get_structure()
+        if structure is not None and structure.has_name('level'):
+            MeterEngine().update(self._meter,
+                                 structure.get_value('peak'),
+                                 structure.get_value('rms'))
+
+
+class OutputBuses(metaclass=Singleton):
+    """The output buses, as configured in the `[OutputBus]` section.
+
+    Every entry is in the form `name = sink-description`, e.g.
+    `main = autoaudiosink` or `monitor = jackaudiosink`, buses are created
+    when first used. As any configuration key, names are lowercase.
+
+    Unknown buses are replaced by the `main` one.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._buses = {}
+
+    def get(self, name):
+        """:rtype: OutputBus"""
+        name = name.lower()
+        if name not in bus_names():
+            logging.warning(
+                'OUTPUT-BUS: "{}" is not configured, "{}" is used'.format(
+                    name, DEFAULT_BUS))
+            name = DEFAULT_BUS
+
+        with self._lock:
+            bus = self._buses.get(name)
+            if bus is None:
+                description = DEFAULT_SINK
+                if config.has_section('OutputBus'):
+                    description = config['OutputBus'].get(name, DEFAULT_SINK)
+
+                bus = OutputBus(name, description)
+                self._buses[name] = bus
+
+            return bus
+
+    def dispose(self):
+        with self._lock:
+            for bus in self._buses.values():
+                bus.dispose()
+            self._buses.clear()
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Linux Show Player
+#
+# Copyright 2012-2016 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+from lisp.core.configuration import config
+from lisp.core.singleton import Singleton
+from lisp.core.util import uri_fingerprint
+from lisp.modules.gst_backend.gi_repository import Gst
+from lisp.modules.gst_backend.gst_decoder import GstDecoder, GstDecodeError
+
+
+class PcmData:
+    """Decoded (signed 16bit, interleaved) audio data."""
+
+    __slots__ = ('data', 'rate', 'channels', 'fingerprint')
+
+    def __init__(self, data, rate, channels, fingerprint):
+        self.data = data
+        self.rate = rate
+        self.channels = channels
+        self.fingerprint = fingerprint
+
+    @property
+    def frame_size(self):
+        return self.channels * 2
+
+    def caps(self):
+        return Gst.Caps.from_string(
+            'audio/x-raw,format=S16LE,layout=interleaved,'
+            'rate={},channels={}'.format(self.rate, self.channels))
+
+    def time(self, offset):
+        """Convert a bytes offset in nanoseconds."""
+        return offset // self.frame_size * Gst.SECOND // self.rate
+
+    def offset(self, time):
+        """Convert nanoseconds in a bytes offset (aligned to frames)."""
+        return time * self.rate // Gst.SECOND * self.frame_size
+
+
+class _PcmCollector:
+    """GstDecoder consumer collecting the decoded data."""
+
+    def __init__(self, decoder, max_duration, max_size):
+        self.decoder = decoder
+        self.max_duration = max_duration
+        self.max_size = max_size
+        self.rate = 0
+        self.data = bytearray()
+
+    def start(self, rate, channels):
+        self.rate = rate
+        # Stop when the file is too long (or too big)
+        self.max_size = min(
+            self.max_size, self.max_duration * rate // 1000 * channels * 2)
+
+    def feed(self, data):
+        self.data.extend(data)
+        if len(self.data) > self.max_size:
+            self.decoder.stop()
+
+    def finish(self):
+        pass
+
+
+class PcmCache(metaclass=Singleton):
+    """Shared, in-memory, cache of decoded media-files.
+
+    Only files shorter than `[Gst] PcmCacheMaxDuration` (milliseconds) are
+    cached, the least-recently-used files are discarded when the total
+    size exceed `[Gst] PcmCacheSize` (MiB).
+    Every file is decoded only once, no matter how many media use it.
+    """
+
+    CHANNELS = 2
+
+    def __init__(self):
+        self.budget = int(config['Gst'].get('PcmCacheSize', 64)) * 1024 ** 2
+        self.max_duration = int(config['Gst'].get('PcmCacheMaxDuration',
+                                                  15000))
+
+        self._lock = Lock()
+        self._entries = OrderedDict()
+        self._loading = set()
+        self._size = 0
+        self._pool = ThreadPoolExecutor(1)
+
+    def get(self, uri):
+        """Return the cached PcmData for the uri, or None.
+
+        :rtype: PcmData | None
+        """
+        fingerprint = uri_fingerprint(uri)
+
+        with self._lock:
+            pcm = self._entries.get(uri)
+            if pcm is not None:
+                if pcm.fingerprint == fingerprint:
+                    self._entries.move_to_end(uri)
+                    return pcm
+
+                # The file is changed
+                self.__discard(uri)
+
+    def preload(self, uri):
+        """Decode the file in background, if not already cached."""
+        with self._lock:
+            if uri in self._loading:
+                return
+            self._loading.add(uri)
+
+        self._pool.submit(self.__load, uri)
+
+    def __load(self, uri):
+        try:
+            fingerprint = uri_fingerprint(uri)
+            if fingerprint is None or self.get(uri) is not None:
+                return
+
+            decoder = GstDecoder(uri, channels=self.CHANNELS)
+            collector = _PcmCollector(decoder, self.max_duration, self.budget)
+
+            if decoder.decode(collector):
+                pcm = PcmData(bytes(collector.data), collector.rate,
+                              self.CHANNELS, fingerprint)
+                self.__insert(uri, pcm)
+        except GstDecodeError as e:
+            logging.debug('PCM-CACHE: cannot decode "{}": {}'.format(uri, e))
+        finally:
+            with self._lock:
+                self._loading.discard(uri)
+
+    def __insert(self, uri, pcm):
+        with self._lock:
+            self.__discard(uri)
+            self._entries[uri] = pcm
+            self._size += len(pcm.data)
+
+            # Evict the least recently used files
+            while self._size > self.budget:
+                self.__discard(next(iter(self._entries)))
+
+    def __discard(self, uri):
+        pcm = self._entries.pop(uri, None)
+        if pcm is not None:
+            self._size -= len(pcm.data)
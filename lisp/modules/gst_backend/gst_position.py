@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Linux Show Player
+#
+# Copyright 2012-2016 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+from threading import Lock
+from time import monotonic
+
+from lisp.modules.gst_backend.gi_repository import Gst
+
+
+class GstPosition:
+    """Cache the playback position of a pipeline.
+
+    The pipeline is queried at most once every `SAMPLE_INTERVAL`, between two
+    samples the position is extrapolated using the pipeline clock, this way
+    any number of "observers" cost a single position query for each tick.
+
+    The cache must be invalidated (`reset`) when the position "jumps"
+    (e.g. seek, flush, state change).
+    """
+
+    SAMPLE_INTERVAL = 100 * Gst.MSECOND
+
+    def __init__(self, pipeline):
+        self._pipeline = pipeline
+        self._lock = Lock()
+        self._running = False
+        self._rate = 1.0
+        self._position = 0
+        self._sample_time = -1
+
+    def reset(self, running=False):
+        """Invalidate the cached position.
+
+        :param running: True if the pipeline is in PLAYING state
+        :type running: bool
+        """
+        with self._lock:
+            self._running = running
+            self._sample_time = -1
+
+    def position(self):
+        """Return the current (sampled or extrapolated) position.
+
+        :return: the pipeline position in nanoseconds, 0 if not available
+        :rtype: int
+        """
+        with self._lock:
+            now = self._clock_time()
+            elapsed = now - self._sample_time
+
+            if self._sample_time < 0 or not 0 <= elapsed < self.SAMPLE_INTERVAL:
+                if self._sample_time < 0:
+                    # The segment changed (e.g. after a seek), update the rate
+                    self._rate = self._query_rate()
+
+                ok, position = self._pipeline.query_position(Gst.Format.TIME)
+                self._position = position if ok else 0
+                self._sample_time = now
+
+                return self._position
+            elif self._running:
+                return self._position + int(elapsed * self._rate)
+
+            return self._position
+
+    def _clock_time(self):
+        clock = self._pipeline.get_clock()
+        if clock is not None:
+            return clock.get_time()
+
+        return int(monotonic() * Gst.SECOND)
+
+    def _query_rate(self):
+        query = Gst.Query.new_segment(Gst.Format.TIME)
+        if self._pipeline.query(query):
+            rate = Gst.Query.parse_segment(query)[0]
+            if rate > 0:
+                return rate
+
+        return 1.0
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Linux Show Player
+#
+# Copyright 2012-2016 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+from threading import Condition, Lock, Thread
+from urllib.parse import quote, unquote
+
+from lisp.core.configuration import config
+from lisp.core.singleton import Singleton
+from lisp.modules.gst_backend.gi_repository import Gst
+
+
+class SharedSource:
+    """Decode a file once, delivering the buffers to many subscribers.
+
+    Subscribers must provide:
+
+        * full: True when the subscriber cannot accept more data
+        * push(caps, buffer): called (from the source thread) for each buffer
+        * end(): called at the end of the stream
+
+    The decoding goes on as fast as the subscribers can accept data.
+    Buffers of the first `window` nanoseconds are kept, so subscribers
+    joining a little later receive the whole stream.
+    """
+
+    PULL_TIMEOUT = Gst.SECOND // 10
+
+    def __init__(self, uri, position, window, on_close):
+        protocol, _, path = uri.partition('://')
+
+        self.uri = uri
+        self.position = position
+        self.window = window
+
+        self._on_close = on_close
+        self._condition = Condition()
+        self._subscribers = []
+        self._history = []
+        self._joinable = True
+        self._running = True
+
+        self._pipeline = Gst.parse_launch(
+            'uridecodebin uri="{}" ! audioconvert ! audioresample ! '
+            'audio/x-raw,format=S16LE,layout=interleaved,channels=2 ! '
+            'appsink name=sink sync=false max-buffers=8'.format(
+                protocol + '://' + quote(unquote(path))))
+        self._sink = self._pipeline.get_by_name('sink')
+
+        Thread(target=self.__run, daemon=True,
+               name='SharedSource').start()
+
+    def joinable(self, position):
+        with self._condition:
+            return self._joinable and position == self.position
+
+    def subscribe(self, subscriber):
+        """:return: False if the source cannot be joined anymore"""
+        with self._condition:
+            if not (self._joinable and self._running):
+                return False
+
+            for caps, buffer in self._history:
+                subscriber.push(caps, buffer)
+
+            self._subscribers.append(subscriber)
+            return True
+
+    def unsubscribe(self, subscriber):
+        with self._condition:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+            if not self._subscribers:
+                self._running = False
+
+            self._condition.notify_all()
+
+    def notify(self):
+        """Subscribers call this when they can accept data again."""
+        with self._condition:
+            self._condition.notify_all()
+
+    def __close_join(self):
+        # Must be called with the condition acquired, return True if the
+        # source has been closed by this call
+        if self._joinable:
+            self._joinable = False
+            self._history.clear()
+            return True
+
+        return False
+
+    def __run(self):
+        try:
+            if self.position > 0:
+                self._pipeline.set_state(Gst.State.PAUSED)
+                self._pipeline.get_state(Gst.CLOCK_TIME_NONE)
+                self._pipeline.seek_simple(
+                    Gst.Format.TIME,
+                    Gst.SeekFlags.FLUSH | Gst.SeekFlags.ACCURATE,
+                    self.position)
+
+            self._pipeline.set_state(Gst.State.PLAYING)
+            bus = self._pipeline.get_bus()
+
+            while True:
+                with self._condition:
+                    while self._running and any(s.full for s in
+                                                self._subscribers):
+                        self._condition.wait(self.PULL_TIMEOUT / Gst.SECOND)
+
+                    if not self._running:
+                        break
+
+                sample = self._sink.emit('try-pull-sample', self.PULL_TIMEOUT)
+                if sample is None:
+                    message = bus.pop_filtered(Gst.MessageType.ERROR)
+                    if message is not None:
+                        logging.warning('SHARED-SOURCE: {}'.format(
+                            message.parse_error()[0].message))
+                        break
+                    if self._sink.get_property('eos'):
+                        break
+                    continue
+
+                caps = sample.get_caps()
+                buffer = sample.get_buffer()
+
+                closed = False
+                with self._condition:
+                    if self._joinable:
+                        if buffer.pts - self.position < self.window:
+                            self._history.append((caps, buffer))
+                        else:
+                            closed = self.__close_join()
+
+                    subscribers = self._subscribers.copy()
+
+                # Called without holding the condition (avoid dead-locks)
+                if closed:
+                    self._on_close(self)
+
+                for subscriber in subscribers:
+                    subscriber.push(caps, buffer)
+        finally:
+            self._pipeline.set_state(Gst.State.NULL)
+
+            with self._condition:
+                closed = self.__close_join()
+                subscribers = self._subscribers.copy() if self._running else ()
+
+            if closed:
+                self._on_close(self)
+            for subscriber in subscribers:
+                subscriber.end()
+
+
+class SharedSources(metaclass=Singleton):
+    """Registry of the SharedSource(s) that can still be joined.
+
+    Media playing the same file from the same position, starting within
+    `[Gst] SharedSourceWindow` milliseconds, share the same decoder.
+    """
+
+    def __init__(self):
+        self.window = int(config['Gst'].get('SharedSourceWindow', 1000))
+        self._lock = Lock()
+        self._sources = {}
+
+    def join(self, uri, position, subscriber):
+        """Subscribe to a source for the uri, starting at position (ns).
+
+        :rtype: SharedSource
+        """
+        with self._lock:
+            for source in self._sources.get(uri, ()):
+                if source.joinable(position) and source.subscribe(subscriber):
+                    return source
+
+            source = SharedSource(uri, position, self.window * Gst.MSECOND,
+                                  self.__closed)
+            source.subscribe(subscriber)
+            self._sources.setdefault(uri, []).append(source)
+
+            return source
+
+    def __closed(self, source):
+        with self._lock:
+            sources = self._sources.get(source.uri, [])
+            if source in sources:
+                sources.remove(source)
+            if not sources:
+                self._sources.pop(source.uri, None)
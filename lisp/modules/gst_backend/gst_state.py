@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Linux Show Player
+#
+# Copyright 2012-2016 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+import traceback
+from collections import deque
+from threading import Condition, Event
+
+from lisp.core.configuration import config
+from lisp.core.singleton import Singleton
+from lisp.core.worker_pool import PriorityWorkerPool
+
+
+class GstStateWorker(metaclass=Singleton):
+    """Execute pipelines state changes in background threads.
+
+    The tasks of the same pipeline are executed in submission order, while
+    different pipelines are handled concurrently, so a slow pipeline (e.g.
+    a network source or a busy device) doesn't delay the others.
+    """
+
+    def __init__(self):
+        self._condition = Condition()
+        self._queues = {}
+        self._terminated = False
+        self._pool = PriorityWorkerPool(
+            workers=int(config['Gst'].get('StateWorkers', 4)),
+            name='GstStateWorker')
+
+    def submit(self, pipeline, task, *args):
+        """Schedule `task(*args)` after the pending tasks of `pipeline`."""
+        with self._condition:
+            terminated = self._terminated
+            if not terminated:
+                queue = self._queues.get(pipeline)
+                if queue is not None:
+                    queue.append((task, args))
+                    return
+
+                self._queues[pipeline] = deque([(task, args)])
+
+        if terminated:
+            # No more background changes, e.g. pipelines released on exit
+            task(*args)
+        else:
+            self._pool.submit(pipeline, self.__run, pipeline)
+
+    def set_state(self, pipeline, *states):
+        """Schedule the given state changes, in order."""
+        self.submit(pipeline, self.__set_state, pipeline, states)
+
+    def wait(self, pipeline):
+        """Block until the pending tasks of `pipeline` are executed."""
+        done = Event()
+        self.submit(pipeline, done.set)
+        done.wait()
+
+    def terminate(self):
+        """Wait all the pending tasks, the next ones are executed
+        immediately by the caller.
+        """
+        with self._condition:
+            self._terminated = True
+            while self._queues:
+                self._condition.wait()
+
+    def __run(self, pipeline):
+        while True:
+            with self._condition:
+                queue = self._queues[pipeline]
+                if not queue:
+                    # No more tasks, new ones need a new execution
+                    self._queues.pop(pipeline)
+                    self._condition.notify_all()
+                    return
+
+                task, args = queue.popleft()
+
+            try:
+                task(*args)
+            except Exception:
+                logging.error('GST: state change task {} failed'.format(task))
+                logging.debug(traceback.format_exc())
+
+    @staticmethod
+    def __set_state(pipeline, states):
+        for state in states:
+            pipeline.set_state(state)
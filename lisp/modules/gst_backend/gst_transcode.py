@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Linux Show Player
+#
+# Copyright 2012-2016 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+from hashlib import sha1
+from urllib.parse import quote, unquote
+
+from lisp.core.configuration import config, CFG_DIR
+from lisp.core.singleton import Singleton
+from lisp.core.util import uri_fingerprint
+from lisp.modules.gst_backend.gi_repository import Gst
+from lisp.modules.gst_backend.gst_decoder import GstDecodeError
+
+TRANSCODED_DIR = os.path.join(CFG_DIR, 'transcoded')
+
+
+class TranscodeCache(metaclass=Singleton):
+    """Local copies of media-files, as PCM (wav) in the output format.
+
+    Files are keyed by the source fingerprint (real-path, size, mtime)
+    and the target format, `[Gst] PrepRate` and `[Gst] PrepChannels`, so
+    a copy is used only while valid.
+    """
+
+    def __init__(self):
+        self.rate = int(config['Gst'].get('PrepRate', 48000))
+        self.channels = int(config['Gst'].get('PrepChannels', 2))
+
+    def path(self, uri):
+        """Return the path of the transcoded file, or None if not cacheable.
+        """
+        fingerprint = uri_fingerprint(uri)
+        if fingerprint is not None:
+            key = repr((fingerprint, self.rate, self.channels)).encode()
+            return os.path.join(TRANSCODED_DIR,
+                                sha1(key).hexdigest() + '.wav')
+
+    def lookup(self, uri):
+        """Return the uri of a valid transcoded copy, or None."""
+        path = self.path(uri)
+        if path is not None and os.path.exists(path):
+            return 'file://' + quote(path)
+
+    def transcode(self, uri):
+        """Create the transcoded copy of the file (blocking).
+
+        :return: False if the uri cannot be cached, True otherwise
+        :raise GstDecodeError: if the file cannot be transcoded
+        """
+        path = self.path(uri)
+        if path is None:
+            return False
+        if os.path.exists(path):
+            return True
+
+        os.makedirs(TRANSCODED_DIR, exist_ok=True)
+        tmp_path = path + '.tmp'
+
+        protocol, _, source = uri.partition('://')
+        pipeline = Gst.parse_launch(
+            'uridecodebin uri="{}" ! audioconvert ! audioresample ! '
+            'audio/x-raw,format=S16LE,rate={},channels={} ! wavenc ! '
+            'filesink name=sink'.format(
+                protocol + '://' + quote(unquote(source)), self.rate,
+                self.channels))
+        # Set the location as a property, the path could contain quotes
+        pipeline.get_by_name('sink').set_property('location', tmp_path)
+
+        try:
+            try:
+                pipeline.set_state(Gst.State.PLAYING)
+                message = pipeline.get_bus().timed_pop_filtered(
+                    Gst.CLOCK_TIME_NONE,
+                    Gst.MessageType.EOS | Gst.MessageType.ERROR)
+
+                if message.type == Gst.MessageType.ERROR:
+                    raise GstDecodeError(message.parse_error()[0].message)
+            finally:
+                pipeline.set_state(Gst.State.NULL)
+
+            os.replace(tmp_path, path)
+        finally:
+            # Don't leave partial copies behind
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        return True
+
+    def clear(self):
+        """Remove all the transcoded files."""
+        if os.path.exists(TRANSCODED_DIR):
+            for entry in os.listdir(TRANSCODED_DIR):
+                os.remove(os.path.join(TRANSCODED_DIR, entry))
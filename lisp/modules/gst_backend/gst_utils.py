@@ -17,20 +17,40 @@
 # You should have received a copy of the GNU General Public License
 # along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>
 
+import os
+from threading import Event, local
 from urllib.parse import unquote, quote
 
 from lisp.backend.audio_utils import uri_duration
+from lisp.core.configuration import CFG_DIR
+from lisp.core.fingerprint_cache import FingerprintCache
 from lisp.modules.gst_backend.gi_repository import Gst, GstPbutils
 
+METADATA_CACHE = FingerprintCache(os.path.join(CFG_DIR, 'cache', 'media.json'))
+
+# Discoverer instances are reused, one for each thread
+_discoverers = local()
+
 
 def gst_uri_duration(uri):
-    # First try to use the base implementation, because it's faster
+    """Return the media duration in milliseconds, 0 if unknown (e.g. streams).
+
+    :raise GLib.Error: if the discovery fails (e.g. the file is not decodable)
+    """
+    # First try to use the stored metadata, then the base implementation,
+    # because it's faster than a discovery
+    info = METADATA_CACHE.get(uri)
+    if info is not None:
+        return info['duration']
+
     duration = uri_duration(uri)
-    try:
-        if duration <= 0:
-            duration = gst_uri_metadata(uri).get_duration() // Gst.MSECOND
-    finally:
-        return duration if duration >= 0 else 0
+    if duration > 0:
+        # Only the duration is stored, other metadata are discovered
+        # when requested (see gst_media_info)
+        METADATA_CACHE.set(uri, {'duration': duration})
+        return duration
+
+    return gst_media_info(uri)['duration']
 
 
 def gst_mime_types():
@@ -46,13 +66,84 @@ def gst_mime_types():
 
 def gst_uri_metadata(uri):
     """Discover media-file metadata using GStreamer."""
-    discoverer = GstPbutils.Discoverer()
+    discoverer = getattr(_discoverers, 'discoverer', None)
+    if discoverer is None:
+        discoverer = _discoverers.discoverer = GstPbutils.Discoverer()
+
     uri = uri.split("://")
     info = discoverer.discover_uri(uri[0] + "://" + quote(unquote(uri[1])))
 
     return info
 
 
+def gst_media_info(uri):
+    """Return the media-file metadata, as a (json serializable) dictionary.
+
+    Metadata of local files are stored, and discovered again only when
+    the file changes.
+
+    .. Example::
+
+        {'duration': 242000, 'tags': {'title': '...'},
+         'audio': [{'bitrate': 320000, 'channels': 2, 'sample_rate': 44100,
+                    'depth': 16}],
+         'video': [{'width': 640, 'height': 480, 'framerate': 25}]}
+
+    :raise GLib.Error: if the discovery fails
+    :rtype: dict
+    """
+    info = METADATA_CACHE.get(uri)
+
+    # Entries with only the duration are stored by gst_uri_duration
+    if info is None or 'tags' not in info:
+        gst_info = gst_uri_metadata(uri)
+        info = {
+            'duration': max(gst_info.get_duration() // Gst.MSECOND, 0),
+            'tags': {},
+            'audio': [],
+            'video': []
+        }
+
+        for stream in gst_info.get_audio_streams():
+            info['audio'].append({
+                'bitrate': stream.get_bitrate(),
+                'channels': stream.get_channels(),
+                'sample_rate': stream.get_sample_rate(),
+                'depth': stream.get_depth()
+            })
+
+        for stream in gst_info.get_video_streams():
+            info['video'].append({
+                'width': stream.get_width(),
+                'height': stream.get_height(),
+                'framerate': round(stream.get_framerate_num() /
+                                   max(stream.get_framerate_denom(), 1))
+            })
+
+        tags = gst_info.get_tags()
+        if tags is not None:
+            for name, value in gst_parse_tags_list(tags).items():
+                if isinstance(value, (str, int, float, bool)):
+                    info['tags'][name] = value
+                elif type(value).__str__ is not object.__str__:
+                    info['tags'][name] = str(value)
+
+        METADATA_CACHE.set(uri, info)
+
+    return info
+
+
+def gst_template_caps(element, direction):
+    """Return the caps of the first pad-template, in the given direction, of
+    the element factory; None if unknown (e.g. bins without a factory).
+    """
+    factory = element.get_factory() if element is not None else None
+    if factory is not None:
+        for template in factory.get_static_pad_templates():
+            if template.direction == direction:
+                return template.get_caps()
+
+
 # Adaption of the code found in https://github.com/ch3pjw/pyam
 def gst_parse_tags_list(gst_tag_list):
     """Takes a GstTagList object and returns a dict."""
@@ -62,4 +153,25 @@ def gst_parse_tags_list(gst_tag_list):
         parsed_tags[tag_name] = gst_tag_list.get_value_index(tag_name, 0)
 
     gst_tag_list.foreach(parse_tag, parsed_tags)
-    return parsed_tags
\ No newline at end of file
+    return parsed_tags
+
+
+def gst_block_pad(pad, wait=True, timeout=0.5):
+    """Block the data flow of the pad, return the probe id.
+
+    With `wait` the function returns only when the pad is actually blocked,
+    or after `timeout` seconds without data (e.g. after the end of the
+    stream), links can be safely changed only after.
+    Remove the probe (`pad.remove_probe`) to unblock the pad.
+    """
+    blocked = Event()
+
+    def on_blocked(*args):
+        blocked.set()
+        return Gst.PadProbeReturn.OK
+
+    probe = pad.add_probe(Gst.PadProbeType.BLOCK_DOWNSTREAM, on_blocked, '')
+    if wait:
+        blocked.wait(timeout)
+
+    return probe
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Linux Show Player
+#
+# Copyright 2012-2016 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+from PyQt5 import QtCore
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QGroupBox, QHBoxLayout, QComboBox, QLabel, \
+    QVBoxLayout
+
+from lisp.modules.gst_backend.elements.bus_sink import BusSink
+from lisp.modules.gst_backend.gst_output_bus import bus_names, DEFAULT_BUS
+from lisp.ui.settings.settings_page import SettingsPage
+from lisp.ui.ui_utils import translate
+
+
+class BusSinkSettings(SettingsPage):
+    ELEMENT = BusSink
+    Name = ELEMENT.Name
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.setLayout(QVBoxLayout())
+        self.layout().setAlignment(Qt.AlignTop)
+
+        self.busGroup = QGroupBox(self)
+        self.busGroup.setTitle(translate('BusSinkSettings', 'Output bus'))
+        self.busGroup.setLayout(QHBoxLayout())
+        self.layout().addWidget(self.busGroup)
+
+        self.bus = QComboBox(self.busGroup)
+        self.bus.addItems(bus_names())
+        self.bus.setToolTip(
+            translate('BusSinkSettings', 'Output buses, as defined in the '
+                                         'application configuration'))
+        self.busGroup.layout().addWidget(self.bus)
+
+        self.label = QLabel(translate('BusSinkSettings', 'Output bus'),
+                            self.busGroup)
+        self.label.setAlignment(QtCore.Qt.AlignCenter)
+        self.busGroup.layout().addWidget(self.label)
+
+    def enable_check(self, enable):
+        self.busGroup.setCheckable(enable)
+        self.busGroup.setChecked(False)
+
+    def load_settings(self, settings):
+        bus = settings.get('bus', DEFAULT_BUS).lower()
+        # Not configured buses are replaced by the default one
+        if bus not in bus_names():
+            bus = DEFAULT_BUS
+
+        self.bus.setCurrentText(bus)
+
+    def get_settings(self):
+        if not (self.busGroup.isCheckable() and not self.busGroup.isChecked()):
+            return {'bus': self.bus.currentText()}
+
+        return {}
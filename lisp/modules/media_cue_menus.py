@@ -24,25 +24,31 @@ from PyQt5.QtGui import QCursor
 from PyQt5.QtWidgets import QFileDialog, QApplication, QMessageBox
 
 from lisp.backend import get_backend
+from lisp.backend.media_prescan import MediaPrescan
 from lisp.application import Application
 from lisp.core.module import Module
+from lisp.core.signal import Connection, Signal
 from lisp.cues.cue_factory import CueFactory
 from lisp.ui.mainwindow import MainWindow
 from lisp.ui.ui_utils import qfile_filters, translate
+from lisp.ui.widgets import QDetailedMessageBox
 
 
 class MediaCueMenus(Module):
     """Register menus to add MediaCue to layouts"""
 
     def __init__(self):
+        # Emitted (from any thread) when the selected files are probed
+        self._scanned = Signal()
+        self._scanned.connect(self.__add_cues, Connection.QtQueued)
+
         MainWindow().register_cue_menu_action(
             translate('MediaCueMenus', 'Audio cue (from file)'),
             self.add_uri_audio_media_cue,
             category='Media cues',
             shortcut='CTRL+M')
 
-    @staticmethod
-    def add_uri_audio_media_cue():
+    def add_uri_audio_media_cue(self):
         """Add audio MediaCue(s) form user-selected files"""
 
         if get_backend() is None:
@@ -60,14 +66,35 @@ class MediaCueMenus(Module):
                                                 translate('MediaCueMenus',
                                                           'Select media files'),
                                                 path, filters)
+        if not files:
+            return
 
         QApplication.setOverrideCursor(QCursor(Qt.WaitCursor))
 
+        # Probe all the files concurrently, in background, before creating
+        # the cues, the GUI is not blocked in the meantime
+        MediaPrescan().scan(('file://' + file for file in files),
+                            lambda report: self._scanned.emit(files, report))
+
+    @staticmethod
+    def __add_cues(files, report):
         # Create media cues, and add them to the Application cue_model
         for file in files:
-            cue = CueFactory.create_cue('URIAudioCue', uri='file://' + file)
+            uri = 'file://' + file
+            if uri not in report.durations:
+                continue
+
+            cue = CueFactory.create_cue('URIAudioCue', uri=uri)
             # Use the filename without extension as cue name
             cue.name = os.path.splitext(os.path.basename(file))[0]
             Application().cue_model.add(cue)
 
         QApplication.restoreOverrideCursor()
+
+        if report.has_problems():
+            QDetailedMessageBox.dwarning(
+                translate('MediaCueMenus', 'Media files'),
+                translate('MediaCueMenus',
+                          'Some files cannot be used and have been skipped'),
+                report.details(),
+                parent=MainWindow())
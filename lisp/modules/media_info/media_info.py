@@ -25,8 +25,7 @@ from PyQt5.QtWidgets import QAction, QMessageBox, QDialog, QVBoxLayout, \
 from PyQt5.QtWidgets import QHeaderView
 
 from lisp.application import Application
-from lisp.modules.gst_backend.gst_utils import gst_uri_metadata, \
-    gst_parse_tags_list
+from lisp.modules.gst_backend.gst_utils import gst_media_info
 from lisp.core.module import Module
 from lisp.cues.media_cue import MediaCue
 from lisp.layouts.cue_layout import CueLayout
@@ -51,38 +50,32 @@ class MediaInfo(Module):
             QMessageBox.critical(MainWindow(), translate('MediaInfo', 'Error'),
                                  translate('MediaInfo', 'No info to display'))
         else:
-            gst_info = gst_uri_metadata(media_uri)
-            info = {'URI': unquote(gst_info.get_uri())}
+            media_info = gst_media_info(media_uri)
+            info = {'URI': unquote(media_uri)}
 
             # Audio streams info
-            for stream in gst_info.get_audio_streams():
-                name = stream.get_stream_type_nick().capitalize()
+            for n, stream in enumerate(media_info['audio']):
+                name = 'Audio' if n == 0 else 'Audio {}'.format(n + 1)
                 info[name] = {
-                    'Bitrate': str(stream.get_bitrate() // 1000) + ' Kb/s',
-                    'Channels': str(stream.get_channels()),
-                    'Sample rate': str(stream.get_sample_rate()) + ' Hz',
-                    'Sample size': str(stream.get_depth()) + ' bit'
+                    'Bitrate': str(stream['bitrate'] // 1000) + ' Kb/s',
+                    'Channels': str(stream['channels']),
+                    'Sample rate': str(stream['sample_rate']) + ' Hz',
+                    'Sample size': str(stream['depth']) + ' bit'
                 }
 
             # Video streams info
-            for stream in gst_info.get_video_streams():
-                name = stream.get_stream_type_nick().capitalize()
+            for n, stream in enumerate(media_info['video']):
+                name = 'Video' if n == 0 else 'Video {}'.format(n + 1)
                 info[name] = {
-                    'Height': str(stream.get_height()) + ' px',
-                    'Width': str(stream.get_width()) + ' px',
-                    'Framerate': str(round(stream.get_framerate_num() /
-                                           stream.get_framerate_denom()))
+                    'Height': str(stream['height']) + ' px',
+                    'Width': str(stream['width']) + ' px',
+                    'Framerate': str(stream['framerate'])
                 }
 
             # Media tags
             info['Tags'] = {}
-
-            tags = gst_info.get_tags()
-            if tags is not None:
-                tags = gst_parse_tags_list(tags)
-                for tag in tags:
-                    if type(tags[tag]).__str__ is not object.__str__:
-                        info['Tags'][tag.capitalize()] = str(tags[tag])
+            for tag, value in media_info['tags'].items():
+                info['Tags'][tag.capitalize()] = str(value)
 
             if not info['Tags']:
                 info.pop('Tags')
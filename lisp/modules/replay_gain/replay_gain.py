@@ -18,10 +18,11 @@
 # along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
 
 import logging
+import os
 from concurrent.futures import ThreadPoolExecutor
 from concurrent.futures import as_completed as futures_completed
 from math import pow
-from threading import Thread, Lock
+from threading import Thread
 
 import gi
 
@@ -34,12 +35,17 @@ from PyQt5.QtWidgets import QMenu, QAction, QDialog
 from lisp.application import Application
 from lisp.core.action import Action
 from lisp.core.actions_handler import MainActionsHandler
+from lisp.core.configuration import CFG_DIR
+from lisp.core.fingerprint_cache import FingerprintCache
 from lisp.core.module import Module
 from lisp.core.signal import Signal, Connection
 from lisp.cues.media_cue import MediaCue
 from lisp.ui.mainwindow import MainWindow
 from .gain_ui import GainUi, GainProgressDialog
 
+# Analysis results: {'gain': track-gain, 'peak': track-peak, 'reference': ref}
+GAIN_CACHE = FingerprintCache(os.path.join(CFG_DIR, 'cache', 'replaygain.json'))
+
 
 class GainAction(Action):
     __slots__ = ('__media_list', '__new_volumes', '__old_volumes')
@@ -106,16 +112,30 @@ class GainMainThread(Thread):
 
         with ThreadPoolExecutor(max_workers=self.threads) as executor:
             for file in self.files.keys():
-                gain = GstGain(file, self.ref_level)
-                self._futures[executor.submit(gain.gain)] = gain
+                # Only new or changed files are analyzed
+                cached = GAIN_CACHE.get(file)
+                if cached is not None:
+                    # The track gain is relative to the reference level
+                    gain = cached['gain'] + self.ref_level - cached['reference']
+                    self._post_process(True, gain, cached['peak'], file)
+                else:
+                    gain = GstGain(file, self.ref_level)
+                    self._futures[executor.submit(gain.gain)] = gain
 
             for future in futures_completed(self._futures):
                 if self._running:
                     try:
-                        self._post_process(*future.result())
+                        result = future.result()
                     except Exception:
-                        # Call with the value stored in the GstGain object
-                        self._post_process(*self._futures[future].result)
+                        # Use the value stored in the GstGain object
+                        result = self._futures[future].result
+
+                    gained, gain, peak, uri = result
+                    if gained:
+                        GAIN_CACHE.set(uri, {'gain': gain, 'peak': peak,
+                                             'reference': self.ref_level})
+
+                    self._post_process(*result)
                 else:
                     break
 
@@ -215,6 +235,7 @@ class ReplayGain(Module):
 
     def terminate(self):
         self.stop()
+        GAIN_CACHE.save()
         MainWindow().menuTools.removeAction(self.menu_action)
 
     def _reset_all(self):
@@ -232,8 +253,6 @@ class ReplayGain(Module):
 
 class GstGain:
     def __init__(self, uri, ref_level):
-        self.__lock = Lock()
-
         self.uri = uri
         self.ref_level = ref_level
         self.result = (False, 0, 0, uri)
@@ -244,50 +263,42 @@ class GstGain:
         pipe = 'uridecodebin uri="{0}" ! audioconvert ! rganalysis \
                 reference-level={1} ! fakesink'.format(self.uri, self.ref_level)
         self.gain_pipe = Gst.parse_launch(pipe)
-
         gain_bus = self.gain_pipe.get_bus()
-        gain_bus.add_signal_watch()
-        gain_bus.connect('message', self._on_message)
 
         logging.info('REPLY-GAIN:: started ' + str(self.uri))
         self.gain_pipe.set_state(Gst.State.PLAYING)
 
-        # Block here until EOS
-        self.__lock.acquire(False)
-        self.__lock.acquire()
-
-        # Reset the pipe
-        self.gain_pipe = None
+        # Wait the messages in this thread, no main-loop is required, this
+        # way many analysis can run concurrently
+        try:
+            while True:
+                message = gain_bus.timed_pop_filtered(
+                    Gst.CLOCK_TIME_NONE,
+                    Gst.MessageType.EOS | Gst.MessageType.TAG |
+                    Gst.MessageType.ERROR)
+
+                if message.type == Gst.MessageType.TAG:
+                    tags = message.parse_tag()
+                    tag = tags.get_double(Gst.TAG_TRACK_GAIN)
+                    peak = tags.get_double(Gst.TAG_TRACK_PEAK)
+
+                    if tag[0] and peak[0]:
+                        self.result = (True, tag[1], peak[1], self.uri)
+                        break
+                elif message.type == Gst.MessageType.ERROR:
+                    logging.debug('REPLY-GAIN:: ' + str(message.parse_error()))
+                    break
+                else:
+                    break
+        finally:
+            # Reset the pipe
+            self.gain_pipe.set_state(Gst.State.NULL)
+            self.gain_pipe = None
 
         # Return the computation result
         return self.result
 
     def stop(self):
-        if self.gain_pipe is not None:
-            self.gain_pipe.send_event(Gst.Event.new_eos())
-
-    def _on_message(self, bus, message):
-        try:
-            if message.type == Gst.MessageType.EOS and self.__lock.locked():
-                self.__lock.release()
-            elif message.type == Gst.MessageType.TAG:
-                tags = message.parse_tag()
-                tag = tags.get_double(Gst.TAG_TRACK_GAIN)
-                peak = tags.get_double(Gst.TAG_TRACK_PEAK)
-
-                if tag[0] and peak[0]:
-                    self.gain_pipe.set_state(Gst.State.NULL)
-                    self.result = (True, tag[1], peak[1], self.uri)
-
-                    if self.__lock.locked():
-                        self.__lock.release()
-            elif message.type == Gst.MessageType.ERROR:
-                logging.debug('REPLY-GAIN:: ' + str(message.parse_error()))
-
-                self.gain_pipe.set_state(Gst.State.NULL)
-
-                if self.__lock.locked():
-                    self.__lock.release()
-        except Exception:
-            if self.__lock.locked():
-                self.__lock.release()
+        gain_pipe = self.gain_pipe
+        if gain_pipe is not None:
+            gain_pipe.send_event(Gst.Event.new_eos())
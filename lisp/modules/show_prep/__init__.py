@@ -0,0 +1 @@
+from .show_prep import ShowPrep
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Linux Show Player
+#
+# Copyright 2012-2016 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from os import cpu_count
+from threading import Thread
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QAction, QMenu, QProgressDialog, QMessageBox
+
+from lisp.application import Application
+from lisp.core.module import Module
+from lisp.core.signal import Signal, Connection
+from lisp.cues.media_cue import MediaCue
+from lisp.modules.gst_backend.gst_decoder import GstDecodeError
+from lisp.modules.gst_backend.gst_transcode import TranscodeCache
+from lisp.ui.mainwindow import MainWindow
+from lisp.ui.ui_utils import translate
+
+
+class PrepThread(Thread):
+    """Transcode the given files, using a pool of threads."""
+
+    def __init__(self, uris, threads):
+        super().__init__(daemon=True)
+
+        self.uris = uris
+        self.threads = threads
+        self.failed = []
+
+        self._running = False
+        self.on_progress = Signal()
+
+    def stop(self):
+        self._running = False
+
+    def run(self):
+        self._running = True
+
+        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+            for uri in self.uris:
+                executor.submit(self._transcode, uri)
+
+        self.on_progress.emit(-1)
+        self.on_progress.disconnect()
+
+    def _transcode(self, uri):
+        if not self._running:
+            return
+
+        try:
+            TranscodeCache().transcode(uri)
+            logging.info('SHOW-PREP: completed ' + uri)
+        except (GstDecodeError, OSError) as e:
+            self.failed.append(uri)
+            logging.error('SHOW-PREP: failed {}: {}'.format(uri, e))
+
+        self.on_progress.emit(1)
+
+
+class ShowPrep(Module):
+    """Transcode the session media-files in the output format.
+
+    Media with an UriInput play the transcoded files in place of the
+    original ones, removing decoding and resampling from the live path.
+    """
+
+    Name = 'ShowPrep'
+
+    def __init__(self):
+        self._prep_thread = None
+        self._progress = None
+
+        self.menu = QMenu(translate('ShowPrep', 'Show preparation'))
+        self.menu_action = MainWindow().menuTools.addMenu(self.menu)
+
+        self.actionPrepare = QAction(MainWindow())
+        self.actionPrepare.triggered.connect(self.prepare)
+        self.actionPrepare.setText(translate('ShowPrep', 'Prepare media'))
+        self.menu.addAction(self.actionPrepare)
+
+        self.actionClear = QAction(MainWindow())
+        self.actionClear.triggered.connect(self.clear)
+        self.actionClear.setText(translate('ShowPrep', 'Clear prepared media'))
+        self.menu.addAction(self.actionClear)
+
+    def prepare(self):
+        if self._prep_thread is not None:
+            return
+
+        uris = set()
+        for cue in Application().cue_model.filter(MediaCue):
+            uri = cue.media.input_uri()
+            if uri is not None and TranscodeCache().lookup(uri) is None:
+                uris.add(uri)
+
+        if not uris:
+            return
+
+        self._prep_thread = PrepThread(uris, cpu_count() or 1)
+
+        self._progress = QProgressDialog(MainWindow())
+        self._progress.setWindowModality(Qt.ApplicationModal)
+        self._progress.setWindowTitle(
+            translate('ShowPrep', 'Processing files ...'))
+        self._progress.setMaximum(len(uris))
+        self._progress.canceled.connect(self._prep_thread.stop)
+        self._prep_thread.on_progress.connect(self._on_progress,
+                                              Connection.QtQueued)
+
+        self._progress.show()
+        self._prep_thread.start()
+
+    def clear(self):
+        TranscodeCache().clear()
+
+    def terminate(self):
+        if self._prep_thread is not None:
+            self._prep_thread.stop()
+        MainWindow().menuTools.removeAction(self.menu_action)
+
+    def _on_progress(self, value):
+        if value == -1:
+            failed = self._prep_thread.failed
+            self._prep_thread = None
+            self._progress.deleteLater()
+            self._progress = None
+
+            if failed:
+                QMessageBox.warning(
+                    MainWindow(), translate('ShowPrep', 'Show preparation'),
+                    translate('ShowPrep', 'Cannot transcode {} file(s)')
+                    .format(len(failed)))
+        else:
+            self._progress.setValue(self._progress.value() + value)
@@ -0,0 +1 @@
+from .silence_trim import SilenceTrim
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Linux Show Player
+#
+# Copyright 2012-2016 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+from urllib.parse import unquote
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QAction, QMessageBox, QProgressDialog
+
+from lisp.application import Application
+from lisp.backend import get_backend
+from lisp.core.action import Action
+from lisp.core.actions_handler import MainActionsHandler
+from lisp.core.module import Module
+from lisp.core.signal import Signal, Connection
+from lisp.core.util import strtime, uri_fingerprint
+from lisp.cues.media_cue import MediaCue
+from lisp.ui.mainwindow import MainWindow
+from lisp.ui.ui_utils import translate
+
+
+class TrimAction(Action):
+    __slots__ = ('__media_list', '__new_times', '__old_times')
+
+    def __init__(self):
+        self.__media_list = []
+        self.__new_times = []
+        self.__old_times = []
+
+    def add_media(self, media, start_time, stop_time):
+        self.__media_list.append(media)
+        self.__new_times.append((start_time, stop_time))
+        self.__old_times.append((media.start_time, media.stop_time))
+
+    def is_empty(self):
+        return not self.__media_list
+
+    def do(self):
+        for media, (start, stop) in zip(self.__media_list, self.__new_times):
+            media.start_time = start
+            media.stop_time = stop
+
+    def undo(self):
+        for media, (start, stop) in zip(self.__media_list, self.__old_times):
+            media.start_time = start
+            media.stop_time = stop
+
+    def redo(self):
+        self.do()
+
+    def log(self):
+        return 'Silence trimmed'
+
+
+class SilenceTrim(Module):
+    """Trim leading and trailing silence of the selected media-cues."""
+
+    Name = 'SilenceTrim'
+
+    def __init__(self):
+        self._files = {}
+        self._results = {}
+        self._progress = None
+
+        self._result_ready = Signal()
+        self._result_ready.connect(self.__result_ready, Connection.QtQueued)
+
+        self.menuAction = QAction(MainWindow())
+        self.menuAction.triggered.connect(self.trim)
+        self.menuAction.setText(translate('SilenceTrim', 'Trim silence'))
+        MainWindow().menuTools.addAction(self.menuAction)
+
+    def trim(self):
+        if self._files:
+            return
+
+        # file -> media {'filename1': [media1, media2], 'filename2': [media3]}
+        for cue in Application().layout.get_selected_cues(MediaCue):
+            uri = cue.media.input_uri()
+            # Only local files can be analyzed
+            if uri is not None and uri_fingerprint(uri) is not None:
+                self._files.setdefault(uri, []).append(cue.media)
+
+        if not self._files:
+            QMessageBox.information(
+                MainWindow(), translate('SilenceTrim', 'Trim silence'),
+                translate('SilenceTrim', 'No media file selected'))
+            return
+
+        self._progress = QProgressDialog(MainWindow())
+        self._progress.setWindowModality(Qt.ApplicationModal)
+        self._progress.setWindowTitle(
+            translate('SilenceTrim', 'Processing files ...'))
+        self._progress.setMaximum(len(self._files))
+        self._progress.canceled.connect(self.__cancel)
+        self._progress.show()
+
+        # Cached results are returned immediately, the others are
+        # delivered (in the main thread) when the analysis completes
+        for uri in list(self._files):
+            silence = get_backend().uri_silence(
+                uri, lambda result, uri=uri: self._result_ready.emit(uri,
+                                                                     result))
+            if silence is not None:
+                self.__result_ready(uri, silence)
+
+    def terminate(self):
+        MainWindow().menuTools.removeAction(self.menuAction)
+
+    def __result_ready(self, uri, silence):
+        if uri not in self._files or uri in self._results:
+            return
+
+        self._results[uri] = silence
+        self._progress.setValue(len(self._results))
+
+        if len(self._results) == len(self._files):
+            self.__close_progress()
+            self.__apply()
+
+    def __cancel(self):
+        self.__close_progress()
+        self._files.clear()
+        self._results.clear()
+
+    def __close_progress(self):
+        if self._progress is not None:
+            self._progress.close()
+            self._progress.deleteLater()
+            self._progress = None
+
+    def __apply(self):
+        action = TrimAction()
+        details = []
+
+        for uri, silence in self._results.items():
+            # None if the analysis failed, (0, 0) if the file is all silent
+            if not silence or silence[1] <= silence[0]:
+                continue
+
+            for media in self._files[uri]:
+                # The existing (e.g. manually set) bounds are only narrowed
+                start = max(media.start_time, silence[0])
+                stop = media.stop_time
+                if media.duration <= 0 or silence[1] < media.duration:
+                    # Trailing silence, an unset stop (0) means the end
+                    stop = silence[1] if stop <= 0 else min(stop, silence[1])
+
+                end = stop if stop > 0 else media.duration
+                if end > 0 and start >= end:
+                    # The bounds are all in the silence, nothing to play
+                    continue
+
+                if (start, stop) != (media.start_time, media.stop_time):
+                    action.add_media(media, start, stop)
+                    details.append('{} - {}  {}'.format(
+                        strtime(start, accurate=True),
+                        strtime(stop or media.duration, accurate=True),
+                        unquote(uri.split('/')[-1])))
+
+        self.__cancel()
+
+        if action.is_empty():
+            QMessageBox.information(
+                MainWindow(), translate('SilenceTrim', 'Trim silence'),
+                translate('SilenceTrim', 'Nothing to trim'))
+            return
+
+        confirm = QMessageBox(MainWindow())
+        confirm.setIcon(QMessageBox.Question)
+        confirm.setWindowTitle(translate('SilenceTrim', 'Trim silence'))
+        confirm.setText(
+            translate('SilenceTrim', 'Apply the new start/stop times?'))
+        confirm.setDetailedText('\n'.join(details))
+        confirm.setStandardButtons(QMessageBox.Yes | QMessageBox.Cancel)
+        confirm.setDefaultButton(QMessageBox.Yes)
+
+        if confirm.exec_() == QMessageBox.Yes:
+            MainActionsHandler.do_action(action)
@@ -18,6 +18,7 @@
 # along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
 from itertools import chain
 
+from PyQt5.QtCore import QTimer
 from PyQt5.QtGui import QIcon
 from PyQt5.QtWidgets import QApplication
 
@@ -102,3 +103,25 @@ def tr_sorted(context, iterable, key=None, reverse=False):
             translate(context, item)
 
     return sorted(iterable, key=tr_key, reverse=reverse)
+
+
+def delete_later(objects, batch=100):
+    """Delete the given QObject(s), `batch` at the time, from the event loop.
+
+    Every batch is deleted in a different event-loop iteration, so deleting
+    many widgets (e.g. closing a session) doesn't freeze the UI.
+
+    .. warning:
+        Parents must be given after their children, or not at all.
+    """
+    objects = list(objects)
+
+    def delete():
+        for qobject in objects[:batch]:
+            qobject.deleteLater()
+
+        del objects[:batch]
+        if objects:
+            QTimer.singleShot(0, delete)
+
+    delete()
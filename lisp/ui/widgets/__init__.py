@@ -9,3 +9,4 @@ from .qmutebutton import QMuteButton
 from .qsteptimeedit import QStepTimeEdit
 from .qstyledslider import QStyledSlider
 from .qvertiacallabel import QVerticalLabel
+from .qwaveformslider import QWaveformSlider
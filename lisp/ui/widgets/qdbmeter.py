@@ -17,8 +17,8 @@
 # You should have received a copy of the GNU General Public License
 # along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
 
-from PyQt5 import QtCore
-from PyQt5.QtGui import QLinearGradient, QColor, QPainter
+from PyQt5.QtCore import QRect, Qt
+from PyQt5.QtGui import QLinearGradient, QColor, QPainter, QPixmap, QRegion
 from PyQt5.QtWidgets import QWidget
 
 from lisp.core.configuration import config
@@ -33,98 +33,129 @@ class QDbMeter(QWidget):
     def __init__(self, parent):
         super().__init__(parent)
 
-        db_range = abs(self.DB_MIN - self.DB_MAX)
-        yellow = abs(self.DB_MIN + 20) / db_range  # -20 db
-        red = abs(self.DB_MIN) / db_range          # 0 db
+        self.db_min = self.DB_MIN
+        self.db_max = self.DB_MAX
+        self.db_clip = self.DB_CLIP
 
-        self.grad = QLinearGradient()
-        self.grad.setColorAt(0, QColor(0, 255, 0))            # Green
-        self.grad.setColorAt(yellow, QColor(255, 255, 0))     # Yellow
-        self.grad.setColorAt(red, QColor(255, 0, 0))          # Red
+        # Pre-rendered gradient bar, rebuilt only when its size or the dB
+        # range changes, (width, height, db_min, db_max) of the current one
+        self._bar = None
+        self._bar_key = None
+        # Last painted levels, as bar heights (peak, rms, decay) in pixels
+        self._heights = []
 
         self.reset()
 
     def reset(self):
-        self.peaks = [self.DB_MIN, self.DB_MIN]
-        self.rmss = [self.DB_MIN, self.DB_MIN]
-        self.decPeak = [self.DB_MIN, self.DB_MIN]
+        self.peaks = [self.db_min, self.db_min]
+        self.rmss = [self.db_min, self.db_min]
+        self.decPeak = [self.db_min, self.db_min]
         self.clipping = {}
-        self.repaint()
+
+        self._heights = self._compute_heights()
+        self.update()
 
     def plot(self, peaks, rms, decPeak):
         self.peaks = peaks
         self.rmss = rms
         self.decPeak = decPeak
 
-        self.repaint()
+        for n, peak in enumerate(peaks):
+            if peak > self.db_clip and not self.clipping.get(n, False):
+                self.clipping[n] = True
+                # The border must change, repaint everything
+                self._heights = []
+
+        heights = self._compute_heights()
+        if len(heights) != len(self._heights):
+            self.update()
+        else:
+            self.update(self._changed_region(self._heights, heights))
+
+        self._heights = heights
+
+    def resizeEvent(self, event):
+        self._bar = None
+        self._heights = self._compute_heights()
+        super().resizeEvent(event)
+
+    def _compute_heights(self):
+        # Stretch factor
+        mul = (self.height() - 4) / (self.db_max - self.db_min)
+
+        def scale(value):
+            value = min(max(value, self.db_min), self.db_max)
+            return round((value - self.db_min) * mul)
+
+        return [(scale(peak), scale(rms), scale(decay)) for peak, rms, decay
+                in zip(self.peaks, self.rmss, self.decPeak)]
+
+    def _changed_region(self, old, new):
+        region = QRegion()
+        xdim = self.width() / max(len(new), 1)
+        bottom = self.height() - 2
+
+        for n, (old_heights, new_heights) in enumerate(zip(old, new)):
+            if old_heights != new_heights:
+                # The area between the lowest and the highest level, +
+                # the decay-peak line (2px)
+                low = min(old_heights + new_heights)
+                high = max(old_heights + new_heights) + 3
+                region += QRect(int(n * xdim), bottom - high, int(xdim),
+                                high - low + 1)
+
+        return region
+
+    def _bar_pixmap(self, width, height):
+        key = (width, height, self.db_min, self.db_max)
+        if self._bar is None or self._bar_key != key:
+            self._bar_key = key
+            db_range = abs(self.db_min - self.db_max)
+            yellow = abs(self.db_min + 20) / db_range  # -20 db
+            red = abs(self.db_min) / db_range          # 0 db
+
+            gradient = QLinearGradient(0, height, 0, 0)
+            gradient.setColorAt(0, QColor(0, 255, 0))            # Green
+            gradient.setColorAt(yellow, QColor(255, 255, 0))     # Yellow
+            gradient.setColorAt(red, QColor(255, 0, 0))          # Red
+
+            self._bar = QPixmap(max(width, 1), max(height, 1))
+            self._bar.fill(Qt.transparent)
+
+            painter = QPainter(self._bar)
+            painter.fillRect(self._bar.rect(), gradient)
+            painter.end()
+
+        return self._bar
 
     @suppress_exceptions
     def paintEvent(self, e):
-        if not self.visibleRegion().isEmpty():
-            # Stretch factor
-            mul = (self.height() - 4)
-            mul /= (self.DB_MAX - self.DB_MIN)
-
-            peaks = []
-            for n, peak in enumerate(self.peaks):
-                if peak > self.DB_CLIP:
-                    self.clipping[n] = True
-
-                if peak < self.DB_MIN:
-                    peak = self.DB_MIN
-                elif peak > self.DB_MAX:
-                    peak = self.DB_MAX
-
-                peaks.append(round((peak - self.DB_MIN) * mul))
-
-            rmss = []
-            for n, rms in enumerate(self.rmss):
-                if rms < self.DB_MIN:
-                    rms = self.DB_MIN
-                elif rms > self.DB_MAX:
-                    rms = self.DB_MAX
-
-                rmss.append(round((rms - self.DB_MIN) * mul))
-
-            dPeaks = []
-            for dPeak in self.decPeak:
-                if dPeak < self.DB_MIN:
-                    dPeak = self.DB_MIN
-                elif dPeak > self.DB_MAX:
-                    dPeak = self.DB_MAX
-
-                dPeaks.append(round((dPeak - self.DB_MIN) * mul))
+        if not self.visibleRegion().isEmpty() and self._heights:
+            xdim = self.width() / len(self._heights)
+            bottom = self.height() - 2
+            bar = self._bar_pixmap(int(xdim) - 2, self.height() - 2)
 
             qp = QPainter()
             qp.begin(self)
             qp.setBrush(QColor(0, 0, 0, 0))
 
             xpos = 0
-            xdim = self.width() / len(peaks)
-
-            for n, (peak, rms, dPeak) in enumerate(zip(peaks, rmss, dPeaks)):
-                # Maximum "peak-rect" size
-                maxRect = QtCore.QRect(xpos, self.height() - 2, xdim - 2,
-                                       2 - self.height())
-
-                # Set QLinearGradient start and final-stop position
-                self.grad.setStart(maxRect.topLeft())
-                self.grad.setFinalStop(maxRect.bottomRight())
+            for n, (peak, rms, dPeak) in enumerate(self._heights):
+                x = int(xpos)
 
                 # Draw peak (audio peak in dB)
-                rect = QtCore.QRect(xpos, self.height() - 2, xdim - 2, -peak)
                 qp.setOpacity(0.6)
-                qp.fillRect(rect, self.grad)
+                qp.drawPixmap(x, bottom - peak, bar,
+                              0, bar.height() - peak, bar.width(), peak)
                 qp.setOpacity(1.0)
 
                 # Draw rms (in db)
-                rect = QtCore.QRect(xpos, self.height() - 2, xdim - 2, -rms)
-                qp.fillRect(rect, self.grad)
+                qp.drawPixmap(x, bottom - rms, bar,
+                              0, bar.height() - rms, bar.width(), rms)
 
                 # Draw decay peak
-                decRect = QtCore.QRect(xpos, (self.height() - 3) - dPeak,
-                                       xdim - 2, 2)
-                qp.fillRect(decRect, self.grad)
+                qp.drawPixmap(x, bottom - 1 - dPeak, bar,
+                              0, bar.height() - 1 - dPeak, bar.width(), 2)
 
                 # Draw Borders
                 if self.clipping.get(n, False):
@@ -132,7 +163,7 @@ class QDbMeter(QWidget):
                 else:
                     qp.setPen(QColor(100, 100, 100))
 
-                qp.drawRect(maxRect)
+                qp.drawRect(x, 0, bar.width(), bottom)
 
                 xpos += xdim
 
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Linux Show Player
+#
+# Copyright 2012-2016 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+from functools import partial
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPainter, QPixmap, QColor
+
+from lisp.backend import get_backend
+from lisp.core.signal import Signal, Connection
+from lisp.ui.widgets.qclickslider import QClickSlider
+
+
+class QWaveformSlider(QClickSlider):
+    """A QClickSlider that shows the waveform of a media-file.
+
+    The waveform is requested to the backend, when not available it's
+    computed in background, with an higher priority if the slider is
+    visible. The waveform image is cached, and redrawn only on resize.
+    """
+
+    PEAK_COLOR = QColor(255, 255, 255, 40)
+    RMS_COLOR = QColor(255, 255, 255, 70)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._uri = None
+        self._waveform = None
+        self._pixmap = None
+
+        self._waveform_ready = Signal()
+        self._waveform_ready.connect(self.__waveform_ready,
+                                     Connection.QtQueued)
+
+    def setUri(self, uri):
+        if uri != self._uri:
+            self._uri = uri
+            self.setWaveform(None)
+            self.__request(0 if self.isVisible() else 1)
+
+    def setWaveform(self, waveform):
+        # The previous waveform (memory-mapped file) is no more used
+        if self._waveform is not None and self._waveform is not waveform:
+            self._waveform.close()
+
+        self._waveform = waveform
+        self._pixmap = None
+        self.update()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.__request(0)
+
+    def paintEvent(self, event):
+        if self._waveform is not None:
+            if self._pixmap is None or self._pixmap.size() != self.size():
+                self._pixmap = self.__waveform_pixmap()
+
+            painter = QPainter(self)
+            painter.drawPixmap(0, 0, self._pixmap)
+            painter.end()
+
+        super().paintEvent(event)
+
+    def __request(self, priority):
+        if self._uri and self._waveform is None:
+            waveform = get_backend().uri_waveform(
+                self._uri, partial(self._waveform_ready.emit, self._uri),
+                priority=priority)
+
+            if waveform is not None:
+                self.setWaveform(waveform)
+
+    def __waveform_ready(self, uri, waveform):
+        if waveform is not None:
+            if uri == self._uri and self._waveform is None:
+                self.setWaveform(waveform)
+            else:
+                # Not wanted anymore, e.g. the uri is changed
+                waveform.close()
+
+    def __waveform_pixmap(self):
+        width = self.width()
+        height = self.height()
+
+        pixmap = QPixmap(self.size())
+        pixmap.fill(Qt.transparent)
+
+        # Use the smallest level with (at least) a block for each pixel
+        blocks = self._waveform.blocks(width)
+        count = len(blocks) // 3
+        if count == 0:
+            return pixmap
+
+        middle = height // 2
+        scale = height / 256
+
+        painter = QPainter(pixmap)
+        for x in range(width):
+            start = x * count // width * 3
+            end = max((x + 1) * count // width * 3, start + 3)
+            minimum = min(blocks[start:end:3])
+            maximum = max(blocks[start + 1:end:3])
+            rms = max(blocks[start + 2:end:3])
+
+            painter.setPen(self.PEAK_COLOR)
+            painter.drawLine(x, middle - int(maximum * scale),
+                             x, middle - int(minimum * scale))
+            painter.setPen(self.RMS_COLOR)
+            rms = int(rms * scale)
+            painter.drawLine(x, middle - rms, x, middle + rms)
+
+        painter.end()
+        return pixmap